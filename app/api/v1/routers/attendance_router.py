@@ -1,15 +1,23 @@
 from fastapi import APIRouter, Depends
-from app.services.attendence_service import AttendanceService
+from typing import Optional
 from app.dependencies.file_upload_validator import FileUploadValidator
-from app.utils.excel_upload_utils import load_excel_file
-from app.utils.export_utils import export_excel_and_get_url
+from app.utils.upload_spool import SpooledUpload
+from app.services.dataset_service import CLOCKINGS
+from app.utils.dataset_utils import load_report_frame
+from app.utils.export_utils import export_report
+from app.utils.process_pool import process_pool
+from app.utils.report_specs import ATTENDANCE_COLUMNS, REPORTS, build_report
+from app.services.excel_export_service import ExportFormat
 from app.dependencies.roles import require_role
 
 # Create a FastAPI router for attendance-related endpoints
 router = APIRouter(prefix="/attendance", tags=["Employees attendance"])
 
+# Columns the clocking export must contain
+REQUIRED_COLUMNS = ATTENDANCE_COLUMNS
+
 @router.post("/list")
-async def attendence_list(user = Depends(require_role("site-admin")),contents: bytes = Depends(FileUploadValidator())):
+async def attendence_list(user = Depends(require_role("site-admin")),contents: Optional[SpooledUpload] = Depends(FileUploadValidator(required_columns=REQUIRED_COLUMNS, file_required=False)), dataset_id: Optional[str] = None, format: ExportFormat = "xlsx"):
     """
     Endpoint: /attendance/list
     Returns a list of unique employee attendances.
@@ -21,34 +29,37 @@ async def attendence_list(user = Depends(require_role("site-admin")),contents: b
     - Multiple scans per day are ignored
     """
 
-    # Load the uploaded Excel file and validate required columns
-    df = await load_excel_file(
+    report = REPORTS["attendance-list"]
+
+    # Load the uploaded clocking export or stored dataset and validate required columns
+    df = await load_report_frame(
         contents,
-        required_columns={"Clock No.", "Date", "WTT"},
+        dataset_id,
+        owner=user.get("sub"),
+        kind=CLOCKINGS,
+        required_columns=REQUIRED_COLUMNS,
     )
 
-    # Initialize the attendance service with the DataFrame
-    attendence_service = AttendanceService(df)
-
     # Get the unique attendance list
-    attendence_list = attendence_service.get_employees_list()
+    sheets = await process_pool.run(build_report, "attendance-list", df)
 
     user_id = user.get("sub")
 
 
     # Export the attendance list to Excel and get a download URL
-    urls = export_excel_and_get_url(
-        sheets={"Attendence_list": attendence_list},
-        prefix="Employees attence list",
-        filename_prefix="attendance_list",
-        user_id = user_id
+    urls = await export_report(
+        sheets=sheets,
+        prefix=report["prefix"],
+        filename_prefix=report["filename_prefix"],
+        user_id = user_id,
+        file_format=format,
     )
 
     # Return the download link to the client
     return {"download_url": urls["download_url"]}
 
 @router.post("/site-summary")
-async def site_summary(contents: bytes = Depends(FileUploadValidator())):
+async def site_summary(user = Depends(require_role("site-admin")),contents: Optional[SpooledUpload] = Depends(FileUploadValidator(required_columns=REQUIRED_COLUMNS, file_required=False)), dataset_id: Optional[str] = None, format: ExportFormat = "xlsx"):
     """
     Endpoint: /attendance/site-summary
     Returns attendance summary per site per day.
@@ -58,30 +69,35 @@ async def site_summary(contents: bytes = Depends(FileUploadValidator())):
     - Multiple scans per employee per day are ignored
     """
 
-    # Load the uploaded Excel file and validate required columns
-    df = await load_excel_file(
+    report = REPORTS["attendance-site-summary"]
+
+    # Load the uploaded clocking export or stored dataset and validate required columns
+    df = await load_report_frame(
         contents,
-        required_columns={"Clock No.", "Date", "WTT"},
+        dataset_id,
+        owner=user.get("sub"),
+        kind=CLOCKINGS,
+        required_columns=REQUIRED_COLUMNS,
+        optional_columns=report["optional_columns"],
     )
 
-    # Initialize the attendance service with the DataFrame
-    attendence_service = AttendanceService(df)
-
     # Get attendance summary per site per day
-    attendence_list = attendence_service.get_summary_by_site()
+    sheets = await process_pool.run(build_report, "attendance-site-summary", df)
 
     # Export the summary to Excel and get a download URL
-    download_url = export_excel_and_get_url(
-        sheets={"Attendence_summary": attendence_list},
-        prefix="Site attendence summary",
-        filename_prefix="site_attence",
+    urls = await export_report(
+        sheets=sheets,
+        prefix=report["prefix"],
+        filename_prefix=report["filename_prefix"],
+        user_id=user.get("sub"),
+        file_format=format,
     )
 
     # Return the download link to the client
-    return {"download_url": download_url}
+    return {"download_url": urls["download_url"]}
 
 @router.post("/employee-attendance-summary")
-async def employee_attendance_summary(contents: bytes = Depends(FileUploadValidator())):
+async def employee_attendance_summary(user = Depends(require_role("site-admin")),contents: Optional[SpooledUpload] = Depends(FileUploadValidator(required_columns=REQUIRED_COLUMNS, file_required=False)), dataset_id: Optional[str] = None, format: ExportFormat = "xlsx"):
     """
     Endpoint: /attendance/employee-attendance-summary
     Returns weekly and monthly attendance per employee.
@@ -93,30 +109,29 @@ async def employee_attendance_summary(contents: bytes = Depends(FileUploadValida
     - Monthly attendance: number of days present in each month
     """
 
-    # Load the uploaded Excel file and validate required columns
-    df = await load_excel_file(
+    report = REPORTS["attendance-employee-summary"]
+
+    # Load the uploaded clocking export or stored dataset and validate required columns
+    df = await load_report_frame(
         contents,
-        required_columns={"Clock No.", "Date", "WTT"},
+        dataset_id,
+        owner=user.get("sub"),
+        kind=CLOCKINGS,
+        required_columns=REQUIRED_COLUMNS,
+        optional_columns=report["optional_columns"],
     )
 
-    # Initialize the attendance service with the DataFrame
-    attendance_service = AttendanceService(df)
-
-    # Compute weekly attendance per employee
-    weekly_attendance = attendance_service.get_attendance_by_employee_week()
-
-    # Compute monthly attendance per employee
-    monthly_attendance = attendance_service.get_attendance_by_employee_month()
+    # Compute weekly and monthly attendance per employee
+    sheets = await process_pool.run(build_report, "attendance-employee-summary", df)
 
     # Export both weekly and monthly summaries to Excel and get download URL
-    download_url = export_excel_and_get_url(
-        sheets={
-            "Weekly_attendance": weekly_attendance,
-            "Monthly_attendance": monthly_attendance,
-        },
-        prefix="Employee_attendance_summary",
-        filename_prefix="employee_attendance",
+    urls = await export_report(
+        sheets=sheets,
+        prefix=report["prefix"],
+        filename_prefix=report["filename_prefix"],
+        user_id=user.get("sub"),
+        file_format=format,
     )
 
     # Return the download link to the client
-    return {"download_url": download_url}
+    return {"download_url": urls["download_url"]}
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.services.book_identifier_service import BookIdentifierService
+from app.services.book_identifier_service import book_identifier_service as service
 from app.dependencies.roles import require_role
 from app.dependencies.image_upload_validator import ImageUploadValidator
 from app.core.logger import logger
@@ -10,8 +10,6 @@ router = APIRouter(
     tags=["Book Identifier"]
 )
 
-service = BookIdentifierService()
-
 class BookRequest(BaseModel):
      title: str = None
      author: str = None
@@ -28,7 +26,7 @@ async def identify_book(file=Depends(ImageUploadValidator)):
     """
     try:
         image_bytes = await file.read()
-        result = service.identify_book(image_bytes)
+        result = await service.identify_book(image_bytes)
 
         if not result.get("title"):
             return {"message": "No matching book found", "matched_text": result["matched_text"]}
@@ -46,7 +44,7 @@ async def describe_book(book: BookRequest):
 
         logger.info("describe route reached")
 
-        result = service.describe_book(title = book.title,author = book.author, isbn = book.isbn)
+        result = await service.describe_book(title = book.title,author = book.author, isbn = book.isbn)
 
 
         return {"description":result["summary"]}
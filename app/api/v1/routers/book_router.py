@@ -3,9 +3,15 @@ from datetime import datetime, timezone
 from app.dependencies.image_upload_validator import ImageUploadValidator
 from app.services.book_service import BookService
 from app.dependencies.roles import require_role
+from app.dependencies.aws import get_s3_client
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
+
+def get_book_service(s3_client = Depends(get_s3_client)) -> BookService:
+    return BookService(s3_client=s3_client)
+
+
 # --------------------
 # Donate Book
 # --------------------
@@ -18,10 +24,10 @@ async def donate_book(
     language: str = Form(...),
     category: str = Form(...),
     isbn: str = Form(...),
+    service: BookService = Depends(get_book_service),
 ):
     user_id = user.get("sub")
 
-    service = BookService()
     book = await service.add_book(
         title=title,
         author=author,
@@ -38,14 +44,13 @@ async def donate_book(
 # Borrow Book
 # --------------------
 @router.post("/{book_id}/borrow")
-async def borrow_book(book_id: str, user=Depends(require_role("user"))):
+async def borrow_book(book_id: str, user=Depends(require_role("user")), service: BookService = Depends(get_book_service)):
     user_id = user.get("sub")
     borrowed_at = datetime.now(timezone.utc).isoformat()
     return_date = datetime.now(timezone.utc).replace(
         hour=0, minute=0, second=0, microsecond=0
     ).isoformat()
 
-    service = BookService()
     updated = await service.borrow_book(
         book_id=book_id,
         user_id=user_id,
@@ -59,11 +64,10 @@ async def borrow_book(book_id: str, user=Depends(require_role("user"))):
 # Return Book
 # --------------------
 @router.post("/{book_id}/return")
-async def return_book(book_id: str, user=Depends(require_role("user"))):
+async def return_book(book_id: str, user=Depends(require_role("user")), service: BookService = Depends(get_book_service)):
     user_id = user.get("sub")
     returned_at = datetime.now(timezone.utc).isoformat()
 
-    service = BookService()
     updated = await service.return_book(
         book_id=book_id,
         user_id=user_id,
@@ -82,9 +86,9 @@ async def update_book(
     borrowed_at: str = Form(None),
     return_date: str = Form(None),
     waiting_list: str = Form(None),
-    user=Depends(require_role("site-admin"))
+    user=Depends(require_role("site-admin")),
+    service: BookService = Depends(get_book_service),
 ):
-    service = BookService()
     updated = await service.update_book(
         book_id=book_id,
         status=status,
@@ -99,8 +103,7 @@ async def update_book(
 # Delete Book
 # --------------------
 @router.delete("/{book_id}")
-async def delete_book(book_id: str,user=Depends(require_role("site-admin"))):
-    service = BookService()
+async def delete_book(book_id: str,user=Depends(require_role("site-admin")), service: BookService = Depends(get_book_service)):
     await service.delete_book(book_id)
     return {"message": f"Book {book_id} deleted"}
 
@@ -109,8 +112,7 @@ async def delete_book(book_id: str,user=Depends(require_role("site-admin"))):
 # Get Book
 # --------------------
 @router.get("/{book_id}")
-async def get_book(book_id: str):
-    service = BookService()
+async def get_book(book_id: str, service: BookService = Depends(get_book_service)):
     book = await service.get_book(book_id)
     return {"book": book}
 
@@ -119,7 +121,6 @@ async def get_book(book_id: str):
 # List Books
 # --------------------
 @router.get("/")
-async def list_books():
-    service = BookService()
+async def list_books(service: BookService = Depends(get_book_service)):
     books = await service.list_books()
     return {"books": books}
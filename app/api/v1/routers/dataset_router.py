@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.dependencies.file_upload_validator import FileUploadValidator
+from app.dependencies.roles import require_role
+from app.services.dataset_service import CLOCKINGS, HOURS_JOURNAL, DatasetNotFoundError, dataset_service
+from app.utils.dataset_utils import load_report_frame
+from app.utils.upload_spool import SpooledUpload
+
+router = APIRouter(prefix="/datasets", tags=["Datasets"])
+
+# Columns every dataset of each kind must contain; individual reports
+# check their own extra columns when the dataset is used
+REQUIRED_COLUMNS = {
+    HOURS_JOURNAL: {"Entry No.", "Resource no.", "VIP Code", "Hours worked", "Applies-To Entry"},
+    CLOCKINGS: {"Date"},
+}
+
+
+@router.post("")
+async def create_dataset(
+    kind: str = HOURS_JOURNAL,
+    user = Depends(require_role("site-admin")),
+    contents: SpooledUpload = Depends(FileUploadValidator()),
+):
+    """
+    Upload an hours journal or clocking export once and keep the cleaned
+    data for later reports.
+
+    Hours journals have reversed entries removed; work dates and clocking
+    dates are normalised. Pass the returned dataset_id to the report
+    endpoints instead of uploading the file again.
+    """
+    if kind not in REQUIRED_COLUMNS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid dataset kind: {kind}. Use one of {', '.join(REQUIRED_COLUMNS)}.",
+        )
+
+    df = await load_report_frame(
+        contents,
+        dataset_id=None,
+        owner=None,
+        kind=kind,
+        required_columns=REQUIRED_COLUMNS[kind],
+    )
+
+    try:
+        return dataset_service.create_dataset(df, kind=kind, owner=user.get("sub"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{dataset_id}")
+def get_dataset(dataset_id: str, user = Depends(require_role("site-admin"))):
+    try:
+        return dataset_service.get_dataset(dataset_id, owner=user.get("sub"))
+    except DatasetNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.delete("/{dataset_id}")
+def delete_dataset(dataset_id: str, user = Depends(require_role("site-admin"))):
+    try:
+        dataset_service.delete_dataset(dataset_id, owner=user.get("sub"))
+    except DatasetNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {"message": f"Dataset {dataset_id} deleted"}
@@ -1,41 +1,48 @@
 import logging
 from fastapi import APIRouter, Depends
-from app.utils.excel_upload_utils import load_excel_file
-from app.utils.export_utils import export_excel_and_get_url
-from app.services.device_service import DeviceService
+from typing import Optional
+from app.services.dataset_service import CLOCKINGS
+from app.utils.dataset_utils import load_report_frame
+from app.utils.export_utils import export_report
+from app.utils.process_pool import process_pool
+from app.utils.report_specs import REPORTS, build_report
+from app.services.excel_export_service import ExportFormat
 from app.dependencies.file_upload_validator import FileUploadValidator
+from app.utils.upload_spool import SpooledUpload
 from app.dependencies.roles import require_role
 
 
 router = APIRouter(prefix="/device-clockings",tags=["Devices count"])
 logger = logging.getLogger("FastAPIApp")
 
+REPORT = REPORTS["device-clockings"]
+REQUIRED_COLUMNS = REPORT["required_columns"]
+
 @router.post("")
-async def devices_count(user=Depends(require_role("site-admin")) ,contents: bytes = Depends(FileUploadValidator())):
-
-     df = await load_excel_file(
-       contents,
-        required_columns={
-            "MeterID",
-            "Date",
-        },
+async def devices_count(user=Depends(require_role("site-admin")) ,contents: Optional[SpooledUpload] = Depends(FileUploadValidator(required_columns=REQUIRED_COLUMNS, file_required=False)), dataset_id: Optional[str] = None, format: ExportFormat = "xlsx"):
+
+     df = await load_report_frame(
+        contents,
+        dataset_id,
+        owner=user.get("sub"),
+        kind=CLOCKINGS,
+        required_columns=REQUIRED_COLUMNS,
+        optional_columns=REPORT["optional_columns"],
      )
      
-     device_service = DeviceService(df)
-
-     clockings_count = device_service.unique_clocks_per_meter_per_day()
+     sheets = await process_pool.run(build_report, "device-clockings", df)
+     clockings_count = sheets["Device report"]
 
      user_id = user.get("sub")
 
      logger.info(f"This is the user id: {user_id}")
 
-     urls = export_excel_and_get_url(
-        sheets={
-            "Device report":  clockings_count,
-        },
-        prefix="clockings count per machine",
-        filename_prefix="clockings_count",
-        user_id=user_id
+     urls = await export_report(
+        sheets=sheets,
+        prefix=REPORT["prefix"],
+        filename_prefix=REPORT["filename_prefix"],
+        user_id=user_id,
+        file_format=format,
      )
 
      return {
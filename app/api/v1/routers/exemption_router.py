@@ -1,9 +1,15 @@
 from fastapi import APIRouter,Depends
-from app.utils.excel_upload_utils import load_excel_file
-from app.utils.export_utils import export_excel_and_get_url
-from app.utils.reversed_entries_utils import remove_reversed_entries
-from app.services.exemption_service import ExemptionService
+from typing import Optional
+from app.services.dataset_service import HOURS_JOURNAL
+from app.utils.dataset_utils import load_report_frame
+from app.services.chunked_journal_service import use_chunked_mode
+from app.core.settings import settings
+from app.utils.export_utils import export_report
+from app.utils.process_pool import process_pool
+from app.utils.report_specs import REPORTS, build_chunked_report, build_report
+from app.services.excel_export_service import ExportFormat
 from app.dependencies.file_upload_validator import FileUploadValidator
+from app.utils.upload_spool import SpooledUpload
 from app.dependencies.roles import require_role
 
 router = APIRouter(
@@ -11,31 +17,39 @@ router = APIRouter(
     tags=["Exemption report"]
 )
 
+REPORT = REPORTS["exemption"]
+PIVOTED_REPORT = REPORTS["exemption-pivoted"]
+REQUIRED_COLUMNS = REPORT["required_columns"]
+
 @router.post("")
 async def exemption_report(
     user = Depends(require_role("site-admin")),
-    contents: bytes = Depends(FileUploadValidator()),
-    exemption_type: str = ""
+    contents: Optional[SpooledUpload] = Depends(FileUploadValidator(max_size=settings.hours_journal_max_upload_bytes, required_columns=REQUIRED_COLUMNS, file_required=False)),
+    dataset_id: Optional[str] = None,
+    exemption_type: str = "",
+    format: ExportFormat = "xlsx",
 ):
-    # Load and validate the uploaded Excel file
-    df = await load_excel_file(
-        contents,
-        required_columns={
-            "Entry No.",
-            "Resource no.",
-            "VIP Code",
-            "Hours worked",
-            "Applies-To Entry",
-        },
-    )
+    if use_chunked_mode(contents, dataset_id):
+        # Oversized journals are summed in row batches
+        sheets = await process_pool.run(
+            build_chunked_report, "exemption", contents, {"exemption_type": exemption_type}
+        )
+    else:
+        # Load the uploaded journal or stored dataset without reversed or
+        # invalid accounting entries (cached across hours-journal reports)
+        clean_df = await load_report_frame(
+            contents,
+            dataset_id,
+            owner=user.get("sub"),
+            kind=HOURS_JOURNAL,
+            required_columns=REQUIRED_COLUMNS,
+        )
 
-    # Remove reversed or invalid accounting entries
-    clean_df = remove_reversed_entries(df)
+        sheets = await process_pool.run(
+            build_report, "exemption", clean_df, {"exemption_type": exemption_type}
+        )
 
-    exemption_service = ExemptionService(clean_df, exemption_type)
-    exemption_df = exemption_service.get_exemption()
-
-    if exemption_df.empty:
+    if sheets["Exemption"].empty:
         return {
             "message": "No exemption exceeded"
         }
@@ -43,11 +57,12 @@ async def exemption_report(
     user_id = user.get("sub")
 
     # Export exemption rows to Excel and generate a download URL
-    urls = export_excel_and_get_url(
-        sheets={"Exemption": exemption_df},
-        prefix="exemption-report",
-        filename_prefix="exemption_report",
-        user_id=user_id
+    urls = await export_report(
+        sheets=sheets,
+        prefix=REPORT["prefix"],
+        filename_prefix=REPORT["filename_prefix"],
+        user_id=user_id,
+        file_format=format,
     )
 
     return {
@@ -58,28 +73,26 @@ async def exemption_report(
 @router.post("/pivoted")
 async def exemption_report(
     user = Depends(require_role("site-admin")),
-    contents: bytes = Depends(FileUploadValidator()),
-    exemption_type: str = ""
+    contents: Optional[SpooledUpload] = Depends(FileUploadValidator(required_columns=PIVOTED_REPORT["required_columns"], file_required=False)),
+    dataset_id: Optional[str] = None,
+    exemption_type: str = "",
+    format: ExportFormat = "xlsx",
 ):
-    # Load and validate the uploaded Excel file
-    df = await load_excel_file(
+    # Load the uploaded journal or stored dataset without reversed or
+    # invalid accounting entries (cached across hours-journal reports)
+    clean_df = await load_report_frame(
         contents,
-        required_columns={
-            "Entry No.",
-            "Resource no.",
-            "VIP Code",
-            "Hours worked",
-            "Applies-To Entry",
-        },
+        dataset_id,
+        owner=user.get("sub"),
+        kind=HOURS_JOURNAL,
+        required_columns=PIVOTED_REPORT["required_columns"],
     )
 
-    # Remove reversed or invalid accounting entries
-    clean_df = remove_reversed_entries(df)
-
-    exemption_service = ExemptionService(clean_df, exemption_type)
-    exemption_df = exemption_service.get_pivoted_exemption()
+    sheets = await process_pool.run(
+        build_report, "exemption-pivoted", clean_df, {"exemption_type": exemption_type}
+    )
 
-    if exemption_df.empty:
+    if sheets["Exemption"].empty:
         return {
             "message": "No exemption exceeded"
         }
@@ -87,11 +100,12 @@ async def exemption_report(
     user_id = user.get("sub")
 
     # Export exemption rows to Excel and generate a download URL
-    urls = export_excel_and_get_url(
-        sheets={"Exemption": exemption_df},
-        prefix="exemption-report",
-        filename_prefix="exemption_report",
-        user_id=user_id
+    urls = await export_report(
+        sheets=sheets,
+        prefix=PIVOTED_REPORT["prefix"],
+        filename_prefix=PIVOTED_REPORT["filename_prefix"],
+        user_id=user_id,
+        file_format=format,
     )
 
     return {
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from app.core.settings import settings
+from app.services.excel_export_service import CONTENT_TYPES
+from app.services.export_retention_service import touch_export
+from app.utils.export_tokens import verify_export_token
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+@router.get("/{path:path}")
+def download_export(path: str, expires: int, signature: str, request: Request):
+    """
+    Stream an export from the local storage backend.
+
+    Links come from the report endpoints and carry their own expiring
+    signature instead of requiring authentication, like S3 presigned URLs.
+    The file is sent in export_download_chunk_bytes chunks, never loaded
+    whole. Range requests resume or split downloads, and a matching
+    If-None-Match returns 304.
+    """
+    if settings.storage_backend != "local":
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    if not verify_export_token(path, expires, signature):
+        raise HTTPException(status_code=403, detail="Download link is invalid or has expired")
+
+    root = Path(settings.local_export_dir).resolve()
+    file_path = (root / path).resolve()
+    # Hidden files (the signing key) and anything outside the export directory are never served
+    if not file_path.is_relative_to(root) or any(part.startswith(".") for part in Path(path).parts):
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    try:
+        stat_result = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    response = FileResponse(
+        file_path,
+        media_type=CONTENT_TYPES.get(file_path.suffix.lstrip("."), "application/octet-stream"),
+        filename=file_path.name,
+        stat_result=stat_result,
+    )
+    response.chunk_size = settings.export_download_chunk_bytes
+
+    etag = response.headers["etag"]
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers={"etag": etag, "last-modified": response.headers["last-modified"]})
+
+    # Downloads keep the export from being evicted as unused
+    touch_export(file_path)
+    return response
@@ -0,0 +1,70 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from app.core.settings import settings
+from app.dependencies.file_upload_validator import FileUploadValidator
+from app.dependencies.roles import require_role
+from app.services.excel_export_service import ExportFormat
+from app.services.report_job_service import JobNotFoundError, report_job_service
+from app.utils.dataset_utils import get_dataset_frame
+from app.utils.excel_upload_utils import check_required_columns
+from app.utils.report_specs import REPORTS
+from app.utils.upload_preflight import validate_required_columns
+from app.utils.upload_spool import SpooledUpload
+
+router = APIRouter(prefix="/jobs", tags=["Report jobs"])
+
+
+@router.post("", status_code=202)
+async def create_job(
+    report: str,
+    user = Depends(require_role("site-admin")),
+    contents: Optional[SpooledUpload] = Depends(FileUploadValidator(max_size=settings.hours_journal_max_upload_bytes, file_required=False)),
+    dataset_id: Optional[str] = None,
+    exemption_type: str = "",
+    format: ExportFormat = "xlsx",
+):
+    """
+    Queue a report to run in the background and return its job ID.
+
+    Takes the same input as the report's own endpoint (an uploaded file or
+    a dataset_id). Poll GET /jobs/{job_id} for the status, stage timings
+    and, once it has succeeded, the download URL.
+    """
+    if report not in REPORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid report: {report}. Use one of {', '.join(REPORTS)}.",
+        )
+    if contents is not None and dataset_id:
+        raise HTTPException(status_code=400, detail="Provide either a file or a dataset_id, not both")
+
+    spec = REPORTS[report]
+    dataset_frame = None
+
+    if dataset_id:
+        dataset_frame = get_dataset_frame(dataset_id, user.get("sub"), spec["kind"])
+        check_required_columns(dataset_frame, spec["required_columns"])
+    elif contents is None:
+        raise HTTPException(status_code=400, detail="Upload a file or pass a dataset_id")
+    else:
+        # Reject files missing a column now rather than in the worker
+        validate_required_columns(contents, spec["required_columns"])
+
+    # Stored datasets are written to a Feather file for the worker
+    return await asyncio.to_thread(
+        report_job_service.submit,
+        report,
+        owner=user.get("sub"),
+        contents=contents,
+        dataset_frame=dataset_frame,
+        options={"exemption_type": exemption_type, "format": format},
+    )
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str, user = Depends(require_role("site-admin"))):
+    try:
+        return report_job_service.get_job(job_id, owner=user.get("sub"))
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
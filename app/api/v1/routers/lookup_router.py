@@ -4,7 +4,9 @@ import pandas as pd
 from io import BytesIO
 
 from app.services.lookup_service import LookupService
-from app.utils.export_utils import export_excel_and_get_url
+from app.utils.export_utils import export_report
+from app.utils.process_pool import process_pool
+from app.services.excel_export_service import ExportFormat
 
 from app.dependencies.multiple_file_validator import MultiFileValidator
 
@@ -14,21 +16,25 @@ router = APIRouter(
 )
 
 @router.post("")
-async def lookup(dataframes: List[pd.DataFrame] = Depends(MultiFileValidator())):
+async def lookup(dataframes: List[pd.DataFrame] = Depends(MultiFileValidator()), format: ExportFormat = "xlsx"):
     """
     Upload multiple CSV or Excel files and perform a LEFT JOIN.
     """
-    service = LookupService(
-        df_reports=dataframes,
-        join_by_column=dataframes[0].columns[0]  # or pass explicitly if needed
+    final_df = await process_pool.run_service(
+        LookupService,
+        "join_reports",
+        kwargs={
+            "df_reports": dataframes,
+            "join_by_column": dataframes[0].columns[0],  # or pass explicitly if needed
+        },
     )
 
-    final_df = service.join_reports()
-
-    urls = export_excel_and_get_url(
+    urls = await export_report(
         sheets={"output": final_df},
         prefix="output",
         filename_prefix="xlookup_output",
+        user_id="",
+        file_format=format,
     )
 
     return {"download_url": urls["download_url"]}
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends
 from app.utils.excel_upload_utils import load_excel_file
-from app.utils.export_utils import export_excel_and_get_url
-from app.services.multiple_clockings_service import MultipleClockingsService 
+from app.utils.export_utils import export_report
+from app.utils.process_pool import process_pool
+from app.utils.report_specs import REPORTS, build_report
+from app.services.excel_export_service import ExportFormat
 from app.dependencies.file_upload_validator import FileUploadValidator
+from app.utils.upload_spool import SpooledUpload
 from app.dependencies.roles import require_role
 
 router = APIRouter(
@@ -10,8 +13,11 @@ router = APIRouter(
     tags=["multiple clockings report"]
 )
 
+REPORT = REPORTS["multiple-clockings"]
+REQUIRED_COLUMNS = REPORT["required_columns"]
+
 @router.post("")
-async def multiple_clockings(user = Depends(require_role('site-admin')),contents: bytes = Depends(FileUploadValidator())):
+async def multiple_clockings(user = Depends(require_role('site-admin')),contents: SpooledUpload = Depends(FileUploadValidator(required_columns=REQUIRED_COLUMNS)), format: ExportFormat = "xlsx"):
     """
     Identify multiple clockings from an uploaded Excel file.
 
@@ -24,11 +30,11 @@ async def multiple_clockings(user = Depends(require_role('site-admin')),contents
 
     df = await load_excel_file(
         contents,
-        required_columns={"Clock No.", "Date"},
+        required_columns=REQUIRED_COLUMNS,
     )
 
-    service = MultipleClockingsService(df)
-    multiple_clockings = service.getMultipleClockings()
+    sheets = await process_pool.run(build_report, "multiple-clockings", df)
+    multiple_clockings = sheets["Multiple clockings"]
 
     # No issues found
     if multiple_clockings.empty:
@@ -39,11 +45,12 @@ async def multiple_clockings(user = Depends(require_role('site-admin')),contents
     
     user_id = user.get("sub")
 
-    urls = export_excel_and_get_url(
-        sheets={"Multiple clockings": multiple_clockings},
-        prefix="multiple-clockings",
-        filename_prefix="multiple_clockings",
-        user_id=user_id
+    urls = await export_report(
+        sheets=sheets,
+        prefix=REPORT["prefix"],
+        filename_prefix=REPORT["filename_prefix"],
+        user_id=user_id,
+        file_format=format,
     )
 
     return {
@@ -1,9 +1,16 @@
 from fastapi import APIRouter, Depends
 from app.services.overbooking_service import OverbookingService
-from app.utils.reversed_entries_utils import remove_reversed_entries
-from app.utils.excel_upload_utils import load_excel_file
-from app.utils.export_utils import export_excel_and_get_url
+from typing import Optional
+from app.services.dataset_service import HOURS_JOURNAL
+from app.utils.dataset_utils import load_report_frame
+from app.services.chunked_journal_service import use_chunked_mode
+from app.core.settings import settings
+from app.utils.export_utils import export_report
+from app.utils.process_pool import process_pool
+from app.utils.report_specs import REPORTS, build_chunked_report, build_report
+from app.services.excel_export_service import ExportFormat
 from app.dependencies.file_upload_validator import FileUploadValidator
+from app.utils.upload_spool import SpooledUpload
 from app.dependencies.roles import require_role
 
 router = APIRouter(
@@ -11,8 +18,11 @@ router = APIRouter(
     tags=["Overbooking Validation"]
 )
 
+REPORT = REPORTS["overbooking"]
+REQUIRED_COLUMNS = REPORT["required_columns"]
+
 @router.post("")
-async def overbooking(user = Depends(require_role("site-admin")),contents: bytes = Depends(FileUploadValidator())):
+async def overbooking(user = Depends(require_role("site-admin")),contents: Optional[SpooledUpload] = Depends(FileUploadValidator(max_size=settings.hours_journal_max_upload_bytes, required_columns=REQUIRED_COLUMNS, file_required=False)), dataset_id: Optional[str] = None, format: ExportFormat = "xlsx"):
     """
     Validate duplicate and overbooked time entries from an uploaded Excel file.
 
@@ -24,27 +34,25 @@ async def overbooking(user = Depends(require_role("site-admin")),contents: bytes
     5. Export incorrect rows to Excel and return a download URL
     """
 
-    df = await load_excel_file(
-        contents,
-        required_columns={
-            "Entry No.",
-            "Resource no.",
-            "Work date",
-            "VIP Code",
-            "Hours worked",
-            "Applies-To Entry",
-        },
-    )
-
-    clean_df = remove_reversed_entries(df)
+    if use_chunked_mode(contents, dataset_id):
+        # Oversized journals are checked in row batches
+        sheets = await process_pool.run(build_chunked_report, "overbooking", contents)
+    else:
+        clean_df = await load_report_frame(
+            contents,
+            dataset_id,
+            owner=user.get("sub"),
+            kind=HOURS_JOURNAL,
+            required_columns=REQUIRED_COLUMNS,
+        )
 
-    service = OverbookingService(clean_df)
+        sheets = await process_pool.run(build_report, "overbooking", clean_df)
 
-    duplicated = service.find_duplicates_overtime()
-    overbooked = service.find_overbooked_normal_daily()
+    duplicated = sheets["Duplicated Overtime"]
+    overbooked = sheets["Overbooked Normal Daily"]
 
-    duplicate_originator_count = service.count_user_originators(duplicated)
-    overbooking_originator_count = service.count_user_originators(overbooked)
+    duplicate_originator_count = OverbookingService.count_user_originators(duplicated)
+    overbooking_originator_count = OverbookingService.count_user_originators(overbooked)
 
     if duplicated.empty and overbooked.empty:
         return {
@@ -54,14 +62,12 @@ async def overbooking(user = Depends(require_role("site-admin")),contents: bytes
     
     user_id = user.get("sub")
 
-    urls = export_excel_and_get_url(
-        sheets={
-            "Duplicated Overtime": duplicated,
-            "Overbooked Normal Daily": overbooked,
-        },
-        prefix="duplicate-validation",
-        filename_prefix="duplicate_overbooking",
-        user_id = user_id
+    urls = await export_report(
+        sheets=sheets,
+        prefix=REPORT["prefix"],
+        filename_prefix=REPORT["filename_prefix"],
+        user_id = user_id,
+        file_format=format,
     )
 
     # Return grouped results as an array
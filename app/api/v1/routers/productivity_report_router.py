@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
 from app.dependencies.file_upload_validator import FileUploadValidator
+from app.utils.upload_spool import SpooledUpload
 
 from app.utils.reversed_entries_utils import remove_reversed_entries
 from app.utils.excel_upload_utils import load_excel_file
@@ -12,7 +13,7 @@ from app.services.productivity_report_service import ProductivityReportService
 router = APIRouter(prefix="productivity-report",tags=["Productivity report"])
 
 @router.post("")
-async def productivity_report(user = Depends(require_role("site-admin")),contents: bytes = Depends(FileUploadValidator())):
+async def productivity_report(user = Depends(require_role("site-admin")),contents: SpooledUpload = Depends(FileUploadValidator())):
     
     df = await load_excel_file(
         contents,
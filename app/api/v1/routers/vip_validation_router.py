@@ -1,25 +1,26 @@
 from fastapi import APIRouter, Depends
-from app.services.incorrect_vip_service import IncorrectVIPService
-from app.utils.reversed_entries_utils import remove_reversed_entries
-from app.utils.excel_upload_utils import load_excel_file
-from app.utils.export_utils import export_excel_and_get_url
+from typing import Optional
+from app.services.dataset_service import HOURS_JOURNAL
+from app.utils.dataset_utils import load_report_frame
+from app.services.chunked_journal_service import use_chunked_mode
+from app.core.settings import settings
+from app.utils.export_utils import export_report
+from app.utils.process_pool import process_pool
+from app.utils.report_specs import REPORTS, build_chunked_report, build_report
+from app.services.excel_export_service import ExportFormat
 from app.dependencies.file_upload_validator import FileUploadValidator
-from pathlib import Path
+from app.utils.upload_spool import SpooledUpload
 from app.dependencies.roles import require_role
 
 # Create a router dedicated to VIP-related validation endpoints
 router = APIRouter(prefix="/vip-validation", tags=["VIP Validation"])
 
-# Resolve the base directory of the project
-# parents[3] is used to navigate from this file to the project root
-BASE_DIR = Path(__file__).resolve().parents[3]
-
-# Path to VIP code configuration file
-CONFIG_PATH = BASE_DIR / "core" / "vipcodes.json"
+REPORT = REPORTS["vip-validation"]
+REQUIRED_COLUMNS = REPORT["required_columns"]
 
 
 @router.post("")
-async def validate_and_export(user = Depends(require_role('site-admin')),contents: bytes = Depends(FileUploadValidator())):
+async def validate_and_export(user = Depends(require_role('site-admin')),contents: Optional[SpooledUpload] = Depends(FileUploadValidator(max_size=settings.hours_journal_max_upload_bytes, required_columns=REQUIRED_COLUMNS, file_required=False)), dataset_id: Optional[str] = None, format: ExportFormat = "xlsx"):
     """
     Validate VIP codes from an uploaded Excel file and export incorrect entries.
 
@@ -32,25 +33,26 @@ async def validate_and_export(user = Depends(require_role('site-admin')),content
 
     print("VIP Router Reached")
 
-    # Load and validate the uploaded Excel file
-    # Ensures required columns exist before processing
-    df = await load_excel_file(
-        contents,
-        required_columns={"Entry No.","Resource no.", "VIP Code","Hours worked","Applies-To Entry"},
-    )
-    print("File converted to a df")
-    # Remove reversed or invalid accounting entries
-    clean_df = remove_reversed_entries(df)
-
-    # Run VIP validation logic using external configuration
-    vip_service_df = IncorrectVIPService(
-        clean_df,
-        CONFIG_PATH,
-    )
+    if use_chunked_mode(contents, dataset_id):
+        # Oversized journals are validated in row batches
+        sheets = await process_pool.run(build_chunked_report, "vip-validation", contents)
+    else:
+        # Load the uploaded journal or stored dataset without reversed or
+        # invalid accounting entries (cached across hours-journal reports)
+        clean_df = await load_report_frame(
+            contents,
+            dataset_id,
+            owner=user.get("sub"),
+            kind=HOURS_JOURNAL,
+            required_columns=REQUIRED_COLUMNS,
+        )
+        print("File converted to a df")
 
-    incorrect_df = vip_service_df.find_incorrect_vip()
+        # Run VIP validation logic using external configuration
+        sheets = await process_pool.run(build_report, "vip-validation", clean_df)
 
-    incorrect_per_originator = vip_service_df.count_incorrect_entries_per_originator(incorrect_df)
+    incorrect_df = sheets["IncorrectVIPCodes"]
+    incorrect_per_originator = sheets["OriginatorEntriesCount"]
     # If no incorrect VIP codes are found, return early
     if incorrect_df.empty:
         return {
@@ -58,14 +60,15 @@ async def validate_and_export(user = Depends(require_role('site-admin')),content
             "incorrect_rows": 0,
         }
 
-    user_id = user.get("site-admin")
+    user_id = user.get("sub")
     
     # Export incorrect VIP rows to Excel and generate a download URL
-    urls = export_excel_and_get_url(
-        sheets={"IncorrectVIPCodes": incorrect_df, "OriginatorEntriesCount":incorrect_per_originator},
-        prefix="vip-validation",
-        filename_prefix="incorrect_vip",
-        user_id = user_id
+    urls = await export_report(
+        sheets=sheets,
+        prefix=REPORT["prefix"],
+        filename_prefix=REPORT["filename_prefix"],
+        user_id = user_id,
+        file_format=format,
     )
     print("Url created")
     # Return summary and download link
@@ -0,0 +1,71 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.core.settings import settings
+
+
+class ClaimsCache:
+    """
+    Process-wide LRU cache of verified access-token claims.
+
+    The frontend polls with the same access token many times, so each
+    token is verified (an RS256 signature check) once and its claims are
+    then served from memory. Entries are keyed by the token's SHA-256
+    digest, never the token itself. They expire skew_seconds before the
+    token's exp, and are ignored once the issuer's key set has changed
+    (see JWKSKeyManager.generation). Tokens without exp are not cached.
+    """
+
+    def __init__(self, max_entries: int, skew_seconds: int):
+        self.max_entries = max_entries
+        self.skew_seconds = skew_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str, generation: int) -> Optional[dict]:
+        """
+        Return a copy of the cached claims, or None when the token is not
+        cached, expired or was verified against an older key set.
+        """
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            claims, expires_at, entry_generation = entry
+            if expires_at <= time.time() or entry_generation != generation:
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+        return dict(claims)
+
+    def put(self, token: str, claims: dict, generation: int) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        expires_at = exp - self.skew_seconds
+        if expires_at <= time.time():
+            return
+
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (dict(claims), expires_at, generation)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+claims_cache = ClaimsCache(
+    max_entries=settings.claims_cache_max_entries,
+    skew_seconds=settings.claims_cache_skew_seconds,
+)
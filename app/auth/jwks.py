@@ -1,15 +1,159 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
 import httpx
-from app.core.OIDC_config import JWKS_URL
+from jose import jwk
+from jose.backends.base import Key
+from app.core.OIDC_config import JWKS_URL, OIDC_ALGORITHMS
+from app.core.settings import settings
 
-_jwks_cache = None
+logger = logging.getLogger("FastAPIApp")
 
-async def get_jwks():
-    global _jwks_cache
 
-    if _jwks_cache is None:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(JWKS_URL)
-            resp.raise_for_status()
-            _jwks_cache = resp.json()
+class JWKSKeyManager:
+    """
+    Signing keys of the OIDC issuer, fetched from its JWKS endpoint.
 
-    return _jwks_cache
+    Keys are parsed once per fetch and indexed by kid, so validating a
+    token is a dictionary lookup rather than a parse of the whole key set.
+    The set is refetched once it is ttl_seconds old, and when a token names
+    an unknown kid (the issuer rotated its keys), at most once every
+    min_refresh_interval_seconds so forged kids cannot trigger a fetch per
+    request. Concurrent refreshes are collapsed into a single fetch, and
+    if a refetch fails the previous keys stay in use. generation counts
+    the fetches that changed the key set, so anything derived from the
+    old keys (e.g. cached claims) can tell it is stale.
+
+    Fetches share one HTTP client, closed with the app lifespan. A
+    transport can be passed to serve the JWKS from a local stand-in in tests.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str = JWKS_URL,
+        ttl_seconds: int = None,
+        min_refresh_interval_seconds: int = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.jwks_url = jwks_url
+        self.ttl_seconds = settings.jwks_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.min_refresh_interval_seconds = (
+            settings.jwks_min_refresh_interval_seconds
+            if min_refresh_interval_seconds is None
+            else min_refresh_interval_seconds
+        )
+        self.transport = transport
+        self._keys: Dict[Optional[str], Key] = {}
+        self._key_data: Optional[list] = None
+        self.generation = 0
+        self._fetched_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = asyncio.Lock()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    async def get_key(self, kid: Optional[str]) -> Key:
+        """
+        Return the parsed public key for kid.
+
+        :raises KeyError: If the issuer has no such key
+        """
+        if self._needs_refresh():
+            await self._refresh_when(self._needs_refresh)
+
+        key = self._find(kid)
+        if key is None and self._can_refresh_early():
+            await self._refresh_when(lambda: self._find(kid) is None and self._can_refresh_early())
+            key = self._find(kid)
+
+        if key is None:
+            raise KeyError(f"Unknown signing key: {kid}")
+        return key
+
+    async def refresh(self) -> None:
+        """
+        Fetch and index the key set now.
+        """
+        await self._refresh_when(lambda: True)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    async def _refresh_when(self, needed: Callable[[], bool]) -> None:
+        """
+        Fetch the key set if needed() still holds once the lock is held.
+
+        Callers that queued behind a fetch find their reason gone when it
+        completes, so a burst of lookups results in a single fetch.
+        """
+        async with self._lock:
+            if not needed():
+                return
+            self._attempted_at = time.time()
+
+            try:
+                response = await self._get_client().get(self.jwks_url)
+                response.raise_for_status()
+                key_data = response.json().get("keys", [])
+                keys = self._parse(key_data)
+            except (httpx.HTTPError, ValueError):
+                if not self._keys:
+                    raise
+                logger.warning("JWKS refresh failed; keeping the previous keys", exc_info=True)
+                return
+
+            if key_data != self._key_data:
+                self._key_data = key_data
+                self._keys = keys
+                self.generation += 1
+            self._fetched_at = self._attempted_at
+
+    def _needs_refresh(self) -> bool:
+        expired = self._fetched_at is None or self._fetched_at + self.ttl_seconds <= time.time()
+        # After a failed refetch the old keys are used until the next attempt is due
+        return expired and (not self._keys or self._can_refresh_early())
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.jwks_fetch_timeout_seconds,
+                transport=self.transport,
+            )
+        return self._client
+
+    def _find(self, kid: Optional[str]) -> Optional[Key]:
+        if kid is None and len(self._keys) == 1:
+            # Tokens without a kid can only name the issuer's single key
+            return next(iter(self._keys.values()))
+        return self._keys.get(kid)
+
+    def _can_refresh_early(self) -> bool:
+        return self._attempted_at is None or self._attempted_at + self.min_refresh_interval_seconds <= time.time()
+
+    @staticmethod
+    def _parse(jwks_keys: list) -> Dict[Optional[str], Key]:
+        """
+        Parse the signature keys of a JWKS document, skipping encryption
+        keys and algorithms tokens are not accepted with.
+        """
+        keys = {}
+        for key_data in jwks_keys:
+            algorithm = key_data.get("alg", OIDC_ALGORITHMS[0])
+            if key_data.get("use", "sig") != "sig" or algorithm not in OIDC_ALGORITHMS:
+                continue
+            try:
+                keys[key_data.get("kid")] = jwk.construct(key_data, algorithm)
+            except Exception:
+                logger.warning("Skipping unparseable JWKS key %s", key_data.get("kid"), exc_info=True)
+        return keys
+
+
+jwks_key_manager = JWKSKeyManager()
@@ -1,17 +1,29 @@
 from jose import jwt
-from app.auth.jwks import get_jwks
+from app.auth.claims_cache import claims_cache
+from app.auth.jwks import jwks_key_manager
 from app.core.OIDC_config import OIDC_ISSUER, OIDC_AUDIENCE, OIDC_ALGORITHMS
 from app.utils.exceptions import AuthenticationError
 
 
 async def decode_access_token(token: str) -> dict:
+    claims = claims_cache.get(token, jwks_key_manager.generation)
+    if claims is not None:
+        return claims
+
     try:
-        return jwt.decode(
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = await jwks_key_manager.get_key(kid)
+        # The key set cannot change between here and the (synchronous) verification
+        generation = jwks_key_manager.generation
+        claims = jwt.decode(
             token,
-            await get_jwks(),
+            key,
             algorithms=OIDC_ALGORITHMS,
             audience=OIDC_AUDIENCE,
             issuer=OIDC_ISSUER,
         )
     except Exception:
         raise AuthenticationError("Token validation failed")
+
+    claims_cache.put(token, claims, generation)
+    return claims
@@ -0,0 +1,91 @@
+import threading
+from typing import Dict, Optional
+import boto3
+from botocore.config import Config
+from app.core.settings import settings
+
+
+class AWSClients:
+    """
+    Registry of AWS clients shared by the whole process.
+
+    Building a boto3 client loads service models and resolves endpoints,
+    and each client keeps its own HTTP connection pool. Creating them once
+    and reusing them avoids that setup on every request and keeps
+    connections to S3, DynamoDB and Bedrock open between requests.
+
+    Clients are created on first use from a single session with the tuned
+    connection, keep-alive and retry configuration below. boto3 clients
+    are thread-safe, so report threads and worker pools share them too.
+    The app lifespan starts the registry and closes the clients on shutdown.
+    """
+
+    def __init__(self):
+        self.config = Config(
+            max_pool_connections=settings.aws_max_pool_connections,
+            tcp_keepalive=True,
+            connect_timeout=settings.aws_connect_timeout,
+            read_timeout=settings.aws_read_timeout,
+            retries={"max_attempts": settings.aws_max_attempts, "mode": "standard"},
+        )
+        self._session: Optional[boto3.session.Session] = None
+        self._clients: Dict[str, object] = {}
+        self._resources: Dict[str, object] = {}
+        # boto3 sessions are not thread-safe; clients are created under the lock
+        self._lock = threading.Lock()
+
+    def client(self, service_name: str):
+        """
+        Return the shared client for service_name (e.g. "s3", "bedrock-runtime").
+        """
+        client = self._clients.get(service_name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(service_name)
+                if client is None:
+                    client = self._get_session().client(service_name, config=self.config)
+                    self._clients[service_name] = client
+        return client
+
+    def resource(self, service_name: str):
+        """
+        Return the shared resource for service_name (e.g. "dynamodb").
+        """
+        resource = self._resources.get(service_name)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(service_name)
+                if resource is None:
+                    resource = self._get_session().resource(service_name, config=self.config)
+                    self._resources[service_name] = resource
+        return resource
+
+    def start(self) -> None:
+        """
+        Create the clients on the request hot path up front, so the first
+        requests do not pay for their setup.
+        """
+        if settings.storage_backend == "s3":
+            self.client("s3")
+
+    def close(self) -> None:
+        """
+        Close every client's connection pool and forget the clients.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            clients += [resource.meta.client for resource in self._resources.values()]
+            self._clients = {}
+            self._resources = {}
+            self._session = None
+
+        for client in clients:
+            client.close()
+
+    def _get_session(self) -> boto3.session.Session:
+        if self._session is None:
+            self._session = boto3.session.Session(region_name=settings.region)
+        return self._session
+
+
+aws_clients = AWSClients()
@@ -1,13 +1,10 @@
-import boto3
 import json
-from app.core.settings import settings
+from app.core.aws_clients import aws_clients
 
 class BedrockAIClient:
-    def __init__(self):
-        self.client = boto3.client(
-            service_name="bedrock-runtime",
-            region_name=settings.region  # e.g. "us-east-1"
-        )
+    def __init__(self, client=None):
+        # Shared bedrock-runtime client unless one is injected
+        self.client = client or aws_clients.client("bedrock-runtime")
 
         # Inference profile ARN for Claude 3 Sonnet
         self.model_id = (
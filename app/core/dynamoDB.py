@@ -1,11 +1,8 @@
-import boto3
-from app.core.settings import settings
-
-# Create a single DynamoDB resource
-dynamodb = boto3.resource("dynamodb", region_name=settings.region)
+from app.core.aws_clients import aws_clients
 
 def get_table(table_name: str):
     """
-    Return a DynamoDB Table object for the given table name.
+    Return a DynamoDB Table object for the given table name, backed by the
+    shared DynamoDB resource.
     """
-    return dynamodb.Table(table_name)
+    return aws_clients.resource("dynamodb").Table(table_name)
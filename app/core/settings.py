@@ -1,3 +1,4 @@
+import tempfile
 from typing import Optional
 from pydantic_settings import BaseSettings
 
@@ -14,6 +15,106 @@ class Settings(BaseSettings):
     books_domain:str = ""
     google_api_key: str = ""
 
+    # Memory budget for parsed uploads shared across report endpoints
+    dataframe_cache_max_bytes: int = 512 * 1024 * 1024
+
+    # Lifetime and total memory budget of datasets stored via /datasets
+    dataset_ttl_seconds: int = 60 * 60
+    dataset_store_max_bytes: int = 1024 * 1024 * 1024
+
+    # Maximum number of multi-file uploads parsed concurrently
+    upload_parse_workers: int = 4
+
+    # Hours journals at or above the threshold are processed in row batches
+    # of journal_chunk_rows instead of being loaded whole
+    hours_journal_max_upload_bytes: int = 256 * 1024 * 1024
+    chunked_journal_threshold_bytes: int = 32 * 1024 * 1024
+    journal_chunk_rows: int = 100_000
+
+    # Exports are streamed to S3 in parts of this size, uploaded in parallel
+    s3_multipart_part_size: int = 8 * 1024 * 1024
+    s3_multipart_workers: int = 4
+
+    # Exports are stored under a hash of their contents; keys known to exist
+    # are remembered for this long so repeats skip the storage lookup
+    export_index_max_entries: int = 10_000
+    export_index_ttl_seconds: int = 60 * 60
+
+    # Worker processes running /jobs reports (at most one per core), and how
+    # long finished jobs stay queryable
+    report_job_workers: int = 2
+    report_job_ttl_seconds: int = 60 * 60
+
+    # Worker processes shared by the synchronous report endpoints for
+    # parsing, services and exports (0 runs them in the API process)
+    report_process_workers: int = 2
+
+    # Where DataFrames passed to and from those workers are memory-mapped.
+    # A tmpfs such as /dev/shm is faster but must be sized for the largest
+    # report (Docker gives it 64 MB); frames that do not fit are pickled
+    shared_frame_dir: str = tempfile.gettempdir()
+
+    # Shared AWS clients (see aws_clients): connections pooled per client,
+    # timeouts in seconds and attempts per call including retries
+    aws_max_pool_connections: int = 50
+    aws_connect_timeout: int = 5
+    aws_read_timeout: int = 60
+    aws_max_attempts: int = 5
+
+    # xlsx exports: sheets longer than Excel's row limit (header excluded)
+    # are split into numbered sheets, and exports longer than
+    # excel_max_workbook_rows into several workbooks zipped together
+    excel_max_sheet_rows: int = 1_048_575
+    excel_max_workbook_rows: int = 2 * 1_048_575
+
+    # Local storage backend: where exports are written, the public base URL
+    # of this API used in their download links (empty for relative links),
+    # the key signing those links (generated and kept in local_export_dir
+    # when empty) and the size of the chunks downloads are streamed in
+    local_export_dir: str = "exports"
+    export_base_url: str = ""
+    export_signing_key: str = ""
+    export_download_chunk_bytes: int = 1024 * 1024
+
+    # Local export retention: exports unused (not downloaded or reused) for
+    # export_max_age_seconds are deleted, then the least recently used while
+    # the directory holds more than export_max_bytes; checked every
+    # export_janitor_interval_seconds by a background thread
+    export_max_age_seconds: int = 7 * 24 * 60 * 60
+    export_max_bytes: int = 10 * 1024 * 1024 * 1024
+    export_janitor_interval_seconds: int = 60
+
+    # OIDC signing keys: refetched after jwks_ttl_seconds, or early for an
+    # unknown kid at most once per jwks_min_refresh_interval_seconds
+    jwks_ttl_seconds: int = 60 * 60
+    jwks_min_refresh_interval_seconds: int = 30
+    jwks_fetch_timeout_seconds: float = 5.0
+
+    # Verified token claims are reused until this long before the token's
+    # exp, for at most claims_cache_max_entries tokens
+    claims_cache_max_entries: int = 10_000
+    claims_cache_skew_seconds: int = 30
+
+    # Book metadata providers: per-request timeouts in seconds, and circuit
+    # breaking for book_provider_reset_seconds after
+    # book_provider_failure_threshold consecutive failures
+    google_books_timeout_seconds: float = 3.0
+    open_library_timeout_seconds: float = 5.0
+    book_provider_failure_threshold: int = 5
+    book_provider_reset_seconds: float = 30.0
+
+    # SQLite file behind the persistent caches (see PersistentCache)
+    cache_db_path: str = "cache/app_cache.sqlite3"
+
+    # identify_book results: entries kept in memory, and how long matches
+    # and queries no provider matched are cached
+    book_metadata_cache_entries: int = 10_000
+    book_metadata_ttl_seconds: int = 30 * 24 * 60 * 60
+    book_metadata_negative_ttl_seconds: int = 24 * 60 * 60
+
+    # describe_book summaries: entries kept in memory, and how long they are kept
+    book_summary_cache_entries: int = 1_000
+    book_summary_ttl_seconds: int = 90 * 24 * 60 * 60
 
     # Optional strings (can be None)
     bucket_name: Optional[str] = None
@@ -0,0 +1,16 @@
+from app.core.aws_clients import aws_clients
+
+
+# FastAPI dependencies handing out the process-wide AWS clients; override
+# them in tests to inject stubs
+
+def get_s3_client():
+    return aws_clients.client("s3")
+
+
+def get_dynamodb():
+    return aws_clients.resource("dynamodb")
+
+
+def get_bedrock_client():
+    return aws_clients.client("bedrock-runtime")
@@ -1,32 +1,57 @@
 from fastapi import UploadFile,File, HTTPException
-from typing import List
+from typing import AsyncIterator, List, Optional, Set
+from app.utils.upload_preflight import validate_required_columns
+from app.utils.upload_spool import SpooledUpload, spool_upload
 
 class FileUploadValidator:
-    def __init__(self, max_size: int = 10 * 1024 * 1024, allowed_types: List[str] = None):
+    def __init__(
+        self,
+        max_size: int = 10 * 1024 * 1024,
+        allowed_types: List[str] = None,
+        required_columns: Set[str] = None,
+        file_required: bool = True,
+    ):
         if allowed_types is None:
             allowed_types = [
                 "text/csv",
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                # Windows browsers label .csv files with the Excel type
+                "application/vnd.ms-excel",
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                "application/vnd.apache.parquet",
+                "application/vnd.apache.arrow.file",
+                "application/vnd.apache.arrow.stream",
+                # Parquet / Feather files usually arrive untyped; the loader sniffs the format
+                "application/octet-stream",
             ]
         self.max_size = max_size
         self.allowed_types = allowed_types
+        self.required_columns = required_columns
+        # Endpoints that also accept a stored dataset_id make the file optional
+        self.file_required = file_required
 
-    async def __call__(self, file: UploadFile= File(...)):
+    async def __call__(self, file: Optional[UploadFile] = File(None)) -> AsyncIterator[Optional[SpooledUpload]]:
+
+        if file is None:
+            if self.file_required:
+                raise HTTPException(status_code=400, detail="No file uploaded")
+            yield None
+            return
 
         # ✅ Validate content type
         if file.content_type not in self.allowed_types:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid file type: {file.content_type}. Only CSV or Excel allowed."
+                detail=f"Invalid file type: {file.content_type}. Only CSV, Excel, Parquet or Arrow allowed."
             )
 
-        # ✅ Validate file size
-        contents = await file.read()
-        if len(contents) > self.max_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Max size is {self.max_size / (1024*1024)} MB."
-            )
-    
+        # ✅ Validate file size while spooling to disk (aborts past max_size)
+        contents = await spool_upload(file, self.max_size)
+
+        try:
+            # ✅ Validate header columns (reads the header row only)
+            if self.required_columns:
+                validate_required_columns(contents, self.required_columns)
 
-        return contents
+            yield contents
+        finally:
+            contents.close()
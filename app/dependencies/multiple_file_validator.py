@@ -1,15 +1,55 @@
+import asyncio
 from fastapi import UploadFile, File, Form, HTTPException
 from typing import List, Set
 import pandas as pd
-from io import BytesIO
+from app.core.settings import settings
+from app.utils.excel_upload_utils import read_upload_frame
+from app.utils.process_pool import process_pool
+from app.utils.upload_spool import SpooledUpload, as_stream, spool_upload
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx", ".xls", ".parquet", ".feather", ".arrow", ".ipc")
+
+
+def _parse_file(contents: SpooledUpload) -> pd.DataFrame:
+    if contents.filename.lower().endswith(".xls"):
+        with as_stream(contents) as stream:
+            return pd.read_excel(stream)
+    return read_upload_frame(contents)
+
+
+def _parse_in_pool(contents: SpooledUpload) -> pd.DataFrame:
+    """
+    Parse one spooled file in a report worker process, or inline in the
+    calling thread until the pool is started.
+    """
+    [df] = process_pool.map(_parse_file, [(contents,)])
+    return df
+
 
 class MultiFileValidator:
     def __init__(self, max_size: int = 10 * 1024 * 1024, allowed_types: Set[str] = None):
         self.max_size = max_size
         self.allowed_types = allowed_types or {
             "text/csv",
+            "application/vnd.ms-excel",
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "application/vnd.apache.parquet",
+            "application/vnd.apache.arrow.file",
+            "application/vnd.apache.arrow.stream",
+            "application/octet-stream",
         }
+        # Bounds how many files of all requests are parsed at the same time
+        self.parse_slots = asyncio.Semaphore(settings.upload_parse_workers)
+
+    async def _parse(self, contents: SpooledUpload) -> pd.DataFrame:
+        """
+        Parse one spooled file off the event loop.
+
+        The parse itself runs in a worker process: openpyxl holds the GIL,
+        so xlsx files parsed in threads would not overlap.
+        """
+        async with self.parse_slots:
+            return await asyncio.to_thread(_parse_in_pool, contents)
 
     async def __call__(
         self,
@@ -19,39 +59,41 @@ class MultiFileValidator:
         if len(files) < 2:
             raise HTTPException(status_code=400, detail="Upload at least two files")
 
-        dataframes = []
         for file in files:
-            filename = file.filename.lower()
-            contents = await file.read()
-
-            if len(contents) > self.max_size:
+            if not file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
                 raise HTTPException(
                     status_code=400,
-                    detail=f"File {file.filename} too large. Max size is {self.max_size / (1024*1024)} MB.",
+                    detail=f"Unsupported file type: {file.filename}",
                 )
 
-            try:
-                if filename.endswith(".csv"):
-                    df = pd.read_csv(BytesIO(contents))
-                elif filename.endswith((".xlsx", ".xls")):
-                    df = pd.read_excel(BytesIO(contents))
-                else:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Unsupported file type: {file.filename}",
-                    )
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to process {file.filename}: {str(e)}",
-                )
+        spools = []
+        try:
+            for file in files:
+                spools.append(await spool_upload(file, self.max_size))
 
+            # Parse all files concurrently; wall-clock time is roughly that
+            # of the slowest file
+            results = await asyncio.gather(
+                *(self._parse(contents) for contents in spools),
+                return_exceptions=True,
+            )
+        finally:
+            for contents in spools:
+                contents.close()
+
+        errors = [
+            f"Failed to process {file.filename}: {str(result)}"
+            for file, result in zip(files, results)
+            if isinstance(result, Exception)
+        ]
+        if errors:
+            raise HTTPException(status_code=400, detail="; ".join(errors))
+
+        for file, df in zip(files, results):
             if join_by_column not in df.columns:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Column '{join_by_column}' not found in file: {file.filename}",
                 )
 
-            dataframes.append(df)
-
-        return dataframes
+        return results
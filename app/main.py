@@ -1,8 +1,16 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.settings import settings
+from app.core.aws_clients import aws_clients
+from app.auth.jwks import jwks_key_manager
 from fastapi.responses import JSONResponse
 from app.utils.exceptions import AuthorizationError
+from app.utils.dataframe_cache import dataframe_cache
+from app.services.report_job_service import report_job_service
+from app.services.export_retention_service import export_retention_service
+from app.services.book_identifier_service import book_identifier_service, book_metadata_cache, book_summary_cache
+from app.utils.process_pool import process_pool
 
 
 #routers import
@@ -16,10 +24,32 @@ from app.api.v1.routers import (
     attendance_router,
     email_organizer_router,
     book_identifier_router,
-    book_router
+    book_router,
+    dataset_router,
+    jobs_router,
+    exports_router
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_):
+    aws_clients.start()
+    process_pool.start()
+    export_retention_service.start()
+    yield
+    export_retention_service.shutdown()
+    # Stop the report worker processes with the app; report jobs first, as
+    # they may still be exporting through the process pool
+    report_job_service.shutdown()
+    process_pool.shutdown()
+    aws_clients.close()
+    await jwks_key_manager.aclose()
+    await book_identifier_service.aclose()
+    book_metadata_cache.close()
+    book_summary_cache.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow requests from specific origins (frontend URLs)
 
@@ -45,6 +75,9 @@ app.include_router(attendance_router.router)
 app.include_router(email_organizer_router.router)
 app.include_router(book_identifier_router.router)
 app.include_router(book_router.router)
+app.include_router(dataset_router.router)
+app.include_router(jobs_router.router)
+app.include_router(exports_router.router)
 
 @app.exception_handler(AuthorizationError)
 def authz_exception_handler(_, __):
@@ -59,5 +92,11 @@ def read_root():
 
 @app.get("/health")
 def read_root():
-    return {"message":"The server is healthy"}
+    return {
+        "message":"The server is healthy",
+        "dataframe_cache": dataframe_cache.stats(),
+        "exports": export_retention_service.stats(),
+        "book_metadata_cache": book_metadata_cache.stats(),
+        "book_summary_cache": book_summary_cache.stats(),
+    }
 
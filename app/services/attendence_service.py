@@ -27,7 +27,7 @@ class AttendanceService:
         # Group by site and date, count unique employees
         attendance_summary = (
             unique_attendance
-            .groupby(["WTT", "Date"])
+            .groupby(["WTT", "Date"], observed=True)
             .size()
             .reset_index(name="attendance")
         )
@@ -45,7 +45,7 @@ class AttendanceService:
         df["week"] = pd.to_datetime(df["Date"]).dt.to_period("W")
         # Group by employee and week, then count attendance days
         attendance = (
-            df.groupby(["Clock No.", "week"])
+            df.groupby(["Clock No.", "week"], observed=True)
               .size()
               .reset_index(name="attendance_days")
         )
@@ -63,7 +63,7 @@ class AttendanceService:
         df["month"] = pd.to_datetime(df["Date"]).dt.to_period("M")
         # Group by employee and month, then count attendance days
         attendance = (
-            df.groupby(["Clock No.", "month"])
+            df.groupby(["Clock No.", "month"], observed=True)
               .size()
               .reset_index(name="attendance_days")
         )
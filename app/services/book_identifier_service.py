@@ -1,19 +1,133 @@
-import requests
-from typing import Dict, Any, Optional, List
+import asyncio
+import json
+import logging
+import re
+import httpx
+from typing import Dict, Any, Optional, List, Tuple
 from app.core.settings import settings
 from app.core.bedrockAIConfig import BedrockAIClient
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.persistent_cache import PersistentCache
+
+logger = logging.getLogger("FastAPIApp")
 
 bedrock_ai = BedrockAIClient()
 
+GOOGLE_BOOKS_URL = "https://www.googleapis.com/books/v1/volumes"
+OPEN_LIBRARY_URL = "https://openlibrary.org/search.json"
+
+book_metadata_cache = PersistentCache(
+    "book_metadata",
+    db_path=settings.cache_db_path,
+    max_memory_entries=settings.book_metadata_cache_entries,
+)
+
+
+book_summary_cache = PersistentCache(
+    "book_summaries",
+    db_path=settings.cache_db_path,
+    max_memory_entries=settings.book_summary_cache_entries,
+)
+
+
+def _normalise_text(value) -> Optional[str]:
+    # Case-folded, with runs of whitespace collapsed
+    return " ".join(str(value).split()).casefold() if value is not None else None
+
+
+def _normalise_isbn(isbn) -> str:
+    # Digits and the X check character only, without hyphens or spaces
+    return re.sub(r"[^0-9X]", "", str(isbn).upper())
+
 
 class BookIdentifierService:
-    def __init__(self):
+    """
+    Identifies books from their metadata through Google Books and Open
+    Library.
+
+    Both providers are queried concurrently over one pooled async HTTP
+    client, each with its own timeout and circuit breaker, and the first
+    match is used. Results and summaries are cached (see identify_book
+    and describe_book). The client is closed with the app lifespan.
+    Provider URLs, an httpx transport and caches can be passed to run
+    against local stubs.
+    """
+
+    def __init__(
+        self,
+        google_books_url: str = GOOGLE_BOOKS_URL,
+        open_library_url: str = OPEN_LIBRARY_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        metadata_cache: Optional[PersistentCache] = None,
+        summary_cache: Optional[PersistentCache] = None,
+    ):
+        self.metadata_cache = metadata_cache or book_metadata_cache
+        self.summary_cache = summary_cache or book_summary_cache
+        self._summaries_in_flight: Dict[str, asyncio.Future] = {}
         self.google_api_key = settings.google_books_api_key
+        self.google_books_url = google_books_url
+        self.open_library_url = open_library_url
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.google_breaker = CircuitBreaker(
+            "google_books",
+            failure_threshold=settings.book_provider_failure_threshold,
+            reset_timeout_seconds=settings.book_provider_reset_seconds,
+        )
+        self.open_library_breaker = CircuitBreaker(
+            "openlibrary",
+            failure_threshold=settings.book_provider_failure_threshold,
+            reset_timeout_seconds=settings.book_provider_reset_seconds,
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # --------------------------------------------------
+    # Provider requests
+    # --------------------------------------------------
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self.transport,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def _get_json(self, breaker: CircuitBreaker, url: str, params: dict, timeout: float) -> Optional[dict]:
+        """
+        GET a provider's JSON response through its circuit breaker.
+
+        Returns None when the circuit is open or the request fails.
+        Timeouts, connection errors, 5xx and 429 responses count as
+        failures of the provider; other client errors do not.
+        """
+        if not breaker.allow():
+            return None
+
+        try:
+            r = await self._get_client().get(url, params=params, timeout=timeout)
+            if r.status_code >= 500 or r.status_code == 429:
+                r.raise_for_status()
+            data = r.json() if r.is_success else None
+        except (httpx.HTTPError, ValueError) as e:
+            breaker.record_failure()
+            logger.warning("%s lookup failed: %r", breaker.name, e)
+            return None
+        except asyncio.CancelledError:
+            # Lost the race; says nothing about the provider's health
+            breaker.release()
+            raise
+
+        breaker.record_success()
+        return data
 
     # --------------------------------------------------
     # Google Books lookup
     # --------------------------------------------------
-    def lookup_google(
+    async def lookup_google(
         self,
         title: str,
         author: Optional[str] = None,
@@ -23,7 +137,11 @@ class BookIdentifierService:
         categories: Optional[List[str]] = None,
         series: Optional[str] = None,
         edition: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the best Google Books match, {} for no match, or None when
+        the provider failed or its circuit is open.
+        """
         query = f'intitle:"{title}"'
         if author:
             query += f' inauthor:"{author}"'
@@ -40,20 +158,24 @@ class BookIdentifierService:
         if edition:
             query += f' "{edition}"'
 
-        r = requests.get(
-            "https://www.googleapis.com/books/v1/volumes",
-            params={"q": query, "key": self.google_api_key, "maxResults": 1}
+        params = {"q": query, "maxResults": 1}
+        if self.google_api_key:
+            params["key"] = self.google_api_key
+
+        data = await self._get_json(
+            self.google_breaker, self.google_books_url, params, settings.google_books_timeout_seconds
         )
-        data = r.json()
 
+        if data is None:
+            return None
         if data.get("items"):
             return self.normalize_google(data["items"][0]["volumeInfo"])
         return {}
 
     # --------------------------------------------------
-    # Open Library fallback
+    # Open Library lookup
     # --------------------------------------------------
-    def lookup_open_library(
+    async def lookup_open_library(
         self,
         title: str,
         author: Optional[str] = None,
@@ -63,7 +185,11 @@ class BookIdentifierService:
         categories: Optional[List[str]] = None,
         series: Optional[str] = None,
         edition: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the best Open Library match, {} for no match, or None when
+        the provider failed or its circuit is open.
+        """
         params = {"title": title, "limit": 1}
         if author:
             params["author"] = author
@@ -80,9 +206,12 @@ class BookIdentifierService:
         if edition:
             params["edition"] = edition
 
-        r = requests.get("https://openlibrary.org/search.json", params=params)
-        data = r.json()
+        data = await self._get_json(
+            self.open_library_breaker, self.open_library_url, params, settings.open_library_timeout_seconds
+        )
 
+        if data is None:
+            return None
         if data.get("docs"):
             doc = data["docs"][0]
             return {
@@ -121,7 +250,7 @@ class BookIdentifierService:
     # --------------------------------------------------
     # MAIN: metadata-only identification
     # --------------------------------------------------
-    def identify_book(
+    async def identify_book(
         self,
         title: str,
         author: Optional[str] = None,
@@ -133,17 +262,80 @@ class BookIdentifierService:
         series: Optional[str] = None,
         edition: Optional[str] = None,
     ) -> Dict[str, Any]:
-        # Try Google Books first
-        book = self.lookup_google(title, author, publish_date, publisher, language, categories, series, edition)
-        if book:
-            return {"confidence": 0.9, **book}
+        """
+        Identify a book, serving repeated queries from the metadata cache.
+
+        Matches are cached for book_metadata_ttl_seconds. Queries both
+        providers answered without a match are cached for
+        book_metadata_negative_ttl_seconds; when a provider failed or was
+        skipped the result is not cached, so the query is retried.
+        """
+        query = (title, author, publish_date, publisher, language, categories, series, edition)
+        key = self._cache_key(title, author, isbn, publish_date, publisher, language, categories, series, edition)
+
+        cached = await asyncio.to_thread(self.metadata_cache.get, key)
+        if cached is not None:
+            return cached if cached["source"] != "none" else self._not_found(*query)
 
-        # Fallback to Open Library
-        book = self.lookup_open_library(title, author, publish_date, publisher, language, categories, series, edition)
+        book, answered = await self._lookup_first_match(query)
         if book:
-            return {"confidence": 0.7, **book}
+            await asyncio.to_thread(self.metadata_cache.set, key, book, settings.book_metadata_ttl_seconds)
+            return book
 
-        # Failure
+        result = self._not_found(*query)
+        if answered:
+            await asyncio.to_thread(self.metadata_cache.set, key, {"source": "none"}, settings.book_metadata_negative_ttl_seconds)
+        return result
+
+    async def _lookup_first_match(self, query: tuple) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Query both providers at once and return the first match, and
+        whether every provider answered (rather than failing).
+        """
+        # When both match together Google Books (the higher confidence) wins
+        lookups = {
+            asyncio.create_task(self.lookup_google(*query)): 0.9,
+            asyncio.create_task(self.lookup_open_library(*query)): 0.7,
+        }
+        pending = set(lookups)
+        answered = True
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for lookup in sorted(done, key=lookups.get, reverse=True):
+                    book = lookup.result()
+                    if book:
+                        return {"confidence": lookups[lookup], **book}, True
+                    if book is None:
+                        answered = False
+        finally:
+            for lookup in pending:
+                lookup.cancel()
+
+        return None, answered
+
+    @staticmethod
+    def _cache_key(
+        title, author, isbn, publish_date, publisher, language, categories, series, edition
+    ) -> str:
+        """
+        Normalise a query so differently cased or spaced queries share one
+        cache entry.
+        """
+        return json.dumps({
+            "title": _normalise_text(title),
+            "author": _normalise_text(author),
+            "isbn": _normalise_isbn(isbn) if isbn else None,
+            "publish_date": _normalise_text(publish_date),
+            "publisher": _normalise_text(publisher),
+            "language": _normalise_text(language),
+            "categories": [_normalise_text(category) for category in categories or []],
+            "series": _normalise_text(series),
+            "edition": _normalise_text(edition),
+        }, sort_keys=True)
+
+    @staticmethod
+    def _not_found(title, author, publish_date, publisher, language, categories, series, edition) -> Dict[str, Any]:
         return {
             "confidence": 0.0,
             "title": title,
@@ -160,17 +352,45 @@ class BookIdentifierService:
     # --------------------------------------------------
     # Summarize book using AI
     # --------------------------------------------------
-    def describe_book(self, title: Optional[str] = None, author: Optional[str] = None, isbn: Optional[str] = None):
+    async def describe_book(self, title: Optional[str] = None, author: Optional[str] = None, isbn: Optional[str] = None):
+        """
+        Summarise a book with Bedrock.
+
+        Summaries are kept in the summary cache for book_summary_ttl_seconds,
+        keyed by the normalised title and author, or ISBN, the prompt was
+        built from. Concurrent requests for the same book share one Bedrock
+        call, which runs in a worker thread so the event loop stays free.
+        """
         if not title and not author and not isbn:
             return {"error": "Provide a title, author, or ISBN"}
 
         if title and author:
             prompt = f"Summarize the book '{title}' by {author}."
+            key = json.dumps({"title": _normalise_text(title), "author": _normalise_text(author)}, sort_keys=True)
         elif isbn:
             prompt = f"Summarize the book with ISBN '{isbn}'."
+            key = json.dumps({"isbn": _normalise_isbn(isbn)})
         else:
             prompt = f"Summarize the book titled '{title}'."
+            key = json.dumps({"title": _normalise_text(title)})
 
-        summary = bedrock_ai.ask(prompt)
+        summary = await asyncio.to_thread(self.summary_cache.get, key)
+        if summary is None:
+            flight = self._summaries_in_flight.get(key)
+            if flight is None:
+                flight = asyncio.ensure_future(self._summarise(key, prompt))
+                self._summaries_in_flight[key] = flight
+                flight.add_done_callback(lambda _: self._summaries_in_flight.pop(key, None))
+            # A client giving up must not cancel the call others are waiting on
+            summary = await asyncio.shield(flight)
 
         return {"summary": summary}
+
+    async def _summarise(self, key: str, prompt: str) -> str:
+        summary = await asyncio.to_thread(bedrock_ai.ask, prompt)
+        if summary:
+            await asyncio.to_thread(self.summary_cache.set, key, summary, settings.book_summary_ttl_seconds)
+        return summary
+
+
+book_identifier_service = BookIdentifierService()
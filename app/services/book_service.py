@@ -1,13 +1,13 @@
 import uuid
 from datetime import datetime, timezone
-import boto3
+from app.core.aws_clients import aws_clients
 from app.core.dynamoDB import get_table
 from app.core.settings import settings
 
 class BookService:
-    def __init__(self, table_name: str = settings.books_table):
+    def __init__(self, table_name: str = settings.books_table, s3_client=None):
         self.table = get_table(table_name)
-        self.s3 = boto3.client("s3")
+        self.s3 = s3_client or aws_clients.client("s3")
         self.bucket = settings.library_bucket
         self.books_domain = settings.books_domain
 
@@ -0,0 +1,130 @@
+from fastapi import HTTPException
+from typing import Iterator, Optional, Set, Tuple
+import pandas as pd
+from app.core.settings import settings
+from app.services.exemption_service import ExemptionService
+from app.services.incorrect_vip_service import IncorrectVIPService
+from app.services.overbooking_service import OverbookingService
+from app.utils.constants import HOURS_JOURNAL_COLUMNS
+from app.utils.excel_upload_utils import iter_upload_batches
+from app.utils.report_schemas import HOURS_JOURNAL_SCHEMA, apply_schema
+from app.utils.reversed_entries_utils import find_reversed_entry_nos
+from app.utils.upload_preflight import read_header, validate_required_columns
+from app.utils.upload_spool import UploadContents
+
+
+def use_chunked_mode(contents: Optional[UploadContents], dataset_id: Optional[str]) -> bool:
+    """
+    Whether an hours-journal upload is large enough to be processed in batches.
+    """
+    return (
+        contents is not None
+        and not dataset_id
+        and len(contents) >= settings.chunked_journal_threshold_bytes
+    )
+
+
+class ChunkedJournalService:
+    """
+    Runs the hours-journal reports over an upload in row batches.
+
+    Only one batch of the journal is held in memory at a time. Each report
+    keeps mergeable partial results between batches (reversed entry numbers,
+    weekly hour totals, running daily totals, seen overtime rows) and
+    combines them at the end, so memory is bounded by the number of distinct
+    groups rather than by the journal size.
+    """
+
+    def __init__(self, contents: UploadContents, required_columns: Set[str], batch_rows: int = None):
+        self.contents = contents
+        self.required_columns = required_columns
+        self.columns = frozenset(HOURS_JOURNAL_COLUMNS) | frozenset(required_columns)
+        self.batch_rows = batch_rows or settings.journal_chunk_rows
+
+    # -------------------------
+    # Batches
+    # -------------------------
+    def _read_batches(self) -> Iterator[pd.DataFrame]:
+        batches = iter_upload_batches(self.contents, self.columns, self.batch_rows)
+        produced = False
+
+        while True:
+            try:
+                batch = next(batches, None)
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if batch is None:
+                break
+
+            produced = True
+            yield apply_schema(batch, HOURS_JOURNAL_SCHEMA)
+
+        # A journal without data rows still runs through the reports once
+        if not produced:
+            names = [name for name in read_header(self.contents) if name in self.columns]
+            yield apply_schema(pd.DataFrame(columns=names), HOURS_JOURNAL_SCHEMA)
+
+    def clean_batches(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield journal batches without reversed entries.
+
+        Reversals can point at entries in any other batch, so a first pass
+        collects the Entry Nos. to remove and a second pass filters them out.
+        """
+        validate_required_columns(self.contents, self.required_columns)
+
+        entry_nos_to_remove = set()
+        for batch in self._read_batches():
+            entry_nos_to_remove |= find_reversed_entry_nos(batch)
+
+        for batch in self._read_batches():
+            yield batch[~batch["Entry No."].isin(entry_nos_to_remove)].copy()
+
+    # -------------------------
+    # Reports
+    # -------------------------
+    def find_incorrect_vip(self, config_path: str) -> pd.DataFrame:
+        """
+        IncorrectVIPService.find_incorrect_vip over every batch.
+        """
+        incorrect = [
+            IncorrectVIPService(batch, config_path).find_incorrect_vip()
+            for batch in self.clean_batches()
+        ]
+        return pd.concat(incorrect, ignore_index=True)
+
+    def find_overbooking(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Duplicated overtime and overbooked normal hours over every batch.
+        """
+        seen_overtime = set()
+        daily_totals = {}
+        duplicated, overbooked = [], []
+
+        for batch in self.clean_batches():
+            service = OverbookingService(batch)
+            duplicated.append(service.find_duplicates_overtime(seen_overtime))
+            overbooked.append(service.find_overbooked_normal_daily(daily_totals))
+
+        return pd.concat(duplicated), pd.concat(overbooked)
+
+    def get_exemption(self, exemption_type: str) -> pd.DataFrame:
+        """
+        ExemptionService.get_exemption from weekly totals summed across batches.
+        """
+        weekly_hours = [
+            ExemptionService(batch, exemption_type).get_weekly_hours()
+            for batch in self.clean_batches()
+        ]
+        if weekly_hours:
+            totals = (
+                pd.concat(weekly_hours)
+                .groupby(["Resource no.", "Week"], as_index=False, observed=True)["Hours worked"]
+                .sum()
+            )
+        else:
+            totals = pd.DataFrame(columns=["Resource no.", "Week", "Hours worked"])
+
+        # Given the weekly totals, the service only needs the exemption type
+        service = ExemptionService(pd.DataFrame(columns=["Work date"]), exemption_type)
+        return service.get_exemption(weekly_hours=totals)
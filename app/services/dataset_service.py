@@ -0,0 +1,145 @@
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from app.core.settings import settings
+
+HOURS_JOURNAL = "hours_journal"
+CLOCKINGS = "clockings"
+
+
+class DatasetNotFoundError(Exception):
+    pass
+
+
+class DatasetService:
+    """
+    In-process store of cleaned upload datasets.
+
+    A journal or clocking export is uploaded and parsed once, then stored as
+    an Arrow table (string columns dictionary-encoded) under a random
+    dataset ID. Report endpoints read it back by ID until it expires.
+    The store is bounded by a total byte budget; the datasets closest to
+    expiry are evicted first when it is exceeded.
+    """
+
+    def __init__(self, ttl_seconds: int = None, max_bytes: int = None):
+        self.ttl_seconds = ttl_seconds or settings.dataset_ttl_seconds
+        self.max_bytes = max_bytes or settings.dataset_store_max_bytes
+        self._datasets: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def create_dataset(self, df: pd.DataFrame, kind: str, owner: Optional[str]) -> dict:
+        """
+        Compact a loaded report frame into an Arrow table and store it.
+        """
+        table = self._compact(pa.Table.from_pandas(df, preserve_index=False))
+        if table.nbytes > self.max_bytes:
+            raise ValueError("Dataset is too large to store")
+
+        now = time.time()
+        entry = {
+            "dataset_id": uuid.uuid4().hex,
+            "kind": kind,
+            "owner": owner,
+            "table": table,
+            "rows": table.num_rows,
+            "columns": table.column_names,
+            # Categorical columns come back as categoricals, other
+            # dictionary-encoded strings as plain strings
+            "categorical": {
+                column for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)
+            },
+            "bytes": table.nbytes,
+            "created_at": now,
+            "expires_at": now + self.ttl_seconds,
+        }
+
+        with self._lock:
+            self._purge_expired(now)
+            self._make_room(entry["bytes"])
+            self._datasets[entry["dataset_id"]] = entry
+
+        return self._metadata(entry)
+
+    def get_dataset(self, dataset_id: str, owner: Optional[str]) -> dict:
+        """
+        Return dataset metadata. Datasets are only visible to their owner.
+        """
+        return self._metadata(self._get_entry(dataset_id, owner))
+
+    def get_frame(self, dataset_id: str, owner: Optional[str]) -> pd.DataFrame:
+        """
+        Materialise a stored dataset as a DataFrame.
+        """
+        entry = self._get_entry(dataset_id, owner)
+        table = entry["table"]
+
+        columns = [
+            pc.cast(column, column.type.value_type)
+            if pa.types.is_dictionary(column.type) and name not in entry["categorical"]
+            else column
+            for name, column in zip(table.column_names, table.columns)
+        ]
+        return pa.Table.from_arrays(columns, names=table.column_names).to_pandas()
+
+    def delete_dataset(self, dataset_id: str, owner: Optional[str]) -> None:
+        self._get_entry(dataset_id, owner)
+        with self._lock:
+            self._datasets.pop(dataset_id, None)
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _get_entry(self, dataset_id: str, owner: Optional[str]) -> dict:
+        with self._lock:
+            self._purge_expired(time.time())
+            entry = self._datasets.get(dataset_id)
+
+        # Report the same error for foreign datasets so IDs cannot be probed
+        if entry is None or entry["owner"] != owner:
+            raise DatasetNotFoundError(f"Dataset {dataset_id} not found or expired")
+        return entry
+
+    def _compact(self, table: pa.Table) -> pa.Table:
+        """
+        Dictionary-encode string columns; journals repeat the same resource
+        numbers, originators and sites on many rows.
+        """
+        columns = [
+            pc.dictionary_encode(column) if pa.types.is_string(column.type) or pa.types.is_large_string(column.type) else column
+            for column in table.columns
+        ]
+        return pa.Table.from_arrays(columns, names=table.column_names)
+
+    def _purge_expired(self, now: float) -> None:
+        for dataset_id in [key for key, entry in self._datasets.items() if entry["expires_at"] <= now]:
+            del self._datasets[dataset_id]
+
+    def _make_room(self, size: int) -> None:
+        used = sum(entry["bytes"] for entry in self._datasets.values())
+        for entry in sorted(self._datasets.values(), key=lambda e: e["expires_at"]):
+            if used + size <= self.max_bytes:
+                break
+            del self._datasets[entry["dataset_id"]]
+            used -= entry["bytes"]
+
+    @staticmethod
+    def _metadata(entry: dict) -> dict:
+        return {
+            "dataset_id": entry["dataset_id"],
+            "kind": entry["kind"],
+            "rows": entry["rows"],
+            "columns": entry["columns"],
+            "bytes": entry["bytes"],
+            "expires_at": entry["expires_at"],
+        }
+
+
+dataset_service = DatasetService()
@@ -9,7 +9,7 @@ class DeviceService:
     def unique_clocks_per_meter_per_day(self):
         result = (
             self.df
-            .groupby(["MeterID", "Date"])["Clock No."]
+            .groupby(["MeterID", "Date"], observed=True)["Clock No."]
             .nunique()
             .reset_index(name="Unique_Clock_Count")
         )
@@ -1,18 +1,197 @@
-import boto3
+import os
+import tempfile
 import uuid
+import zipfile
 import pandas as pd
-from io import BytesIO
-from datetime import datetime, timezone
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Optional, Dict
+from typing import BinaryIO, Iterator, Literal, Optional, Dict, List, Tuple, Union
+import xlsxwriter
+from botocore.exceptions import ClientError
+from app.core.aws_clients import aws_clients
 from app.core.settings import settings
-from openpyxl.styles import Border, Side, Font, PatternFill
-from openpyxl.utils import get_column_letter
+from app.services.export_retention_service import touch_export
+from app.utils.export_index import export_digest, export_index
+from app.utils.export_tokens import sign_export_url
+from app.utils.process_pool import process_pool
+from app.utils.s3_multipart_writer import S3MultipartWriter
+
+# Number formats matching pandas' default Excel output
+DATE_FORMAT = "yyyy-mm-dd"
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
+# Object-column contents xlsxwriter writes natively; anything else is written as text
+NATIVE_VALUE_TYPES = {"string", "integer", "floating", "mixed-integer-float", "boolean", "date", "datetime", "empty"}
+
+# Export file formats selectable on the report endpoints
+ExportFormat = Literal["xlsx", "csv", "parquet", "ndjson"]
+
+CONTENT_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "ndjson": "application/x-ndjson",
+    # Multi-sheet CSV / Parquet / NDJSON exports hold one file per sheet
+    "zip": "application/zip",
+}
+
+# Rows serialised at a time by the export writers
+EXPORT_CHUNK_ROWS = 50_000
+
+# Longest worksheet name Excel accepts
+EXCEL_MAX_SHEET_NAME = 31
+
+
+def _chunks(df: pd.DataFrame):
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        yield df.iloc[start:start + EXPORT_CHUNK_ROWS]
+
+
+def _create_formats(workbook) -> Dict[str, object]:
+    """
+    Create the shared cell formats once per workbook; every cell refers
+    to one of them instead of carrying its own style objects.
+    """
+    border = {"border": 1}
+    return {
+        "header": workbook.add_format({**border, "bold": True, "font_color": "#000000", "bg_color": "#FFD700", "pattern": 1}),
+        "cell": workbook.add_format(border),
+        "date": workbook.add_format({**border, "num_format": DATE_FORMAT}),
+        "datetime": workbook.add_format({**border, "num_format": DATETIME_FORMAT}),
+    }
+
+
+def _column_format(column: pd.Series, formats: Dict[str, object]) -> Tuple[object, bool]:
+    """
+    Pick a column's cell format, and whether its values have to be
+    written as text because xlsxwriter cannot write them natively.
+    """
+    if isinstance(column.dtype, pd.PeriodDtype):
+        return formats["cell"], True
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return formats["datetime"], False
+    if column.dtype == object:
+        kind = pd.api.types.infer_dtype(column, skipna=True)
+        if kind == "date":
+            return formats["date"], False
+        if kind == "datetime":
+            return formats["datetime"], False
+        if kind not in NATIVE_VALUE_TYPES:
+            return formats["cell"], True
+    return formats["cell"], False
+
+
+def _column_values(column: pd.Series, as_text: bool) -> List:
+    """
+    Convert a slice of a column to values xlsxwriter can write, with
+    missing values as None (written as bordered blank cells).
+    """
+    if as_text:
+        column = column.map(str, na_action="ignore")
+    return column.astype(object).where(column.notna(), None).tolist()
+
+
+def _column_width(name: str, column: pd.Series) -> float:
+    """
+    Auto-fit width from the longest text in the column, header included.
+    """
+    lengths = column.dropna().astype(str).str.len()
+    longest = max(len(str(name)), int(lengths.max()) if len(lengths) else 0)
+    return longest + 2
+
+
+def write_excel(sheets: Dict[str, pd.DataFrame], target: Union[str, Path, BinaryIO]) -> None:
+    """
+    Write the sheets as a styled xlsx workbook to a path or file object.
+
+    xlsxwriter's constant-memory mode flushes each row to a temporary
+    file as soon as the next row starts, so memory stays flat however
+    many rows are exported. Rows are therefore written strictly in order,
+    converted to Python values EXPORT_CHUNK_ROWS at a time; column
+    widths and cell formats are chosen up front from the DataFrame.
+    """
+    workbook = xlsxwriter.Workbook(
+        target,
+        {"constant_memory": True, "strings_to_urls": False, "nan_inf_to_errors": True},
+    )
+    try:
+        formats = _create_formats(workbook)
+
+        for sheet_name, df in sheets.items():
+            worksheet = workbook.add_worksheet(sheet_name[:31])
+
+            column_formats = []
+            for index, name in enumerate(df.columns):
+                column_formats.append(_column_format(df.iloc[:, index], formats))
+                worksheet.set_column(index, index, _column_width(name, df.iloc[:, index]))
+
+            worksheet.write_row(0, 0, [str(name) for name in df.columns], formats["header"])
+
+            row_index = 1
+            for chunk in _chunks(df):
+                columns = [
+                    _column_values(chunk.iloc[:, index], as_text)
+                    for index, (_, as_text) in enumerate(column_formats)
+                ]
+                for row in zip(*columns):
+                    for column_index, value in enumerate(row):
+                        worksheet.write(row_index, column_index, value, column_formats[column_index][0])
+                    row_index += 1
+    finally:
+        workbook.close()
+
+
+def _numbered_sheet_name(name: str, number: int) -> str:
+    suffix = f" ({number})"
+    return name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+
+
+def split_workbooks(sheets: Dict[str, pd.DataFrame]) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Partition the sheets into workbooks Excel can open, yielding each
+    workbook as it is filled.
+
+    A sheet longer than excel_max_sheet_rows is cut into numbered
+    sheets ("Name (1)", "Name (2)", ...). Sheets are then packed in
+    order into workbooks of at most excel_max_workbook_rows rows; a
+    single sheet longer than that gets a workbook of its own.
+    """
+    sheet_rows = settings.excel_max_sheet_rows
+    workbook: Dict[str, pd.DataFrame] = {}
+    workbook_rows = 0
+
+    for name, df in sheets.items():
+        pieces = range(0, len(df), sheet_rows)
+        for number, start in enumerate(pieces, start=1):
+            piece = df.iloc[start:start + sheet_rows]
+            if workbook and workbook_rows + len(piece) > settings.excel_max_workbook_rows:
+                yield workbook
+                workbook = {}
+                workbook_rows = 0
+            piece_name = name if len(pieces) == 1 else _numbered_sheet_name(name, number)
+            workbook[piece_name] = piece
+            workbook_rows += len(piece)
+
+    yield workbook
+
+
+def count_workbooks(sheets: Dict[str, pd.DataFrame]) -> int:
+    return sum(1 for _ in split_workbooks(sheets))
+
+
+def _write_workbook_file(sheets: Dict[str, pd.DataFrame], path: str) -> str:
+    """
+    Write one workbook of a split export to path and return the path.
+    """
+    write_excel(sheets, path)
+    return path
 
 
 class ExcelExportService:
     """
-    Service responsible for exporting pandas DataFrames to Excel files.
+    Service responsible for exporting pandas DataFrames to Excel files,
+    or to CSV, Parquet or NDJSON for API consumers.
 
     Supports two storage backends:
     - Local filesystem
@@ -28,11 +207,14 @@ class ExcelExportService:
         bucket_name: Optional[str] = None,
         storage_backend: Optional[str] = None,
         region: Optional[str] = None,
-        local_export_dir: str = "exports",
-        user_id:str = ""
+        local_export_dir: Optional[str] = None,
+        user_id:str = "",
+        s3_client=None,
     ):
         """
         Initialize the export service.
+
+        The S3 client defaults to the process-wide shared client.
         """
 
         # Determine storage backend (env var takes fallback role)
@@ -42,14 +224,14 @@ class ExcelExportService:
         self.region = region or settings.region
         self.user_id = user_id
 
-        # Initialize S3 client only when using S3 backend
+        # Use an S3 client only when using S3 backend
         if self.storage_backend == "s3":
-            self.s3 = boto3.client("s3", region_name=region)
+            self.s3 = s3_client or aws_clients.client("s3")
         else:
             self.s3 = None
 
         # Ensure local export directory exists
-        self.local_export_dir = Path(local_export_dir)
+        self.local_export_dir = Path(local_export_dir or settings.local_export_dir)
         self.local_export_dir.mkdir(parents=True, exist_ok=True)
 
     # -------------------------
@@ -60,112 +242,220 @@ class ExcelExportService:
         sheets: Dict[str, pd.DataFrame],
         prefix: str = "exports",
         filename_prefix: str = "export",
-        user_id:str=""
+        user_id:str="",
+        file_format: str = "xlsx",
     ) -> str:
         """
-        Export multiple DataFrames into a single Excel file.
+        Export multiple DataFrames into a single file.
+
+        xlsx writes one styled worksheet per sheet. Sheets beyond Excel's
+        row limit are split into numbered sheets, and exports beyond
+        excel_max_workbook_rows into several workbooks packaged as a zip
+        archive (see split_workbooks). CSV, Parquet and NDJSON write a
+        single file for one sheet, or a zip archive holding one file per
+        sheet.
+
+        Files are named after a hash of the sheets and format. When the same
+        export already exists under the user's prefix it is not rendered or
+        uploaded again, and its key is returned.
         """
 
         if not sheets:
             raise ValueError("No sheets provided")
 
+        if file_format not in CONTENT_TYPES or file_format == "zip":
+            raise ValueError(f"Unsupported export format: {file_format}")
+
         for name, df in sheets.items():
             if df.empty:
                 raise ValueError(f"Sheet '{name}' has no data")
 
-        filename = self._generate_filename(filename_prefix)
+        if file_format == "xlsx":
+            extension = "xlsx" if count_workbooks(sheets) == 1 else "zip"
+        else:
+            extension = file_format if len(sheets) == 1 else "zip"
+        filename = self._generate_filename(filename_prefix, extension, export_digest(sheets, file_format))
+        key = self._storage_key(prefix, filename, user_id)
+
+        if self._export_exists(key):
+            return key
 
         if self.storage_backend == "s3":
-            return self._upload_to_s3(sheets, prefix, filename,user_id)
+            self._upload_to_s3(sheets, key, file_format)
+            export_index.add(key)
         else:
-            return self._save_locally(sheets, prefix, filename,user_id)
+            self._save_locally(sheets, key, file_format)
+
+        return key
 
     # -------------------------
     # Internal helpers
     # -------------------------
-    def _generate_filename(self, prefix: str) -> str:
-        unique_id = uuid.uuid4().hex
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        return f"{prefix}_{timestamp}_{unique_id}.xlsx"
+    def _generate_filename(self, prefix: str, extension: str, digest: str) -> str:
+        return f"{prefix}_{digest}.{extension}"
+
+    def _storage_key(self, prefix: str, filename: str, user_id: str) -> str:
+        if self.storage_backend == "s3":
+            return f"{user_id}/{prefix}/{filename}"
+        return str(self.local_export_dir / user_id / prefix / filename)
 
-    def _apply_styles(self, writer, sheets: Dict[str, pd.DataFrame]):
+    def _export_exists(self, key: str) -> bool:
         """
-        Apply borders, auto-fit column widths, and header styling.
+        Check the export index, then storage, for an existing export.
+
+        Local exports are always checked on disk, which costs a stat, as
+        the retention service may have deleted them from another process;
+        a reused one is marked as used so it is kept.
         """
-        workbook = writer.book
-        for sheet_name in sheets.keys():
-            worksheet = workbook[sheet_name[:31]]
+        if self.storage_backend != "s3":
+            if not Path(key).exists():
+                return False
+            touch_export(key)
+            return True
+
+        if export_index.contains(key):
+            return True
+
+        try:
+            self.s3.head_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
 
-            # Define border style
-            thin_border = Border(
-                left=Side(style="thin"),
-                right=Side(style="thin"),
-                top=Side(style="thin"),
-                bottom=Side(style="thin"),
+        export_index.add(key)
+        return True
+
+    def _write_workbook_zip(self, sheets: Dict[str, pd.DataFrame], target: BinaryIO) -> None:
+        """
+        Write the workbooks of a split export and stream them into a zip
+        archive, one numbered .xlsx file per workbook.
+
+        xlsxwriter is pure Python, so the parts are written by the report
+        process pool's workers side by side. Such exports are therefore run
+        in the API process, where the pool is started (see export_report
+        and ReportJobService); elsewhere the parts are written one after
+        another. Each part is added to the archive and deleted as soon as
+        it is written.
+        """
+        with tempfile.TemporaryDirectory() as workdir:
+            parts = (
+                (workbook, os.path.join(workdir, f"part-{number}.xlsx"))
+                for number, workbook in enumerate(split_workbooks(sheets), start=1)
             )
 
-            # Apply borders to all cells
-            for row in worksheet.iter_rows():
-                for cell in row:
-                    cell.border = thin_border
-
-            # Style header row
-            header_fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")
-            header_font = Font(bold=True, color="000000")
-            for cell in worksheet[1]:  # First row = header
-                cell.fill = header_fill
-                cell.font = header_font
-
-            # Auto-fit column widths
-            for col in worksheet.columns:
-                max_length = 0
-                col_letter = get_column_letter(col[0].column)
-                for cell in col:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except Exception:
-                        pass
-                worksheet.column_dimensions[col_letter].width = max_length + 2
-
-    def _write_excel(self, sheets: Dict[str, pd.DataFrame]) -> BytesIO:
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            # xlsx files are already compressed, so they are stored as they are
+            with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED) as archive:
+                for path in process_pool.map(_write_workbook_file, parts):
+                    archive.write(path, os.path.basename(path))
+                    os.remove(path)
+
+    def _write_export(self, sheets: Dict[str, pd.DataFrame], target: BinaryIO, file_format: str) -> None:
+        """
+        Write the sheets to a binary file object in the requested format.
+        """
+        if file_format == "xlsx":
+            if count_workbooks(sheets) == 1:
+                write_excel(next(split_workbooks(sheets)), target)
+            else:
+                self._write_workbook_zip(sheets, target)
+            return
+
+        if len(sheets) == 1:
+            self._write_frame(next(iter(sheets.values())), target, file_format)
+            return
+
+        with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
             for sheet_name, df in sheets.items():
-                df.to_excel(writer, index=False, sheet_name=sheet_name[:31])
-            self._apply_styles(writer, sheets)
-        buffer.seek(0)
-        return buffer
-
-    def _upload_to_s3(self, sheets: Dict[str, pd.DataFrame], prefix: str, filename: str,user_id:str) -> str:
-        file_key = f"{user_id}/{prefix}/{filename}"
-        buffer = self._write_excel(sheets)
-
-        self.s3.put_object(
-            Bucket=settings.bucket_name,
-            Key=file_key,
-            Body=buffer.getvalue(),
-            ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+                entry_name = f"{sheet_name.replace('/', '_')}.{file_format}"
+                with archive.open(entry_name, "w") as entry:
+                    self._write_frame(df, entry, file_format)
+
+    @staticmethod
+    def _plain_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert columns CSV / Parquet / NDJSON writers cannot serialise
+        consistently (periods, mixed-type objects) to text.
+        """
+        conversions = {}
+        for name in df.columns:
+            column = df[name]
+            if isinstance(column.dtype, pd.PeriodDtype):
+                conversions[name] = column.astype(str).where(column.notna(), None)
+            elif column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) not in NATIVE_VALUE_TYPES:
+                conversions[name] = column.map(str, na_action="ignore")
+
+        if not conversions:
+            return df
+        return df.assign(**conversions)
+
+    def _write_frame(self, df: pd.DataFrame, target: BinaryIO, file_format: str) -> None:
+        """
+        Stream one DataFrame to target in EXPORT_CHUNK_ROWS slices, so only
+        one serialised slice is held in memory at a time.
+        """
+        df = self._plain_frame(df)
+
+        if file_format == "csv":
+            target.write(df.iloc[:0].to_csv(index=False).encode("utf-8"))
+            for chunk in _chunks(df):
+                target.write(chunk.to_csv(index=False, header=False).encode("utf-8"))
+
+        elif file_format == "parquet":
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            with pq.ParquetWriter(target, schema) as writer:
+                for chunk in _chunks(df):
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+        elif file_format == "ndjson":
+            for chunk in _chunks(df):
+                target.write(chunk.to_json(orient="records", lines=True, date_format="iso").encode("utf-8"))
+
+        else:
+            raise ValueError(f"Unsupported export format: {file_format}")
+
+    def _upload_to_s3(self, sheets: Dict[str, pd.DataFrame], file_key: str, file_format: str = "xlsx") -> str:
+        # The export is streamed into a multipart upload as it is written,
+        # so no full copy of it is held in memory. The object only becomes
+        # visible once the upload completes.
+        with S3MultipartWriter(
+            self.s3,
+            self.bucket_name,
+            file_key,
+            content_type=CONTENT_TYPES[Path(file_key).suffix.lstrip(".")],
+        ) as writer:
+            self._write_export(sheets, writer, file_format)
+
         return file_key
 
-    def _save_locally(self, sheets: Dict[str, pd.DataFrame], prefix: str, filename: str,user_id:str) -> str:
-        folder = self.local_export_dir / user_id/ prefix
-        folder.mkdir(parents=True, exist_ok=True)
-        file_path = folder / filename
+    def _save_locally(self, sheets: Dict[str, pd.DataFrame], file_path: str, file_format: str = "xlsx") -> str:
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
-            for sheet_name, df in sheets.items():
-                df.to_excel(writer, index=False, sheet_name=sheet_name[:31])
-            self._apply_styles(writer, sheets)
+        # Written under a unique temporary name and renamed once complete, so
+        # a partly written file is never taken for an existing export
+        partial_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(partial_path, "wb") as target:
+                self._write_export(sheets, target, file_format)
+            os.replace(partial_path, file_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
 
         return str(file_path)
 
     def generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        """
+        Return a download URL for key valid for expires_in seconds: an S3
+        presigned URL, or a signed link to the /exports download route for
+        local exports.
+        """
         if self.storage_backend == "s3":
             return self.s3.generate_presigned_url(
                 ClientMethod="get_object",
                 Params={"Bucket": self.bucket_name, "Key": key},
                 ExpiresIn=expires_in,
             )
-        return f"file:///{Path(key).resolve()}"
+        path = Path(key).resolve().relative_to(self.local_export_dir.resolve())
+        return sign_export_url(path.as_posix(), expires_in)
@@ -9,11 +9,11 @@ class ExemptionService:
         # Ensure "Work date" is date only
         self.df["Work date"] = pd.to_datetime(self.df["Work date"]).dt.date
 
-    def get_week_exemption(self) -> pd.DataFrame:
+    def get_weekly_hours(self) -> pd.DataFrame:
         """
-        Returns weekly exemptions for employees.
-        Week: Sunday to Saturday.
-        Employees exceeding 72 hours/week are flagged.
+        Returns hours worked per employee per week (Sunday to Saturday).
+        Weekly hours of separate row batches of a journal can be concatenated
+        and summed again.
         """
         df = self.df.copy()
 
@@ -27,7 +27,18 @@ class ExemptionService:
         df["Week"] = week_start.dt.strftime("%Y.%m.%d") + "/" + week_end.dt.strftime("%Y.%m.%d")
 
         # Group by Resource no. and Week, summing hours
-        grouped = df.groupby(["Resource no.", "Week"], as_index=False)["Hours worked"].sum()
+        return df.groupby(["Resource no.", "Week"], as_index=False, observed=True)["Hours worked"].sum()
+
+    def get_week_exemption(self, weekly_hours: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Returns weekly exemptions for employees.
+        Week: Sunday to Saturday.
+        Employees exceeding 72 hours/week are flagged.
+
+        weekly_hours: precomputed get_weekly_hours() totals; computed from
+        this service's journal when omitted.
+        """
+        grouped = self.get_weekly_hours() if weekly_hours is None else weekly_hours
 
         # Filter employees with >72 hours
         grouped = grouped[grouped["Hours worked"] > 72].copy()
@@ -38,11 +49,11 @@ class ExemptionService:
 
         return grouped[["Resource no.", "Week", "Exemption", "Excess"]]
 
-    def get_month_exemption(self) -> pd.DataFrame:
+    def get_month_exemption(self, weekly_hours: pd.DataFrame = None) -> pd.DataFrame:
         """
         Returns monthly exemptions by summing weekly excesses.
         """
-        weekly_excess = self.get_week_exemption()
+        weekly_excess = self.get_week_exemption(weekly_hours)
 
         # Extract month from week start (first date in week string)
         weekly_excess["Month"] = pd.to_datetime(
@@ -50,18 +61,18 @@ class ExemptionService:
         ).dt.strftime("%Y.%m")
 
         # Group by Resource no. and Month, summing excess
-        monthly = weekly_excess.groupby(["Resource no.", "Month"], as_index=False)["Excess"].sum()
+        monthly = weekly_excess.groupby(["Resource no.", "Month"], as_index=False, observed=True)["Excess"].sum()
 
         # Add exemption column (still 72 per week)
         monthly["Exemption"] = 72
 
         return monthly[["Resource no.", "Month", "Exemption", "Excess"]]
 
-    def get_exemption(self) -> pd.DataFrame:
+    def get_exemption(self, weekly_hours: pd.DataFrame = None) -> pd.DataFrame:
         if self.type == "week":
-            return self.get_week_exemption()
+            return self.get_week_exemption(weekly_hours)
         elif self.type == "month":
-            return self.get_month_exemption()
+            return self.get_month_exemption(weekly_hours)
         else:
             raise ValueError("Type must be 'week' or 'month'")
         
@@ -88,7 +99,8 @@ class ExemptionService:
             index="resource_no.",
             columns="work_date",
             aggfunc="sum",
-            fill_value=0
+            fill_value=0,
+            observed=True
         )
     
         # Pivot unproductive
@@ -98,7 +110,8 @@ class ExemptionService:
             index="resource_no.",
             columns="work_date",
             aggfunc="sum",
-            fill_value=0
+            fill_value=0,
+            observed=True
         )
     
         # Group columns into weeks and sum
@@ -127,10 +140,10 @@ class ExemptionService:
         final_weekly["Excess"] = (final_weekly["Final_Total"] - 72).clip(lower=0)
     
         # Add per-employee grand total of excess across all weeks
-        final_weekly["Total_Excess"] = final_weekly.groupby("resource_no.")["Excess"].transform("sum")
+        final_weekly["Total_Excess"] = final_weekly.groupby("resource_no.", observed=True)["Excess"].transform("sum")
     
         # Keep only employees who exceeded at least once
-        exceeded_employees = final_weekly.groupby("resource_no.")["Excess"].sum() > 0
+        exceeded_employees = final_weekly.groupby("resource_no.", observed=True)["Excess"].sum() > 0
         final_weekly = final_weekly.loc[exceeded_employees]
     
         return final_weekly
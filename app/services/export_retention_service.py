@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from app.core.settings import settings
+
+logger = logging.getLogger("FastAPIApp")
+
+# Partial files left by interrupted writes are removed after this long
+STALE_PART_SECONDS = 60 * 60
+
+
+def touch_export(path) -> None:
+    """
+    Record that a local export was used (downloaded or reused by a
+    repeated export) by setting its access time.
+
+    The access time is the retention service's "last used" clock. It is
+    set explicitly, so it works across the API and worker processes and
+    across restarts, whatever the mount's atime policy. The modification
+    time, and with it the download ETag, is left alone.
+    """
+    try:
+        stat_result = os.stat(path)
+        os.utime(path, (time.time(), stat_result.st_mtime))
+    except FileNotFoundError:
+        pass
+
+
+class ExportRetentionService:
+    """
+    Keeps the local export directory within an age and size budget.
+
+    A background thread scans local_export_dir every interval_seconds into
+    a small index of export files (size and last use), then deletes
+    exports unused for max_age_seconds, and the least recently used ones
+    while the directory holds more than max_bytes. Nothing runs on the
+    request path; /health reports the usage stats.
+
+    The thread is started and stopped with the app lifespan, and only for
+    the local storage backend.
+    """
+
+    def __init__(self, max_bytes: int = None, max_age_seconds: int = None, interval_seconds: int = None, export_dir: str = None):
+        self.max_bytes = max_bytes or settings.export_max_bytes
+        self.max_age_seconds = max_age_seconds or settings.export_max_age_seconds
+        self.interval_seconds = interval_seconds or settings.export_janitor_interval_seconds
+        self.export_dir = Path(export_dir or settings.local_export_dir)
+        self._files: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self.last_sweep_at: Optional[float] = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def start(self) -> None:
+        if self._thread is None and settings.storage_backend == "local":
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="export-retention", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def sweep(self) -> None:
+        """
+        Rescan the export directory and evict exports over the budget.
+        """
+        now = time.time()
+        files = self._scan(now)
+
+        evicted = {key for key, entry in files.items() if entry["last_used_at"] + self.max_age_seconds <= now}
+        used = sum(entry["bytes"] for key, entry in files.items() if key not in evicted)
+        for key, entry in sorted(files.items(), key=lambda item: item[1]["last_used_at"]):
+            if used <= self.max_bytes:
+                break
+            if key not in evicted:
+                evicted.add(key)
+                used -= entry["bytes"]
+
+        for key in evicted:
+            entry = files.pop(key)
+            try:
+                os.remove(key)
+            except FileNotFoundError:
+                continue
+            self.evicted_files += 1
+            self.evicted_bytes += entry["bytes"]
+
+        with self._lock:
+            self._files = files
+            self.last_sweep_at = now
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": sum(entry["bytes"] for entry in self._files.values()),
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "evicted_files": self.evicted_files,
+                "evicted_bytes": self.evicted_bytes,
+                "last_sweep_at": self.last_sweep_at,
+            }
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sweep()
+            except OSError:
+                logger.exception("Export retention sweep failed")
+            if self._stop.wait(self.interval_seconds):
+                return
+
+    def _scan(self, now: float) -> Dict[str, dict]:
+        """
+        Index the exports under export_dir by key (the path
+        ExcelExportService returns for them), removing stale partial files.
+        Hidden files, such as the link signing key, are skipped.
+        """
+        files = {}
+        for directory, subdirectories, filenames in os.walk(self.export_dir):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                key = os.path.join(directory, filename)
+                try:
+                    stat_result = os.stat(key)
+                    if filename.endswith(".part"):
+                        if stat_result.st_mtime + STALE_PART_SECONDS <= now:
+                            os.remove(key)
+                        continue
+                except FileNotFoundError:
+                    continue
+                files[key] = {
+                    "bytes": stat_result.st_size,
+                    # Exports never downloaded or reused count from their creation
+                    "last_used_at": max(stat_result.st_atime, stat_result.st_mtime),
+                }
+        return files
+
+
+export_retention_service = ExportRetentionService()
@@ -15,7 +15,9 @@ class IncorrectVIPService:
 
     def find_incorrect_vip(self) -> pd.DataFrame:
         df = self.df
-        df["VIP Code"] = df["VIP Code"].astype(int)
+        # Loaded journals already carry an integer VIP Code (see report_schemas)
+        if not pd.api.types.is_integer_dtype(df["VIP Code"]):
+            df["VIP Code"] = df["VIP Code"].astype(int)
         df["_weekday"] = df["Work date"].map(get_weekday_number)
         df["_is_holiday"] = df["Work date"].map(is_public_holiday)
 
@@ -54,7 +56,7 @@ class IncorrectVIPService:
         Accepts the filtered incorrect DataFrame as input.
         """
         counts = (
-            incorrect_df.groupby("User Originator")
+            incorrect_df.groupby("User Originator", observed=True)
             .size()
             .reset_index(name="incorrect_entry_count")
             .sort_values(by="incorrect_entry_count", ascending=False)
@@ -14,25 +14,46 @@ class OverbookingService:
             6: 0      # Sunday
         }
 
-    def find_duplicates_overtime(self):
+    def find_duplicates_overtime(self, seen: set = None):
+        """
+        seen: row hashes of overtime entries from earlier batches of the same
+        journal. Rows repeating one of them are duplicates too; the set is
+        updated with this batch's rows.
+        """
+        subset = ["Resource no.", "Work date", "VIP Code", "Hours worked"]
         overtime_df = self.df[self.df["VIP Code"].isin(self.overtime_codes)]
-        duplicates = overtime_df[overtime_df.duplicated(
-            subset=["Resource no.", "Work date", "VIP Code", "Hours worked"],
-            keep="first"
-        )]
+        duplicated_mask = overtime_df.duplicated(subset=subset, keep="first")
+
+        if seen is not None:
+            keys = pd.util.hash_pandas_object(overtime_df[subset], index=False)
+            duplicated_mask |= keys.map(lambda key: key in seen).astype(bool)
+            seen.update(keys)
+
+        duplicates = overtime_df[duplicated_mask]
         return duplicates[
             ["Resource no.", "User Originator", "Work date", "VIP Code", "Hours worked"]
         ]
 
-    def find_overbooked_normal_daily(self):
+    def find_overbooked_normal_daily(self, running_totals: dict = None):
+        """
+        running_totals: hours already booked per resource per day in earlier
+        batches of the same journal, keyed by row hash. Cumulative sums
+        continue from them and the dict is updated with this batch's totals.
+        """
         norm_df = self.df[~self.df["VIP Code"].isin(self.overtime_codes)].copy()
-        norm_df["Work date"] = pd.to_datetime(norm_df["Work date"])
+        if not pd.api.types.is_datetime64_any_dtype(norm_df["Work date"]):
+            norm_df["Work date"] = pd.to_datetime(norm_df["Work date"])
         norm_df["week"] = norm_df["Work date"].dt.to_period("W-SAT")
         norm_df["weekday"] = norm_df["Work date"].dt.weekday
         norm_df["required_norm"] = norm_df["weekday"].map(self.daily_required)
         norm_df["cum_sum"] = norm_df.groupby(
-            ["Resource no.", "Work date"]
+            ["Resource no.", "Work date"], observed=True
         )["Hours worked"].cumsum()
+
+        if running_totals is not None:
+            keys = pd.util.hash_pandas_object(norm_df[["Resource no.", "Work date"]], index=False)
+            norm_df["cum_sum"] += keys.map(running_totals).fillna(0)
+            running_totals.update(norm_df["cum_sum"].groupby(keys).last().to_dict())
         overbooked = norm_df[norm_df["cum_sum"] > norm_df["required_norm"]]
         return overbooked[
             [
@@ -64,7 +85,7 @@ class OverbookingService:
     def  count_user_originators(df) -> pd.DataFrame:
        
         counts = (
-            df.groupby("User Originator")
+            df.groupby("User Originator", observed=True)
             .size()
             .reset_index(name="incorrect_entry_count")
             .sort_values(by="incorrect_entry_count", ascending=False)
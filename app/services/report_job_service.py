@@ -0,0 +1,445 @@
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional, Set
+from fastapi import HTTPException
+import pandas as pd
+from app.core.settings import settings
+from app.services.chunked_journal_service import use_chunked_mode
+from app.services.dataset_service import HOURS_JOURNAL
+from app.utils.constants import HOURS_JOURNAL_COLUMNS
+from app.utils.excel_upload_utils import check_required_columns, read_upload_frame
+from app.utils.export_utils import export_excel_and_get_url, splits_into_workbooks
+from app.utils.process_pool import RemoteHTTPError
+from app.utils.report_schemas import CLOCKINGS_SCHEMA, HOURS_JOURNAL_SCHEMA, apply_schema
+from app.utils.report_specs import REPORTS, build_chunked_report, build_report
+from app.utils.reversed_entries_utils import remove_reversed_entries
+from app.utils.upload_preflight import validate_required_columns
+from app.utils.upload_spool import SpooledUpload
+
+logger = logging.getLogger("FastAPIApp")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobNotFoundError(Exception):
+    pass
+
+
+# -------------------------
+# Worker process side
+# -------------------------
+# Queue the worker reports stage progress on; set by _init_worker
+_progress_queue = None
+
+
+def _init_worker(progress_queue) -> None:
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+@contextmanager
+def _stage(job_id: str, name: str, timings: Dict[str, float]):
+    """
+    Time a stage into timings and report its start and duration on the
+    progress queue.
+    """
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, name, None))
+    started = time.perf_counter()
+    yield
+    timings[name] = round(time.perf_counter() - started, 3)
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, name, timings[name]))
+
+
+def _projection(spec: dict) -> Optional[Set[str]]:
+    # Columns a clockings report loads, as in load_report_frame; None keeps every column
+    if spec.get("optional_columns") is None:
+        return None
+    return spec["required_columns"] | spec["optional_columns"]
+
+
+def _load_upload(job_id: str, spec: dict, contents: SpooledUpload, timings: Dict[str, float]) -> pd.DataFrame:
+    required_columns = spec["required_columns"]
+
+    with _stage(job_id, "parse", timings):
+        validate_required_columns(contents, required_columns)
+        if spec["kind"] == HOURS_JOURNAL:
+            columns = set(HOURS_JOURNAL_COLUMNS) | required_columns
+            schema = HOURS_JOURNAL_SCHEMA
+        else:
+            columns = _projection(spec)
+            schema = CLOCKINGS_SCHEMA
+
+        try:
+            df = read_upload_frame(contents, columns)
+        except Exception as e:
+            raise RemoteHTTPError(400, str(e))
+        check_required_columns(df, required_columns)
+        df = apply_schema(df, schema)
+
+    if spec["kind"] == HOURS_JOURNAL:
+        with _stage(job_id, "clean", timings):
+            df = remove_reversed_entries(df)
+
+    return df
+
+
+def _load_dataset(job_id: str, spec: dict, input_path: str, timings: Dict[str, float]) -> pd.DataFrame:
+    # Stored journals already had reversed entries removed
+    with _stage(job_id, "parse", timings):
+        df = pd.read_feather(input_path)
+        check_required_columns(df, spec["required_columns"])
+        df = apply_schema(df, HOURS_JOURNAL_SCHEMA if spec["kind"] == HOURS_JOURNAL else CLOCKINGS_SCHEMA)
+        columns = _projection(spec)
+        if columns is not None:
+            df = df[[column for column in df.columns if column in columns]]
+        return df
+
+
+def run_report_job(
+    job_id: str,
+    report: str,
+    input_path: str,
+    from_dataset: bool,
+    user_id: str,
+    options: dict,
+) -> dict:
+    """
+    Run one report end to end in a worker process:
+    parse → clean → report → export.
+
+    :param job_id: Job the stage progress is reported for
+    :param report: Name of the report in REPORTS
+    :param input_path: Uploaded file, or Feather copy of a stored dataset
+    :param from_dataset: Whether input_path holds a stored dataset
+    :param user_id: Owner the export is stored under
+    :param options: Report options (exemption_type, format)
+    :return: Stage timings, rows exported per sheet, storage key and
+             download URL. Exports split into several workbooks are left
+             to the API process, and their sheets returned as
+             export_sheets instead.
+    """
+    spec = REPORTS[report]
+    timings: Dict[str, float] = {}
+
+    try:
+        if from_dataset:
+            df = _load_dataset(job_id, spec, input_path, timings)
+            with _stage(job_id, "report", timings):
+                sheets = build_report(report, df, options)
+        else:
+            contents = SpooledUpload(open(input_path, "rb"), os.path.getsize(input_path))
+            try:
+                if spec.get("build_chunked") and use_chunked_mode(contents, None):
+                    # Oversized journals are parsed, cleaned and reported in row batches
+                    with _stage(job_id, "report", timings):
+                        sheets = build_chunked_report(report, contents, options)
+                else:
+                    df = _load_upload(job_id, spec, contents, timings)
+                    with _stage(job_id, "report", timings):
+                        sheets = build_report(report, df, options)
+            finally:
+                contents.close()
+    except HTTPException as e:
+        raise RemoteHTTPError(e.status_code, e.detail)
+
+    sheets = {name: df for name, df in sheets.items() if not df.empty}
+    result = {
+        "stages": timings,
+        "sheets": {name: len(df) for name, df in sheets.items()},
+        "key": None,
+        "download_url": None,
+    }
+    if not sheets:
+        return result
+
+    file_format = options.get("format", "xlsx")
+    if splits_into_workbooks(sheets, file_format):
+        # Written by the report process pool's workers (see ReportJobService._export)
+        return {**result, "export_sheets": sheets}
+
+    with _stage(job_id, "export", timings):
+        urls = export_excel_and_get_url(
+            sheets=sheets,
+            prefix=spec["prefix"],
+            filename_prefix=spec["filename_prefix"],
+            user_id=user_id,
+            file_format=file_format,
+        )
+
+    return {**result, **urls}
+
+
+# -------------------------
+# API process side
+# -------------------------
+class ReportJobService:
+    """
+    Runs reports as background jobs on a pool of worker processes.
+
+    Submitting a job hands its input file to the pool and returns a job ID
+    straight away; the pandas work and the export run in a worker, so the
+    event loop stays free and several reports run on separate cores.
+    xlsx exports split into several workbooks are exported from a thread
+    in this process instead (see _export). Workers post stage start/finish events on a queue that a listener
+    thread folds into the job records. Finished jobs are kept until
+    ttl_seconds after they finish.
+    """
+
+    def __init__(self, max_workers: int = None, ttl_seconds: int = None):
+        self.max_workers = max_workers or settings.report_job_workers
+        self.ttl_seconds = ttl_seconds or settings.report_job_ttl_seconds
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
+        self._listener: Optional[threading.Thread] = None
+        self._exports: Set[threading.Thread] = set()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def submit(
+        self,
+        report: str,
+        owner: Optional[str],
+        contents: Optional[SpooledUpload] = None,
+        dataset_frame: Optional[pd.DataFrame] = None,
+        options: Optional[dict] = None,
+    ) -> dict:
+        """
+        Queue a report over an upload or a stored dataset's frame.
+
+        The upload is hard-linked (or copied) out of the request's spool,
+        which is deleted once the request ends; dataset frames are written
+        to a Feather file the worker reads back.
+        """
+        if report not in REPORTS:
+            raise ValueError(f"Unknown report: {report}. Use one of {', '.join(REPORTS)}.")
+
+        job_id = uuid.uuid4().hex
+        input_path = os.path.join(tempfile.gettempdir(), f"report-job-{job_id}")
+
+        if dataset_frame is not None:
+            dataset_frame.reset_index(drop=True).to_feather(input_path)
+        else:
+            try:
+                os.link(contents.path, input_path)
+            except OSError:
+                shutil.copyfile(contents.path, input_path)
+
+        now = time.time()
+        job = {
+            "job_id": job_id,
+            "report": report,
+            "owner": owner,
+            "status": QUEUED,
+            "stage": None,
+            "stages": {},
+            "sheets": None,
+            "download_url": None,
+            "error": None,
+            "created_at": now,
+            "finished_at": None,
+            "input_path": input_path,
+        }
+
+        with self._lock:
+            self._purge_expired(now)
+            self._jobs[job_id] = job
+
+        try:
+            future = self._get_executor().submit(
+                run_report_job,
+                job_id,
+                report,
+                input_path,
+                dataset_frame is not None,
+                owner or "",
+                options or {},
+            )
+        except BaseException:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            self._remove_input(input_path)
+            raise
+
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return self._status(job)
+
+    def get_job(self, job_id: str, owner: Optional[str]) -> dict:
+        """
+        Return a job's status. Jobs are only visible to their owner.
+        """
+        with self._lock:
+            self._purge_expired(time.time())
+            job = self._jobs.get(job_id)
+            if job is None or job["owner"] != owner:
+                raise JobNotFoundError(f"Job {job_id} not found or expired")
+            return self._status(job)
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker pool, cancelling queued jobs, and wait for the
+        exports in progress.
+        """
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._progress_queue.put(None)
+        self._listener.join()
+        self._executor = None
+        with self._lock:
+            exports = list(self._exports)
+        for thread in exports:
+            thread.join()
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("spawn")
+                self._progress_queue = context.Queue()
+                self._listener = threading.Thread(
+                    target=self._listen, name="report-job-progress", daemon=True
+                )
+                self._listener.start()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._progress_queue,),
+                )
+            return self._executor
+
+    def _listen(self) -> None:
+        while (event := self._progress_queue.get()) is not None:
+            job_id, stage, seconds = event
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] in (SUCCEEDED, FAILED):
+                    continue
+                job["status"] = RUNNING
+                if seconds is None:
+                    job["stage"] = stage
+                else:
+                    job["stages"][stage] = seconds
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return
+
+        self._remove_input(job["input_path"])
+
+        if future.cancelled():
+            error, result = "Job cancelled", None
+        elif future.exception() is not None:
+            error, result = str(future.exception()), None
+            if not isinstance(future.exception(), RemoteHTTPError):
+                logger.error("Report job %s failed", job_id, exc_info=future.exception())
+        else:
+            error, result = None, future.result()
+            if "export_sheets" in result:
+                thread = threading.Thread(
+                    target=self._export, args=(job, result), name="report-job-export", daemon=True
+                )
+                with self._lock:
+                    self._exports.add(thread)
+                thread.start()
+                return
+
+        self._complete(job, error, result)
+
+    def _export(self, job: dict, result: dict) -> None:
+        """
+        Export a job's sheets from this process. Split workbooks are
+        written through the report process pool, which only runs here, so
+        each workbook gets its own worker rather than the job's worker
+        writing them one after another.
+        """
+        spec = REPORTS[job["report"]]
+        sheets = result.pop("export_sheets")
+        with self._lock:
+            job["stage"] = "export"
+
+        started = time.perf_counter()
+        try:
+            urls = export_excel_and_get_url(
+                sheets=sheets,
+                prefix=spec["prefix"],
+                filename_prefix=spec["filename_prefix"],
+                user_id=job["owner"] or "",
+                file_format="xlsx",
+            )
+        except Exception as e:
+            logger.error("Report job %s export failed", job["job_id"], exc_info=e)
+            self._complete(job, str(e), None)
+        else:
+            result["stages"]["export"] = round(time.perf_counter() - started, 3)
+            self._complete(job, None, {**result, **urls})
+        finally:
+            with self._lock:
+                self._exports.discard(threading.current_thread())
+
+    def _complete(self, job: dict, error: Optional[str], result: Optional[dict]) -> None:
+        with self._lock:
+            job["status"] = FAILED if error else SUCCEEDED
+            job["stage"] = None
+            job["error"] = error
+            job["finished_at"] = time.time()
+            if result is not None:
+                # The result carries every timing, including any whose
+                # progress event had not been read yet
+                job["stages"] = result["stages"]
+                job["sheets"] = result["sheets"]
+                job["download_url"] = result["download_url"]
+
+    @staticmethod
+    def _remove_input(input_path: str) -> None:
+        try:
+            os.remove(input_path)
+        except FileNotFoundError:
+            pass
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] + self.ttl_seconds <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _status(job: dict) -> dict:
+        return {
+            "job_id": job["job_id"],
+            "report": job["report"],
+            "status": job["status"],
+            "stage": job["stage"],
+            "stages": dict(job["stages"]),
+            "sheets": job["sheets"],
+            "download_url": job["download_url"],
+            "error": job["error"],
+            "created_at": job["created_at"],
+            "finished_at": job["finished_at"],
+        }
+
+
+report_job_service = ReportJobService()
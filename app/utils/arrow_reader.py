@@ -0,0 +1,117 @@
+from typing import Iterator, List, Optional, Set
+import pandas as pd
+import pyarrow as pa
+from pyarrow import ipc
+from pyarrow import parquet as pq
+from app.utils.file_formats import ARROW_FILE, PARQUET
+from app.utils.upload_spool import UploadContents, as_buffer
+
+
+def _arrow_buffer(contents: UploadContents) -> pa.Buffer:
+    """
+    Internal helper wrapping the upload (memory-mapped when spooled) in an
+    Arrow buffer without copying it.
+    """
+    return pa.py_buffer(as_buffer(contents))
+
+
+def _open_ipc(contents: UploadContents, file_format: str):
+    """
+    Internal helper opening an Arrow IPC file or stream reader.
+    """
+    if file_format == ARROW_FILE:
+        return ipc.open_file(_arrow_buffer(contents))
+    return ipc.open_stream(_arrow_buffer(contents))
+
+
+def read_arrow_header(contents: UploadContents, file_format: str) -> List[str]:
+    """
+    Read the column names of a Parquet or Arrow IPC upload from its schema
+    only. For Parquet this touches just the file footer.
+    """
+    if file_format == PARQUET:
+        return pq.ParquetFile(pa.BufferReader(_arrow_buffer(contents))).schema_arrow.names
+    return _open_ipc(contents, file_format).schema.names
+
+
+def read_arrow_columns(
+    contents: UploadContents,
+    file_format: str,
+    columns: Optional[Set[str]] = None,
+) -> pd.DataFrame:
+    """
+    Load a Parquet or Arrow IPC / Feather upload into a DataFrame.
+
+    The upload is read straight from its memory-mapped buffer. For Arrow IPC
+    the record batches reference that buffer directly, so uncompressed
+    numeric columns become DataFrame blocks without being copied. Parquet
+    only decodes the requested column chunks.
+
+    Args:
+        contents: Parquet / Arrow bytes or spooled upload.
+        file_format: PARQUET, ARROW_FILE or ARROW_STREAM.
+        columns: Column names to keep. None keeps every column.
+
+    Returns:
+        pd.DataFrame: Projected DataFrame, columns in file order.
+    """
+    selected = None
+    if columns is not None:
+        selected = [
+            name for name in read_arrow_header(contents, file_format) if name in columns
+        ]
+
+    if file_format == PARQUET:
+        table = pq.read_table(pa.BufferReader(_arrow_buffer(contents)), columns=selected)
+    else:
+        table = _open_ipc(contents, file_format).read_all()
+        if selected is not None:
+            table = table.select(selected)
+
+    # One block per column keeps zero-copy columns from being consolidated
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def iter_arrow_batches(
+    contents: UploadContents,
+    file_format: str,
+    columns: Optional[Set[str]] = None,
+    batch_rows: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a Parquet or Arrow IPC / Feather upload as DataFrames.
+
+    Parquet is decoded batch_rows rows at a time; IPC uploads are yielded
+    one record batch at a time, as written by the producer.
+
+    Args:
+        contents: Parquet / Arrow bytes or spooled upload.
+        file_format: PARQUET, ARROW_FILE or ARROW_STREAM.
+        columns: Column names to keep. None keeps every column.
+        batch_rows: Maximum number of rows per Parquet batch.
+
+    Yields:
+        pd.DataFrame: Projected batches, columns in file order.
+    """
+    selected = None
+    if columns is not None:
+        selected = [
+            name for name in read_arrow_header(contents, file_format) if name in columns
+        ]
+
+    if file_format == PARQUET:
+        parquet_file = pq.ParquetFile(pa.BufferReader(_arrow_buffer(contents)))
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=selected):
+            yield batch.to_pandas()
+        return
+
+    reader = _open_ipc(contents, file_format)
+    if file_format == ARROW_FILE:
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    else:
+        batches = iter(reader)
+
+    for batch in batches:
+        if selected is not None:
+            batch = batch.select(selected)
+        yield batch.to_pandas()
@@ -0,0 +1,74 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to an external provider.
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls are refused (allow() returns False) for reset_timeout_seconds,
+    so a provider that is down or hanging costs nothing instead of a
+    timeout per request. One trial call is then let through: its success
+    closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if now - self._opened_at >= self.reset_timeout_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """
+        Return whether a call may be made now; in the half-open state only
+        one trial call is allowed at a time.
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        End a call that neither succeeded nor failed (e.g. cancelled), so a
+        half-open circuit can try again.
+        """
+        with self._lock:
+            self._trial_in_flight = False
@@ -1,2 +1,15 @@
 COGNITO_GROUPS_CLAIM = "cognito:groups"
 DEFAULT_ROLES = []
+
+# Hours journal columns read by the VIP, overbooking and exemption reports.
+# Every hours-journal endpoint parses this same projection so a journal
+# uploaded to several of them is parsed once and served from the cache.
+HOURS_JOURNAL_COLUMNS = {
+    "Entry No.",
+    "Resource no.",
+    "Work date",
+    "VIP Code",
+    "Hours worked",
+    "Applies-To Entry",
+    "User Originator",
+}
@@ -0,0 +1,81 @@
+import csv
+import io
+from typing import Iterator, List, Optional, Set
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from app.utils.upload_spool import UploadContents, as_buffer
+
+# Bytes handed to each Arrow parsing thread
+CSV_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def read_csv_header(contents: UploadContents) -> List[str]:
+    """
+    Read the header of a CSV upload from its first line only.
+    """
+    buffer = as_buffer(contents)
+    end = buffer.find(b"\n")
+    first_line = bytes(buffer[: end if end != -1 else len(buffer)])
+    text = first_line.decode("utf-8-sig").rstrip("\r")
+    return next(csv.reader(io.StringIO(text)), [])
+
+
+def read_csv_columns(contents: UploadContents, columns: Optional[Set[str]] = None) -> pd.DataFrame:
+    """
+    Parse a CSV upload with Arrow's multithreaded reader.
+
+    The upload buffer is wrapped without copying and split into blocks that
+    are tokenised and converted in parallel. Only the requested columns are
+    converted; the others are skipped by the reader.
+
+    Args:
+        contents: CSV bytes or spooled upload.
+        columns: Column names to keep. None keeps every column.
+
+    Returns:
+        pd.DataFrame: Projected DataFrame, columns in file order.
+    """
+    include_columns = None
+    if columns is not None:
+        include_columns = [name for name in read_csv_header(contents) if name in columns]
+
+    table = pa_csv.read_csv(
+        pa.BufferReader(pa.py_buffer(as_buffer(contents))),
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=include_columns,
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
+
+def iter_csv_batches(contents: UploadContents, columns: Optional[Set[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV upload as DataFrames, one per CSV_BLOCK_SIZE block.
+
+    Arrow's streaming reader infers column types from the first block only,
+    so every column is read as text and converted by the caller (see
+    report_schemas.apply_schema).
+
+    Args:
+        contents: CSV bytes or spooled upload.
+        columns: Column names to keep. None keeps every column.
+
+    Yields:
+        pd.DataFrame: Projected batches, columns in file order.
+    """
+    names = [name for name in read_csv_header(contents) if columns is None or name in columns]
+
+    reader = pa_csv.open_csv(
+        pa.BufferReader(pa.py_buffer(as_buffer(contents))),
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=names,
+            column_types={name: pa.string() for name in names},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
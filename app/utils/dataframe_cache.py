@@ -0,0 +1,96 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+import pandas as pd
+from app.core.settings import settings
+from app.utils.upload_spool import UploadContents, as_buffer
+
+
+def upload_digest(contents: UploadContents) -> str:
+    """
+    Return the SHA-256 hex digest of an upload's bytes.
+    """
+    return hashlib.sha256(as_buffer(contents)).hexdigest()
+
+
+class DataFrameCache:
+    """
+    Process-wide LRU cache of parsed DataFrames.
+
+    Entries are keyed by the upload digest plus the parse options, so the
+    same journal sent to several report endpoints is parsed once. The cache
+    is bounded by the total in-memory size of the cached frames; least
+    recently used frames are evicted first.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """
+        Return a copy of the cached frame, or None on a miss.
+
+        A copy is returned because callers (e.g. remove_reversed_entries)
+        modify the frames they are given.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            df = entry[0]
+        return df.copy()
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> None:
+        """
+        Cache a frame, evicting least recently used frames to stay within
+        the memory budget. Frames larger than the whole budget are skipped.
+        """
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+
+        df = df.copy()
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[1]
+
+            while self._entries and self._current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (df, size)
+            self._current_bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters and current memory usage.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+dataframe_cache = DataFrameCache(max_bytes=settings.dataframe_cache_max_bytes)
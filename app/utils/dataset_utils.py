@@ -0,0 +1,77 @@
+from fastapi import HTTPException
+import pandas as pd
+from typing import Optional, Set
+from app.services.dataset_service import HOURS_JOURNAL, DatasetNotFoundError, dataset_service
+from app.utils.excel_upload_utils import check_required_columns, load_excel_file, load_hours_journal
+from app.utils.report_schemas import CLOCKINGS_SCHEMA, HOURS_JOURNAL_SCHEMA, apply_schema
+from app.utils.upload_spool import UploadContents
+
+
+def get_dataset_frame(dataset_id: str, owner: Optional[str], kind: str) -> pd.DataFrame:
+    """
+    Fetch a stored dataset as a DataFrame, checking it is of the expected kind.
+    """
+    try:
+        metadata = dataset_service.get_dataset(dataset_id, owner)
+        if metadata["kind"] != kind:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Dataset {dataset_id} is a {metadata['kind']} dataset, expected {kind}",
+            )
+        return dataset_service.get_frame(dataset_id, owner)
+    except DatasetNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+async def load_report_frame(
+    contents: Optional[UploadContents],
+    dataset_id: Optional[str],
+    owner: Optional[str],
+    kind: str,
+    required_columns: Set[str],
+    optional_columns: Optional[Set[str]] = None,
+) -> pd.DataFrame:
+    """
+    Load a report's input either from an uploaded file or from a stored dataset.
+
+    Exactly one of contents and dataset_id must be given. Either way the
+    frame has the report schema applied. Uploaded hours journals have
+    reversed entries removed; stored ones already had them removed when
+    the dataset was created.
+
+    :param contents: Uploaded file, or None when a dataset is used
+    :param dataset_id: ID returned by POST /datasets, or None
+    :param owner: User ID the dataset must belong to
+    :param kind: HOURS_JOURNAL or CLOCKINGS
+    :param required_columns: Columns the calling report requires
+    :param optional_columns: Extra columns to keep when present. When None,
+                             every column is kept.
+    :return: Report input DataFrame
+    """
+    if contents is not None and dataset_id:
+        raise HTTPException(status_code=400, detail="Provide either a file or a dataset_id, not both")
+
+    if dataset_id:
+        df = get_dataset_frame(dataset_id, owner, kind)
+        check_required_columns(df, required_columns)
+
+        # Restores dtypes Arrow does not round-trip (e.g. nullable integers)
+        df = apply_schema(df, HOURS_JOURNAL_SCHEMA if kind == HOURS_JOURNAL else CLOCKINGS_SCHEMA)
+
+        if optional_columns is not None:
+            keep = set(required_columns) | set(optional_columns)
+            df = df[[column for column in df.columns if column in keep]]
+        return df
+
+    if contents is None:
+        raise HTTPException(status_code=400, detail="Upload a file or pass a dataset_id")
+
+    if kind == HOURS_JOURNAL:
+        return await load_hours_journal(contents, required_columns=required_columns)
+    return await load_excel_file(
+        contents,
+        required_columns=required_columns,
+        optional_columns=optional_columns,
+        schema=CLOCKINGS_SCHEMA,
+    )
+
@@ -1,20 +1,167 @@
+import asyncio
 from fastapi import UploadFile, HTTPException
 import pandas as pd
-from io import BytesIO
-from typing import Set
+from typing import Dict, Iterator, Optional, Set
+from app.utils.arrow_reader import iter_arrow_batches, read_arrow_columns
+from app.utils.constants import HOURS_JOURNAL_COLUMNS
+from app.utils.csv_reader import iter_csv_batches, read_csv_columns
+from app.utils.file_formats import CSV, XLSX, detect_format
+from app.utils.xlsx_reader import iter_xlsx_batches, read_xlsx_columns
+from app.utils.upload_preflight import validate_required_columns
+from app.utils.upload_spool import UploadContents
+from app.utils.dataframe_cache import dataframe_cache, upload_digest
+from app.utils.reversed_entries_utils import remove_reversed_entries
+from app.utils.report_schemas import HOURS_JOURNAL_SCHEMA, apply_schema
+from app.utils.process_pool import process_pool
 
 
-async def load_excel_file(contents: bytes, required_columns: Set[str]) -> pd.DataFrame:
-    try:
-        
-        df = pd.read_excel(BytesIO(contents), engine="openpyxl")
+def read_upload_frame(contents: UploadContents, columns: Optional[Set[str]] = None) -> pd.DataFrame:
+    """
+    Parse an upload into a DataFrame with the reader for its sniffed format.
 
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    :param contents: Uploaded file bytes or spooled upload
+    :param columns: Column names to keep. None keeps every column.
+    :return: Parsed DataFrame
+    """
+    file_format = detect_format(contents)
+    if file_format == XLSX:
+        return read_xlsx_columns(contents, columns)
+    if file_format == CSV:
+        return read_csv_columns(contents, columns)
+    return read_arrow_columns(contents, file_format, columns)
+
+
+def iter_upload_batches(
+    contents: UploadContents,
+    columns: Optional[Set[str]] = None,
+    batch_rows: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream an upload as row batches with the reader for its sniffed format.
 
-    
+    :param contents: Uploaded file bytes or spooled upload
+    :param columns: Column names to keep. None keeps every column.
+    :param batch_rows: Target rows per batch (CSV batches follow the
+                       reader's block size instead)
+    :return: Iterator of DataFrame batches
+    """
+    file_format = detect_format(contents)
+    if file_format == XLSX:
+        return iter_xlsx_batches(contents, columns, batch_rows)
+    if file_format == CSV:
+        return iter_csv_batches(contents, columns)
+    return iter_arrow_batches(contents, file_format, columns, batch_rows)
+
+
+def check_required_columns(df: pd.DataFrame, required_columns: Set[str]) -> None:
     missing = required_columns - set(df.columns)
     if missing:
         raise HTTPException(status_code=400, detail=f"Missing required columns: {', '.join(missing)}")
 
+
+def _parse_upload(
+    contents: UploadContents,
+    required_columns: Set[str],
+    columns: Optional[Set[str]],
+) -> pd.DataFrame:
+    """
+    Internal helper: preflight the header, then parse the projected columns.
+    """
+    # Reject files missing a required column before parsing any rows
+    validate_required_columns(contents, required_columns)
+
+    try:
+
+        df = read_upload_frame(contents, columns)
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    check_required_columns(df, required_columns)
+    return df
+
+
+def _load_upload(
+    contents: UploadContents,
+    required_columns: Set[str],
+    columns: Optional[Set[str]],
+    schema: Optional[Dict[str, str]],
+) -> pd.DataFrame:
+    df = _parse_upload(contents, required_columns, columns)
+    if schema:
+        df = apply_schema(df, schema)
     return df
+
+
+def _load_clean_journal(contents: UploadContents, required_columns: Set[str], columns: Set[str]) -> pd.DataFrame:
+    df = apply_schema(_parse_upload(contents, required_columns, columns), HOURS_JOURNAL_SCHEMA)
+    return remove_reversed_entries(df)
+
+
+async def load_excel_file(
+    contents: UploadContents,
+    required_columns: Set[str],
+    optional_columns: Optional[Set[str]] = None,
+    schema: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Load an uploaded xlsx, CSV, Parquet or Arrow IPC file into a DataFrame
+    and validate required columns.
+
+    Parsed frames are cached by upload digest and column projection, so
+    uploading the same file again skips parsing. Parsing runs in the
+    shared process pool.
+
+    :param contents: Uploaded file bytes or spooled upload
+    :param required_columns: Columns that must be present in the header
+    :param optional_columns: Extra columns to keep when present. When None,
+                             every column is loaded; otherwise only the
+                             required and optional columns are parsed.
+    :param schema: Column dtypes to apply after parsing (see report_schemas)
+    :return: Parsed DataFrame
+    """
+    columns = None
+    if optional_columns is not None:
+        columns = frozenset(required_columns) | frozenset(optional_columns)
+
+    dtypes = frozenset(schema.items()) if schema else None
+    # Hashing a large upload would hold up the event loop
+    digest = await asyncio.to_thread(upload_digest, contents)
+    cache_key = ("parsed", digest, columns, dtypes)
+    df = dataframe_cache.get(cache_key)
+
+    if df is None:
+        df = await process_pool.run(_load_upload, contents, required_columns, columns, schema)
+        dataframe_cache.put(cache_key, df)
+    else:
+        check_required_columns(df, required_columns)
+
+    return df
+
+
+async def load_hours_journal(contents: UploadContents, required_columns: Set[str]) -> pd.DataFrame:
+    """
+    Load an hours journal, apply HOURS_JOURNAL_SCHEMA and remove reversed entries.
+
+    Every hours-journal report parses the same column projection and only
+    the cleaned frame is cached, so a journal sent to several reports in a
+    row is parsed and cleaned once. Parsing and cleaning run in the
+    shared process pool.
+
+    :param contents: Uploaded file bytes or spooled upload
+    :param required_columns: Columns the calling report requires
+    :return: Hours journal without reversed entries
+    """
+    columns = frozenset(HOURS_JOURNAL_COLUMNS) | frozenset(required_columns)
+
+    digest = await asyncio.to_thread(upload_digest, contents)
+    cache_key = ("reversals_removed", digest, columns)
+    clean_df = dataframe_cache.get(cache_key)
+
+    if clean_df is None:
+        clean_df = await process_pool.run(_load_clean_journal, contents, required_columns, columns)
+        dataframe_cache.put(cache_key, clean_df)
+    else:
+        check_required_columns(clean_df, required_columns)
+
+    return clean_df
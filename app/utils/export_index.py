@@ -0,0 +1,68 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+import pandas as pd
+from app.core.settings import settings
+
+
+def export_digest(sheets: Dict[str, pd.DataFrame], file_format: str) -> str:
+    """
+    Return a SHA-256 hex digest of an export's sheet names, frame contents
+    (columns, dtypes, index and values) and file format.
+
+    Identical reports hash to the same digest, so their exports can share
+    one stored file.
+    """
+    digest = hashlib.sha256(file_format.encode())
+    for name, df in sheets.items():
+        digest.update(repr((name, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ExportIndex:
+    """
+    Process-wide index of S3 export keys known to exist.
+
+    Lets a repeated export skip the HEAD request as well as the rendering
+    and upload. Entries expire after ttl_seconds so exports deleted outside
+    this process are noticed; the least recently used entries are dropped
+    beyond max_entries. (Local exports are checked on disk, where a stat is
+    cheap and the retention service may delete them at any time.)
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            self._entries[key] = time.time() + self.ttl_seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+export_index = ExportIndex(
+    max_entries=settings.export_index_max_entries,
+    ttl_seconds=settings.export_index_ttl_seconds,
+)
@@ -0,0 +1,87 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, urlencode
+from app.core.settings import settings
+
+# Written next to the exports when no export_signing_key is configured
+SIGNING_KEY_FILENAME = ".signing-key"
+
+_signing_key: Optional[bytes] = None
+_signing_key_lock = threading.Lock()
+
+
+def _load_signing_key() -> bytes:
+    """
+    Return the configured signing key, or the one kept in the export
+    directory, creating it on first use.
+
+    The generated key lives in a file rather than in memory so the API
+    process and the report worker processes (which build the URLs) sign
+    alike, and links stay valid across restarts.
+    """
+    global _signing_key
+    if _signing_key is not None:
+        return _signing_key
+
+    with _signing_key_lock:
+        if _signing_key is None:
+            if settings.export_signing_key:
+                _signing_key = settings.export_signing_key.encode()
+            else:
+                _signing_key = _read_or_create_key_file(Path(settings.local_export_dir) / SIGNING_KEY_FILENAME)
+    return _signing_key
+
+
+def _read_or_create_key_file(path: Path) -> bytes:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        # Linking a complete temporary file into place is atomic and fails if
+        # another process got there first, so every process reads one key
+        partial_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.part")
+        partial_path.write_text(secrets.token_hex(32))
+        os.chmod(partial_path, 0o600)
+        try:
+            os.link(partial_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            partial_path.unlink(missing_ok=True)
+    return path.read_text().strip().encode()
+
+
+def _signature(path: str, expires: int) -> str:
+    message = f"{path}\n{expires}".encode()
+    return hmac.new(_load_signing_key(), message, hashlib.sha256).hexdigest()
+
+
+def sign_export_url(path: str, expires_in: int = 3600) -> str:
+    """
+    Return a download URL for an export in the local export directory,
+    valid for expires_in seconds.
+
+    Mirrors an S3 presigned URL: the expiry time and an HMAC of the path
+    and expiry travel in the query string, so the link works without
+    authentication until it expires and cannot be altered to reach other
+    files.
+
+    :param path: Export path relative to local_export_dir, "/"-separated
+    """
+    expires = int(time.time()) + expires_in
+    query = urlencode({"expires": expires, "signature": _signature(path, expires)})
+    return f"{settings.export_base_url.rstrip('/')}/exports/{quote(path)}?{query}"
+
+
+def verify_export_token(path: str, expires: int, signature: str) -> bool:
+    """
+    Check a download URL's signature and that it has not expired.
+    """
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(path, expires), signature)
@@ -1,6 +1,8 @@
+import asyncio
 from typing import Dict
 import pandas as pd
-from app.services.excel_export_service import ExcelExportService
+from app.services.excel_export_service import ExcelExportService, count_workbooks
+from app.utils.process_pool import process_pool
 
 
 def export_excel_and_get_url(
@@ -8,11 +10,12 @@ def export_excel_and_get_url(
     *,
     prefix: str,
     filename_prefix: str,
-    user_id: str
+    user_id: str,
+    file_format: str = "xlsx",
 ) -> Dict[str, str]:
     """
-    Export one or more pandas DataFrames to an Excel file and return both
-    the storage key and a download URL.
+    Export one or more pandas DataFrames to an Excel (or CSV, Parquet,
+    NDJSON) file and return both the storage key and a download URL.
 
     :param sheets: Dictionary where:
                    - key   = Excel sheet name
@@ -20,6 +23,7 @@ def export_excel_and_get_url(
     :param prefix: Folder path (S3 key prefix or local subfolder)
     :param filename_prefix: Prefix used when generating the Excel filename
     :param user_id: User identifier for namespacing
+    :param file_format: "xlsx" (styled, default), "csv", "parquet" or "ndjson"
     :return: Dict with 'key' and 'download_url'
     """
 
@@ -31,6 +35,7 @@ def export_excel_and_get_url(
         prefix=prefix,
         filename_prefix=filename_prefix,
         user_id=user_id,
+        file_format=file_format,
     )
 
     # Generate presigned URL (or local file URL)
@@ -40,3 +45,47 @@ def export_excel_and_get_url(
         "key": key,
         "download_url": download_url,
     }
+
+
+def splits_into_workbooks(sheets: Dict[str, pd.DataFrame], file_format: str) -> bool:
+    """
+    Whether an export is written as several xlsx workbooks (see
+    split_workbooks), whose parts the report process pool writes side by
+    side when the export runs in the API process.
+    """
+    return file_format == "xlsx" and count_workbooks(sheets) > 1
+
+
+async def export_report(
+    sheets: Dict[str, pd.DataFrame],
+    *,
+    prefix: str,
+    filename_prefix: str,
+    user_id: str,
+    file_format: str = "xlsx",
+) -> Dict[str, str]:
+    """
+    Run export_excel_and_get_url for a report endpoint, off the event loop.
+
+    Exports run in a process pool worker. Exports split into several
+    workbooks run on a thread of the API process instead, so each
+    workbook is written by its own pool worker.
+    """
+    if splits_into_workbooks(sheets, file_format):
+        return await asyncio.to_thread(
+            export_excel_and_get_url,
+            sheets,
+            prefix=prefix,
+            filename_prefix=filename_prefix,
+            user_id=user_id,
+            file_format=file_format,
+        )
+
+    return await process_pool.run(
+        export_excel_and_get_url,
+        sheets=sheets,
+        prefix=prefix,
+        filename_prefix=filename_prefix,
+        user_id=user_id,
+        file_format=file_format,
+    )
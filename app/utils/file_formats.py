@@ -0,0 +1,36 @@
+from app.utils.upload_spool import UploadContents, as_buffer
+
+# Every xlsx workbook is a zip archive
+ZIP_MAGIC = b"PK\x03\x04"
+PARQUET_MAGIC = b"PAR1"
+# Arrow IPC file format, also used by Feather v2
+ARROW_FILE_MAGIC = b"ARROW1"
+# Arrow IPC stream format opens with a continuation marker
+ARROW_STREAM_MAGIC = b"\xff\xff\xff\xff"
+
+XLSX = "xlsx"
+CSV = "csv"
+PARQUET = "parquet"
+ARROW_FILE = "arrow_file"
+ARROW_STREAM = "arrow_stream"
+
+
+def detect_format(contents: UploadContents) -> str:
+    """
+    Sniff the format of an upload from its leading bytes.
+
+    The declared content type is not trusted: browsers report CSV files as
+    text/csv, application/vnd.ms-excel or text/plain depending on the OS,
+    and Parquet or Arrow files usually arrive as application/octet-stream.
+    Anything that is not a recognised binary container is treated as CSV.
+    """
+    head = bytes(as_buffer(contents)[:8])
+    if head.startswith(ZIP_MAGIC):
+        return XLSX
+    if head.startswith(PARQUET_MAGIC):
+        return PARQUET
+    if head.startswith(ARROW_FILE_MAGIC):
+        return ARROW_FILE
+    if head.startswith(ARROW_STREAM_MAGIC):
+        return ARROW_STREAM
+    return CSV
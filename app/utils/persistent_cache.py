@@ -0,0 +1,116 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+
+class PersistentCache:
+    """
+    Two-tier cache of JSON-serialisable values with per-entry TTLs.
+
+    Lookups go to an in-process LRU of max_memory_entries first, then to a
+    table in a local SQLite file, which is shared by every worker process
+    and survives restarts. Disk hits are promoted to memory. Both tiers
+    hold the JSON text, so every hit returns a fresh copy that callers may
+    modify. Each cache keeps its entries in its own table, so several
+    caches can share one file.
+
+    Calls block on SQLite; async callers run them with asyncio.to_thread.
+    """
+
+    def __init__(self, namespace: str, db_path: str, max_memory_entries: int):
+        if not namespace.isidentifier():
+            raise ValueError(f"Invalid cache namespace: {namespace}")
+        self.namespace = namespace
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value, or None when missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                text, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return json.loads(text)
+                del self._memory[key]
+
+            row = self._get_connection().execute(
+                f"SELECT value, expires_at FROM {self.namespace} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        expires_at = time.time() + ttl_seconds
+        text = json.dumps(value)
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    f"INSERT OR REPLACE INTO {self.namespace} (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, text, expires_at),
+                )
+            self._remember(key, text, expires_at)
+            self.stores += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _remember(self, key: str, text: str, expires_at: float) -> None:
+        self._memory[key] = (text, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Open the database on first use, creating the table and dropping
+        expired entries. Called with the lock held.
+        """
+        if self._connection is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            # Lets worker processes read while another one writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.namespace} "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                connection.execute(f"DELETE FROM {self.namespace} WHERE expires_at <= ?", (time.time(),))
+            self._connection = connection
+        return self._connection
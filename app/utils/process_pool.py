@@ -0,0 +1,301 @@
+import asyncio
+import errno
+import multiprocessing
+import os
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+from fastapi import HTTPException
+import pandas as pd
+import pyarrow as pa
+from app.core.settings import settings
+
+class SharedFrameSpaceError(OSError):
+    """
+    Raised when shared_frame_dir has no room for a frame.
+    """
+
+
+class SharedFrame:
+    """
+    Handle to a DataFrame written as an Arrow IPC stream into a memory
+    mapped file in shared_frame_dir. Only the path crosses the process
+    boundary; the receiver maps the file and rebuilds the frame from Arrow
+    buffers without unpickling it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> "SharedFrame":
+        """
+        :raises SharedFrameSpaceError: If the frame does not fit in
+            shared_frame_dir
+        """
+        table = pa.Table.from_pandas(df)
+
+        # Size the mapping exactly by writing the stream to a counting sink first
+        sink = pa.MockOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        size = sink.size()
+
+        directory = settings.shared_frame_dir
+        stat = os.statvfs(directory)
+        if stat.f_bavail * stat.f_frsize < size:
+            raise SharedFrameSpaceError(errno.ENOSPC, "No space for shared frame", directory)
+
+        path = os.path.join(directory, f"frame-{uuid.uuid4().hex}.arrow")
+        try:
+            cls._reserve(path, size)
+            with pa.memory_map(path, "r+") as target:
+                with pa.ipc.new_stream(target, table.schema) as writer:
+                    writer.write_table(table)
+        except BaseException:
+            cls(path).remove()
+            raise
+        return cls(path)
+
+    @staticmethod
+    def _reserve(path: str, size: int) -> None:
+        """
+        Create the file with its blocks allocated. A mapping that outgrows
+        the free space of a full tmpfs faults with SIGBUS, killing the
+        process, where allocating up front fails with ENOSPC instead.
+        """
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise SharedFrameSpaceError(errno.ENOSPC, "No space for shared frame", path)
+                if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL):
+                    raise
+                # Not supported by the filesystem; the free space check above has to do
+                os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
+    def load(self) -> pd.DataFrame:
+        with pa.memory_map(self.path) as source:
+            table = pa.ipc.open_stream(source).read_all()
+        return table.to_pandas()
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class RemoteHTTPError(Exception):
+    """
+    Carries an HTTPException raised in a worker back to the API process
+    (HTTPException itself cannot be unpickled).
+    """
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+    def __str__(self) -> str:
+        return str(self.detail)
+
+
+def _share(value: Any, created: list) -> Any:
+    """
+    Replace DataFrames in value (and in nested lists, tuples and dicts)
+    with SharedFrame handles, recording every handle created.
+    """
+    if isinstance(value, pd.DataFrame):
+        try:
+            frame = SharedFrame.create(value)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, SharedFrameSpaceError):
+            # Columns Arrow cannot type (e.g. mixed objects), and frames that
+            # do not fit in shared_frame_dir, fall back to pickling
+            return value
+        created.append(frame)
+        return frame
+    if isinstance(value, (list, tuple)):
+        return type(value)(_share(item, created) for item in value)
+    if isinstance(value, dict):
+        return {key: _share(item, created) for key, item in value.items()}
+    return value
+
+
+def _load_shared(value: Any, remove: bool) -> Any:
+    """
+    Load the SharedFrames in value, reversing _share. The creating side
+    removes its frames, so remove is only set for results.
+    """
+    if isinstance(value, SharedFrame):
+        try:
+            return value.load()
+        finally:
+            if remove:
+                value.remove()
+    if isinstance(value, (list, tuple)):
+        return type(value)(_load_shared(item, remove) for item in value)
+    if isinstance(value, dict):
+        return {key: _load_shared(item, remove) for key, item in value.items()}
+    return value
+
+
+def _run_in_worker(func: Callable, args: tuple, kwargs: dict) -> Any:
+    """
+    Worker side of ProcessPool.run: load the shared inputs, call func and
+    share its result.
+    """
+    try:
+        result = func(*_load_shared(args, False), **_load_shared(kwargs, False))
+    except HTTPException as e:
+        raise RemoteHTTPError(e.status_code, e.detail)
+    return _share(result, [])
+
+
+def _warm_up() -> None:
+    # Unpickling this function imports this module, and with it pandas and pyarrow
+    pass
+
+
+def call_service(service_cls: type, *methods, args: tuple = (), kwargs: Optional[dict] = None) -> Any:
+    """
+    Build service_cls(*args, **kwargs) and call each method on it.
+
+    :param methods: Method names, or (name, *arguments) tuples
+    :return: The method's result, or a tuple of results for several methods
+    """
+    service = service_cls(*args, **(kwargs or {}))
+    results = []
+    for method in methods:
+        name, *method_args = (method,) if isinstance(method, str) else method
+        results.append(getattr(service, name)(*method_args))
+    return results[0] if len(results) == 1 else tuple(results)
+
+
+class ProcessPool:
+    """
+    Process pool shared by the synchronous report endpoints.
+
+    Parsing, the pandas services and the export run in worker processes so
+    the event loop keeps serving /health and authentication while a heavy
+    report is in progress. DataFrame arguments and results travel as Arrow
+    streams in memory-mapped files (see SharedFrame) rather than being
+    pickled.
+
+    The pool is started and stopped with the app lifespan. Until started,
+    or with report_process_workers set to 0, calls run inline in the
+    calling thread as before.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = settings.report_process_workers if max_workers is None else max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        if self._executor is None and self.max_workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # Fresh interpreters, not forks of the threaded API process
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            # Start every worker now rather than on the first report
+            for _ in range(self.max_workers):
+                self._executor.submit(_warm_up)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) in a worker process and await its result.
+
+        func must be importable by name (a module-level function or class).
+        Uploads are passed by path (see SpooledUpload) and DataFrames, also
+        inside lists, tuples and dicts, through mapped files.
+        """
+        if self._executor is None:
+            return func(*args, **kwargs)
+
+        created = []
+        try:
+            # Writing the shared frames is disk I/O, kept off the event loop
+            shared_args, shared_kwargs = await asyncio.to_thread(_share, (args, kwargs), created)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor, _run_in_worker, func, shared_args, shared_kwargs
+            )
+        except RemoteHTTPError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        finally:
+            for frame in created:
+                frame.remove()
+
+        return _load_shared(result, True)
+
+    def map(self, func: Callable, calls: Iterable[tuple]) -> Iterator[Any]:
+        """
+        Run func(*args) for each args tuple in calls on the workers, yielding
+        the results in order.
+
+        Blocks the calling thread, so it is for synchronous code such as a
+        service method run through the pool. At most max_workers calls are
+        in flight, and calls is only consumed as they finish, so a
+        generator of DataFrame slices has one slice per worker shared at a
+        time. Until started, as in the worker processes themselves, the
+        calls run inline one after another.
+        """
+        if self._executor is None:
+            for args in calls:
+                yield func(*args)
+            return
+
+        calls = iter(calls)
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < self.max_workers:
+                    args = next(calls, None)
+                    if args is None:
+                        break
+                    created = []
+                    future = self._executor.submit(_run_in_worker, func, _share(args, created), {})
+                    pending.append((future, created))
+                if not pending:
+                    return
+
+                future, created = pending.popleft()
+                try:
+                    result = future.result()
+                except RemoteHTTPError as e:
+                    raise HTTPException(status_code=e.status_code, detail=e.detail)
+                finally:
+                    for frame in created:
+                        frame.remove()
+                yield _load_shared(result, True)
+        finally:
+            for future, created in pending:
+                future.cancel()
+                # A call already running keeps reading its frames; the wait is short
+                try:
+                    future.exception()
+                except Exception:
+                    pass
+                for frame in created:
+                    frame.remove()
+
+    async def run_service(self, service_cls: type, *methods, args: tuple = (), kwargs: Optional[dict] = None) -> Any:
+        """
+        Run methods of a service class built from args/kwargs in a worker
+        process (see call_service).
+        """
+        return await self.run(call_service, service_cls, *methods, args=args, kwargs=kwargs)
+
+
+process_pool = ProcessPool()
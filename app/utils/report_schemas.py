@@ -0,0 +1,70 @@
+from fastapi import HTTPException
+import pandas as pd
+from typing import Dict
+
+# Column dtypes applied once when a report's input is loaded. Services can
+# rely on these instead of converting the same columns again.
+#
+# - Nullable integers (Int32/Int16) keep blank cells as <NA>
+# - Repeated text such as resource numbers and sites is stored as categories
+# - Dates are normalised to midnight with second resolution (pandas has no
+#   day-resolution datetime dtype)
+
+# Hours journal (VIP validation, overbooking, exemption)
+HOURS_JOURNAL_SCHEMA: Dict[str, str] = {
+    "Entry No.": "Int32",
+    "Applies-To Entry": "Int32",
+    "Resource no.": "category",
+    "Work date": "datetime64[s]",
+    "VIP Code": "Int16",
+    "Hours worked": "float64",
+    "User Originator": "category",
+}
+
+# Clocking export (attendance, device clockings)
+CLOCKINGS_SCHEMA: Dict[str, str] = {
+    "Clock No.": "category",
+    "Date": "datetime64[s]",
+    "WTT": "category",
+    "MeterID": "category",
+}
+
+
+def _convert_column(series: pd.Series, dtype: str) -> pd.Series:
+    if dtype.startswith("datetime64"):
+        return pd.to_datetime(series).dt.normalize().astype(dtype)
+    if dtype == "category":
+        return series.astype("category")
+
+    # Numeric: unparseable cells become missing, as remove_reversed_entries
+    # has always done for "Hours worked"
+    return pd.to_numeric(series, errors="coerce").astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """
+    Convert the columns of df named in schema to their declared dtypes.
+
+    Columns not present in df are ignored, and columns that already have
+    the declared dtype are left untouched.
+
+    :param df: Parsed upload
+    :param schema: Column name to dtype mapping
+    :return: DataFrame with converted columns
+    """
+    conversions = {}
+    for column, dtype in schema.items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+
+        try:
+            conversions[column] = _convert_column(df[column], dtype)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Column '{column}' could not be converted to {dtype}: {e}",
+            )
+
+    if not conversions:
+        return df
+    return df.assign(**conversions)
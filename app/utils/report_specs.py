@@ -0,0 +1,146 @@
+from pathlib import Path
+from typing import Dict, Optional
+import pandas as pd
+from app.services.attendence_service import AttendanceService
+from app.services.chunked_journal_service import ChunkedJournalService
+from app.services.dataset_service import CLOCKINGS, HOURS_JOURNAL
+from app.services.device_service import DeviceService
+from app.services.exemption_service import ExemptionService
+from app.services.incorrect_vip_service import IncorrectVIPService
+from app.services.multiple_clockings_service import MultipleClockingsService
+from app.services.overbooking_service import OverbookingService
+from app.utils.upload_spool import UploadContents
+
+# Path to VIP code configuration file
+VIP_CONFIG_PATH = Path(__file__).resolve().parents[1] / "core" / "vipcodes.json"
+
+# Columns the hours journal must contain for each journal report
+JOURNAL_COLUMNS = {"Entry No.", "Resource no.", "VIP Code", "Hours worked", "Applies-To Entry"}
+OVERBOOKING_COLUMNS = JOURNAL_COLUMNS | {"Work date"}
+
+# Columns the clocking export must contain for the attendance reports
+ATTENDANCE_COLUMNS = {"Clock No.", "Date", "WTT"}
+
+
+def _incorrect_vip_sheets(incorrect_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    return {
+        "IncorrectVIPCodes": incorrect_df,
+        "OriginatorEntriesCount": IncorrectVIPService.count_incorrect_entries_per_originator(incorrect_df),
+    }
+
+
+def _overbooking_sheets(duplicated: pd.DataFrame, overbooked: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    return {"Duplicated Overtime": duplicated, "Overbooked Normal Daily": overbooked}
+
+
+def _overbooking(df: pd.DataFrame, options: dict) -> Dict[str, pd.DataFrame]:
+    service = OverbookingService(df)
+    return _overbooking_sheets(service.find_duplicates_overtime(), service.find_overbooked_normal_daily())
+
+
+def _employee_attendance(df: pd.DataFrame, options: dict) -> Dict[str, pd.DataFrame]:
+    service = AttendanceService(df)
+    return {
+        "Weekly_attendance": service.get_attendance_by_employee_week(),
+        "Monthly_attendance": service.get_attendance_by_employee_month(),
+    }
+
+
+# Every report served by a synchronous endpoint and by /jobs:
+# - kind: HOURS_JOURNAL or CLOCKINGS input
+# - required_columns / optional_columns: as for load_report_frame
+# - build: takes the loaded input and the report options, and returns the
+#   sheets to export
+# - build_chunked: the same over a ChunkedJournalService, for journals
+#   too large to load at once
+# - prefix / filename_prefix: where the export is stored
+REPORTS: Dict[str, dict] = {
+    "vip-validation": {
+        "kind": HOURS_JOURNAL,
+        "required_columns": JOURNAL_COLUMNS,
+        "build": lambda df, options: _incorrect_vip_sheets(IncorrectVIPService(df, VIP_CONFIG_PATH).find_incorrect_vip()),
+        "build_chunked": lambda service, options: _incorrect_vip_sheets(service.find_incorrect_vip(VIP_CONFIG_PATH)),
+        "prefix": "vip-validation",
+        "filename_prefix": "incorrect_vip",
+    },
+    "overbooking": {
+        "kind": HOURS_JOURNAL,
+        "required_columns": OVERBOOKING_COLUMNS,
+        "build": _overbooking,
+        "build_chunked": lambda service, options: _overbooking_sheets(*service.find_overbooking()),
+        "prefix": "duplicate-validation",
+        "filename_prefix": "duplicate_overbooking",
+    },
+    "exemption": {
+        "kind": HOURS_JOURNAL,
+        "required_columns": JOURNAL_COLUMNS,
+        "build": lambda df, options: {"Exemption": ExemptionService(df, options.get("exemption_type", "")).get_exemption()},
+        "build_chunked": lambda service, options: {"Exemption": service.get_exemption(options.get("exemption_type", ""))},
+        "prefix": "exemption-report",
+        "filename_prefix": "exemption_report",
+    },
+    "exemption-pivoted": {
+        "kind": HOURS_JOURNAL,
+        "required_columns": JOURNAL_COLUMNS,
+        "build": lambda df, options: {"Exemption": ExemptionService(df, options.get("exemption_type", "")).get_pivoted_exemption()},
+        "prefix": "exemption-report",
+        "filename_prefix": "exemption_report",
+    },
+    "multiple-clockings": {
+        "kind": CLOCKINGS,
+        "required_columns": {"Clock No.", "Date"},
+        "build": lambda df, options: {"Multiple clockings": MultipleClockingsService(df).getMultipleClockings()},
+        "prefix": "multiple-clockings",
+        "filename_prefix": "multiple_clockings",
+    },
+    "device-clockings": {
+        "kind": CLOCKINGS,
+        "required_columns": {"MeterID", "Date"},
+        "optional_columns": {"Clock No."},
+        "build": lambda df, options: {"Device report": DeviceService(df).unique_clocks_per_meter_per_day()},
+        "prefix": "clockings count per machine",
+        "filename_prefix": "clockings_count",
+    },
+    "attendance-list": {
+        "kind": CLOCKINGS,
+        "required_columns": ATTENDANCE_COLUMNS,
+        "build": lambda df, options: {"Attendence_list": AttendanceService(df).get_employees_list()},
+        "prefix": "Employees attence list",
+        "filename_prefix": "attendance_list",
+    },
+    "attendance-site-summary": {
+        "kind": CLOCKINGS,
+        "required_columns": ATTENDANCE_COLUMNS,
+        "optional_columns": set(),
+        "build": lambda df, options: {"Attendence_summary": AttendanceService(df).get_summary_by_site()},
+        "prefix": "Site attendence summary",
+        "filename_prefix": "site_attence",
+    },
+    "attendance-employee-summary": {
+        "kind": CLOCKINGS,
+        "required_columns": ATTENDANCE_COLUMNS,
+        "optional_columns": set(),
+        "build": _employee_attendance,
+        "prefix": "Employee_attendance_summary",
+        "filename_prefix": "employee_attendance",
+    },
+}
+
+
+def build_report(report: str, df: pd.DataFrame, options: Optional[dict] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Build a report's sheets from its loaded input.
+
+    Takes the report by name so it can run in a worker process (the
+    builders are lambdas, which do not pickle).
+    """
+    return REPORTS[report]["build"](df, options or {})
+
+
+def build_chunked_report(report: str, contents: UploadContents, options: Optional[dict] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Build a report's sheets from an oversized journal in row batches.
+    """
+    spec = REPORTS[report]
+    service = ChunkedJournalService(contents, spec["required_columns"])
+    return spec["build_chunked"](service, options or {})
@@ -1,5 +1,28 @@
 import pandas as pd
 
+def find_reversed_entry_nos(df: pd.DataFrame) -> set:
+    """
+    Returns the Entry Nos. of reversed entries in the journal and of the entries they reverse.
+
+    The sets from separate row batches of one journal can be combined, so
+    reversals can be collected in a first pass over a journal too large to
+    load at once.
+
+    Args:
+        df (pd.DataFrame): Hours journal rows with numeric 'Hours worked'.
+
+    Returns:
+        set: Entry Nos. to remove.
+    """
+    reversed_mask = (df["Hours worked"] < 0) & df["Applies-To Entry"].notnull()
+    reversed_entries = df[reversed_mask]
+
+    # Both reversed entries and their targets are removed
+    reversed_entry_nos = set(reversed_entries["Entry No."])
+    target_entry_nos = set(reversed_entries["Applies-To Entry"])
+
+    return reversed_entry_nos.union(target_entry_nos)
+
 def remove_reversed_entries(df: pd.DataFrame) -> pd.DataFrame:
     """
     Removes reversed entries from the hours journal.
@@ -13,17 +36,10 @@ def remove_reversed_entries(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Cleaned DataFrame with reversed entries and their targets removed.
     """
-    df["Hours worked"] = pd.to_numeric(df["Hours worked"], errors="coerce")
-
-    # Identify reversed entries
-    reversed_mask = (df["Hours worked"] < 0) & df["Applies-To Entry"].notnull()
-    reversed_entries = df[reversed_mask]
-
-    # Get Entry Nos to remove: both reversed and their targets
-    reversed_entry_nos = set(reversed_entries["Entry No."])
-    target_entry_nos = set(reversed_entries["Applies-To Entry"])
+    if not pd.api.types.is_numeric_dtype(df["Hours worked"]):
+        df["Hours worked"] = pd.to_numeric(df["Hours worked"], errors="coerce")
 
-    all_entry_nos_to_remove = reversed_entry_nos.union(target_entry_nos)
+    all_entry_nos_to_remove = find_reversed_entry_nos(df)
 
     # Filter out all matching entries
     cleaned_df = df[~df["Entry No."].isin(all_entry_nos_to_remove)].copy()
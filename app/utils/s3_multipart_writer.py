@@ -0,0 +1,191 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from app.core.settings import settings
+
+# S3 rejects multipart parts smaller than 5 MB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class S3MultipartWriter:
+    """
+    Write-only file object that streams its contents into an S3 object.
+
+    Written bytes are cut into parts of part_size, which are uploaded with
+    upload_part from a small thread pool while the caller keeps writing.
+    At most max_workers + 1 parts are buffered at any time, so memory does
+    not grow with the object size. Objects smaller than one part are sent
+    with a single put_object when the writer is closed.
+
+    On error, or when the writer is used as a context manager and the block
+    raises, the multipart upload is aborted so no orphaned parts remain.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        part_size: int = None,
+        max_workers: int = None,
+    ):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = max(part_size or settings.s3_multipart_part_size, MIN_PART_SIZE)
+        self.max_workers = max_workers or settings.s3_multipart_workers
+
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._executor = None
+        self._futures = []
+        # Bounds the parts queued or in flight
+        self._part_slots = threading.BoundedSemaphore(self.max_workers + 1)
+        self.size = 0
+        self.closed = False
+
+    # -------------------------
+    # File object API
+    # -------------------------
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed S3MultipartWriter")
+
+        self._buffer += data
+        self.size += len(data)
+
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._submit_part(part)
+
+        return len(data)
+
+    def flush(self) -> None:
+        # Parts are only sent once full; closing sends the remainder
+        pass
+
+    def close(self) -> None:
+        """
+        Upload the remaining bytes and complete the upload.
+        """
+        if self.closed:
+            return
+        self.closed = True
+
+        try:
+            if self._upload_id is None:
+                self.s3.put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=bytes(self._buffer),
+                    ContentType=self.content_type,
+                )
+                return
+
+            if self._buffer:
+                self._submit_part(bytes(self._buffer))
+            self._buffer = bytearray()
+
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._completed_parts()},
+            )
+        except BaseException:
+            self._abort()
+            raise
+        finally:
+            self._shutdown()
+
+    def abort(self) -> None:
+        """
+        Discard everything written so far.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._abort()
+        self._shutdown()
+
+    def __enter__(self) -> "S3MultipartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _submit_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            response = self.s3.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType=self.content_type,
+            )
+            self._upload_id = response["UploadId"]
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="s3-part",
+            )
+
+        # Fail fast when an earlier part already failed
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        part_number = len(self._futures) + 1
+        self._part_slots.acquire()
+        try:
+            future = self._executor.submit(self._upload_part, part_number, data)
+        except BaseException:
+            self._part_slots.release()
+            raise
+        self._futures.append(future)
+
+    def _upload_part(self, part_number: int, data: bytes) -> Dict:
+        try:
+            response = self.s3.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=data,
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._part_slots.release()
+
+    def _completed_parts(self) -> List[Dict]:
+        return [future.result() for future in self._futures]
+
+    def _abort(self) -> None:
+        if self._upload_id is None:
+            return
+
+        for future in self._futures:
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+        self.s3.abort_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+        )
+
+    def _shutdown(self) -> None:
+        self._buffer = bytearray()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
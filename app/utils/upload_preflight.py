@@ -0,0 +1,43 @@
+from typing import List, Set
+from fastapi import HTTPException
+from app.utils.arrow_reader import read_arrow_header
+from app.utils.csv_reader import read_csv_header
+from app.utils.file_formats import CSV, XLSX, detect_format
+from app.utils.xlsx_reader import read_xlsx_header
+from app.utils.upload_spool import UploadContents
+
+
+def read_header(contents: UploadContents) -> List[str]:
+    """
+    Read the column names of an uploaded xlsx, CSV, Parquet or Arrow file
+    without parsing its data rows.
+    """
+    file_format = detect_format(contents)
+    if file_format == XLSX:
+        return read_xlsx_header(contents)
+    if file_format == CSV:
+        return read_csv_header(contents)
+    return read_arrow_header(contents, file_format)
+
+
+def validate_required_columns(contents: UploadContents, required_columns: Set[str]) -> List[str]:
+    """
+    Preflight an upload by checking its header against the required columns.
+
+    Only the header row is read, so a file missing a column is rejected
+    before any time is spent parsing its rows.
+
+    :param contents: Uploaded file bytes or spooled upload
+    :param required_columns: Columns that must be present in the header
+    :return: Header column names
+    """
+    try:
+        header = read_header(contents)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    missing = set(required_columns) - set(header)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing required columns: {', '.join(missing)}")
+
+    return header
@@ -0,0 +1,119 @@
+import mmap
+import tempfile
+from io import BytesIO
+from typing import BinaryIO, Union
+from fastapi import UploadFile, HTTPException
+
+# Size of each read from the incoming upload stream
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class SpooledUpload:
+    """
+    An accepted upload spooled to a temporary file on disk.
+
+    Parsers receive a read-only memory-mapped view of the file instead of a
+    bytes copy, so per-request memory does not grow with the upload size.
+    """
+
+    def __init__(self, file, size: int, filename: str = ""):
+        self.file = file
+        self.path = file.name
+        self.size = size
+        self.filename = filename
+        self.view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def open(self) -> BinaryIO:
+        """
+        Open an independent read-only stream over the spooled file, for
+        consumers such as zipfile that need a seekable file object.
+        """
+        return open(self.path, "rb")
+
+    def __reduce__(self):
+        # Worker processes (see process_pool) reopen the spooled file by path
+        return (_reopen_spool, (self.path, self.size, self.filename))
+
+    def close(self):
+        """
+        Release the mapping and delete the temporary file.
+        """
+        try:
+            self.view.close()
+        except BufferError:
+            # A parsed frame still references the mapping; it is released
+            # once that frame is garbage collected
+            pass
+        self.file.close()
+
+
+def _reopen_spool(path: str, size: int, filename: str) -> SpooledUpload:
+    return SpooledUpload(open(path, "rb"), size, filename)
+
+
+# Uploads reach parsers either as a spooled file or, in tests and internal
+# callers, as plain bytes
+UploadContents = Union[bytes, SpooledUpload]
+
+
+def as_buffer(contents: UploadContents):
+    """
+    Return a bytes-like view of the upload without copying it.
+    """
+    if isinstance(contents, SpooledUpload):
+        return contents.view
+    return contents
+
+
+def as_stream(contents: UploadContents) -> BinaryIO:
+    """
+    Return a fresh seekable binary stream positioned at the start of the upload.
+    """
+    if isinstance(contents, SpooledUpload):
+        return contents.open()
+    return BytesIO(contents)
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SpooledUpload:
+    """
+    Read an upload in chunks into a temporary file, aborting as soon as it
+    grows past max_size.
+
+    :param file: Incoming upload
+    :param max_size: Maximum accepted size in bytes
+    :param chunk_size: Number of bytes read per chunk
+    :return: The spooled upload; the caller must close it
+    """
+    too_large = HTTPException(
+        status_code=400,
+        detail=f"File {file.filename} too large. Max size is {max_size / (1024*1024)} MB.",
+    )
+
+    # Reject immediately when the multipart parser already knows the size
+    if file.size is not None and file.size > max_size:
+        raise too_large
+
+    spool = tempfile.NamedTemporaryFile(prefix="upload-")
+    try:
+        size = 0
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if size > max_size:
+                raise too_large
+            spool.write(chunk)
+
+        if size == 0:
+            raise HTTPException(status_code=400, detail=f"File {file.filename} is empty")
+
+        spool.flush()
+        return SpooledUpload(spool, size, file.filename)
+    except BaseException:
+        spool.close()
+        raise
@@ -0,0 +1,289 @@
+import posixpath
+import re
+import zipfile
+from typing import Dict, Iterator, List, Optional, Set
+from xml.etree.ElementTree import fromstring, iterparse
+import pandas as pd
+from openpyxl import load_workbook
+from app.utils.upload_spool import UploadContents, as_stream
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+SHARED_STRINGS_TYPE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+)
+
+
+def _header_names(header_row: tuple) -> List[str]:
+    """
+    Internal helper to turn the raw header cells into column names.
+    Blank header cells are named the same way pandas names them.
+    """
+    names = []
+    for index, value in enumerate(header_row):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            names.append(f"Unnamed: {index}")
+        else:
+            names.append(value if isinstance(value, str) else str(value))
+    return names
+
+
+def _column_index(cell_ref: str) -> int:
+    """
+    Internal helper to convert a cell reference such as "AB1" to a
+    zero-based column index.
+    """
+    letters = re.match(r"[A-Z]+", cell_ref).group(0)
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - ord("A") + 1)
+    return index - 1
+
+
+def _resolve_part(target: str) -> str:
+    """
+    Internal helper to resolve a relationship target against the xl/ folder.
+    """
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _first_sheet_parts(archive: zipfile.ZipFile) -> tuple:
+    """
+    Internal helper returning the zip paths of the first worksheet and of
+    the shared strings table (None when the workbook has none).
+    """
+    workbook = archive.read("xl/workbook.xml")
+    relationships = archive.read("xl/_rels/workbook.xml.rels")
+
+    first_sheet = fromstring(workbook).find(f"{MAIN_NS}sheets/{MAIN_NS}sheet")
+    if first_sheet is None:
+        raise ValueError("Workbook has no worksheets")
+    sheet_rel_id = first_sheet.get(f"{REL_NS}id")
+
+    sheet_part = None
+    shared_strings_part = None
+    for rel in fromstring(relationships).iter(f"{PACKAGE_REL_NS}Relationship"):
+        if rel.get("Id") == sheet_rel_id:
+            sheet_part = _resolve_part(rel.get("Target"))
+        elif rel.get("Type") == SHARED_STRINGS_TYPE:
+            shared_strings_part = _resolve_part(rel.get("Target"))
+
+    if sheet_part is None:
+        raise ValueError("Workbook relationships do not reference the first worksheet")
+    return sheet_part, shared_strings_part
+
+
+def _read_shared_strings(archive: zipfile.ZipFile, part: str, needed: Set[int]) -> Dict[int, str]:
+    """
+    Internal helper that streams the shared strings table and stops as soon
+    as every needed index has been read.
+    """
+    strings: Dict[int, str] = {}
+    if not needed:
+        return strings
+
+    last_needed = max(needed)
+    index = 0
+    with archive.open(part) as stream:
+        for _, element in iterparse(stream, events=("end",)):
+            if element.tag != f"{MAIN_NS}si":
+                continue
+            if index in needed:
+                # Plain <t> or rich-text runs <r><t>; phonetic <rPh> hints are skipped
+                strings[index] = "".join(
+                    text.text or ""
+                    for child in element
+                    if child.tag in (f"{MAIN_NS}t", f"{MAIN_NS}r")
+                    for text in child.iter(f"{MAIN_NS}t")
+                )
+            element.clear()
+            if index >= last_needed:
+                break
+            index += 1
+    return strings
+
+
+def read_xlsx_header(contents: UploadContents) -> List[str]:
+    """
+    Read only the header row of the first worksheet of an xlsx workbook.
+
+    The zip archive is opened directly and the worksheet XML is parsed just
+    until the end of its first row, so the cost does not depend on how many
+    data rows the workbook holds.
+
+    Args:
+        contents: Workbook bytes or spooled upload.
+
+    Returns:
+        List[str]: Header names, blank cells named like pandas does.
+    """
+    with as_stream(contents) as stream, zipfile.ZipFile(stream) as archive:
+        sheet_part, shared_strings_part = _first_sheet_parts(archive)
+
+        cells: Dict[int, tuple] = {}
+        with archive.open(sheet_part) as stream:
+            position = 0
+            for _, element in iterparse(stream, events=("end",)):
+                if element.tag == f"{MAIN_NS}c":
+                    ref = element.get("r")
+                    position = _column_index(ref) if ref else position
+                    cell_type = element.get("t", "n")
+                    if cell_type == "inlineStr":
+                        value = "".join(t.text or "" for t in element.iter(f"{MAIN_NS}t"))
+                    else:
+                        v = element.find(f"{MAIN_NS}v")
+                        value = v.text if v is not None else None
+                    cells[position] = (cell_type, value)
+                    position += 1
+                elif element.tag == f"{MAIN_NS}row":
+                    break
+
+        needed = {
+            int(value) for cell_type, value in cells.values()
+            if cell_type == "s" and value is not None
+        }
+        shared_strings = (
+            _read_shared_strings(archive, shared_strings_part, needed)
+            if shared_strings_part else {}
+        )
+
+    if not cells:
+        return []
+
+    header = [None] * (max(cells) + 1)
+    for position, (cell_type, value) in cells.items():
+        if cell_type == "s" and value is not None:
+            value = shared_strings.get(int(value))
+        header[position] = value
+    return _header_names(tuple(header))
+
+
+def _select_columns(header_row: tuple, columns: Optional[Set[str]]) -> Dict[int, str]:
+    """
+    Internal helper mapping kept column positions to names (first occurrence
+    wins on duplicates).
+    """
+    selected: Dict[int, str] = {}
+    for index, name in enumerate(_header_names(header_row)):
+        if (columns is None or name in columns) and name not in selected.values():
+            selected[index] = name
+    return selected
+
+
+def read_xlsx_columns(contents: UploadContents, columns: Optional[Set[str]] = None) -> pd.DataFrame:
+    """
+    Stream the first worksheet of an xlsx workbook into a DataFrame.
+
+    The header row is parsed first, then the remaining rows are iterated in
+    openpyxl read-only mode and only the requested columns are collected.
+    Columns that are not requested are never materialised.
+
+    Args:
+        contents: Workbook bytes or spooled upload.
+        columns: Column names to keep. None keeps every column.
+
+    Returns:
+        pd.DataFrame: Projected DataFrame, columns in workbook order.
+    """
+    stream = as_stream(contents)
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+
+        header_row = next(rows, None)
+        if header_row is None:
+            return pd.DataFrame()
+
+        selected = _select_columns(header_row, columns)
+        values: Dict[int, list] = {index: [] for index in selected}
+        width = max(selected) + 1 if selected else 0
+        row_count = 0
+        last_non_empty = 0
+
+        for row in rows:
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+
+            empty = True
+            for index, column_values in values.items():
+                value = row[index]
+                column_values.append(value)
+                if value is not None:
+                    empty = False
+
+            row_count += 1
+            if not empty:
+                last_non_empty = row_count
+    finally:
+        workbook.close()
+        stream.close()
+
+    # Trailing blank rows are formatting leftovers, not data
+    return pd.DataFrame(
+        {name: values[index][:last_non_empty] for index, name in selected.items()}
+    )
+
+
+def iter_xlsx_batches(
+    contents: UploadContents,
+    columns: Optional[Set[str]] = None,
+    batch_rows: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the first worksheet of an xlsx workbook as DataFrames of at most
+    batch_rows rows, so memory is bounded by the batch size rather than the
+    sheet size.
+
+    Blank rows are only emitted once a later non-blank row is seen, which
+    drops trailing blank rows just like read_xlsx_columns.
+
+    Args:
+        contents: Workbook bytes or spooled upload.
+        columns: Column names to keep. None keeps every column.
+        batch_rows: Maximum number of rows per batch.
+
+    Yields:
+        pd.DataFrame: Projected batches, columns in workbook order.
+    """
+    stream = as_stream(contents)
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+
+        selected = _select_columns(header_row, columns)
+        width = max(selected) + 1 if selected else 0
+        names = list(selected.values())
+        blank = tuple(None for _ in selected)
+
+        batch = []
+        pending_blank = 0
+        for row in rows:
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            values = tuple(row[index] for index in selected)
+
+            if values == blank:
+                pending_blank += 1
+                continue
+
+            batch.extend([blank] * pending_blank)
+            pending_blank = 0
+            batch.append(values)
+
+            if len(batch) >= batch_rows:
+                yield pd.DataFrame.from_records(batch, columns=names)
+                batch = []
+
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=names)
+    finally:
+        workbook.close()
+        stream.close()
@@ -39,3 +39,24 @@ def test_devices_count_endpoint(sample_file):
     assert isinstance(clockings_data, list) or isinstance(clockings_data, dict)
     # Depending on how DeviceService.clockings_count() structures output,
     # you can assert more specific conditions here.
+
+
+def test_split_export_parts_are_written_by_several_workers(part_pool, tmp_path):
+    import zipfile
+    from app.dependencies.auth import get_current_user
+    from app.utils.constants import COGNITO_GROUPS_CLAIM
+
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "u1", COGNITO_GROUPS_CLAIM: ["site-admin"]}
+    try:
+        response = client.post(
+            "/device-clockings",
+            files={"file": ("clockings.csv", b"Clock No.,MeterID,Date\n1,M1,2024-01-01\n2,M2,2024-01-01\n", "text/csv")},
+        )
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert response.status_code == 200
+    assert ".zip?expires=" in response.json()["download_url"]
+    assert len(list(part_pool.iterdir())) == 2
+    [export] = (tmp_path / "exports").rglob("*.zip")
+    assert zipfile.ZipFile(export).namelist() == ["part-1.xlsx", "part-2.xlsx"]
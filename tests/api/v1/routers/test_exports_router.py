@@ -0,0 +1,56 @@
+import pytest
+from urllib.parse import urlsplit
+from fastapi.testclient import TestClient
+from app.core.settings import settings
+from app.main import app
+from app.utils.export_tokens import sign_export_url
+
+client = TestClient(app)
+
+CONTENT = b"0123456789" * 1000
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "storage_backend", "local")
+    monkeypatch.setattr(settings, "local_export_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "export_download_chunk_bytes", 1024)
+    monkeypatch.setattr("app.utils.export_tokens._signing_key", b"test-key")
+    (tmp_path / "u1" / "reports").mkdir(parents=True)
+    (tmp_path / "u1" / "reports" / "report.csv").write_bytes(CONTENT)
+    (tmp_path / ".signing-key").write_text("secret")
+    return tmp_path
+
+
+def signed(path: str, expires_in: int = 60) -> str:
+    url = urlsplit(sign_export_url(path, expires_in))
+    return f"{url.path}?{url.query}"
+
+
+def test_download_streams_file(export_dir):
+    response = client.get(signed("u1/reports/report.csv"))
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_download_range_and_etag(export_dir):
+    url = signed("u1/reports/report.csv")
+
+    partial = client.get(url, headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == CONTENT[10:20]
+
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_download_rejects_bad_or_expired_links(export_dir):
+    url = signed("u1/reports/report.csv")
+
+    assert client.get(url.replace("report.csv", "other.csv")).status_code == 403
+    assert client.get(signed("u1/reports/report.csv", expires_in=-1)).status_code == 403
+    assert client.get(signed(".signing-key")).status_code == 404
+    assert client.get(signed("u1/reports/missing.csv")).status_code == 404
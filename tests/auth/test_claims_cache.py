@@ -0,0 +1,58 @@
+import time
+import pytest
+from jose import jwt
+from app.auth import tokens
+from app.auth.claims_cache import ClaimsCache
+from test_jwks import JWKSStandIn, make_key
+
+
+def test_entries_expire_before_exp_and_on_key_rotation():
+    cache = ClaimsCache(max_entries=2, skew_seconds=30)
+    cache.put("a", {"sub": "a", "exp": time.time() + 60}, generation=1)
+    cache.put("soon", {"sub": "soon", "exp": time.time() + 10}, generation=1)
+    cache.put("no-exp", {"sub": "no-exp"}, generation=1)
+
+    assert cache.get("a", generation=1) == {"sub": "a", "exp": pytest.approx(time.time() + 60, abs=5)}
+    assert cache.get("soon", generation=1) is None
+    assert cache.get("no-exp", generation=1) is None
+    assert cache.get("a", generation=2) is None
+
+
+def test_least_recently_used_entries_are_dropped():
+    cache = ClaimsCache(max_entries=2, skew_seconds=0)
+    exp = time.time() + 60
+    for token in ("a", "b"):
+        cache.put(token, {"sub": token, "exp": exp}, generation=0)
+    cache.get("a", generation=0)
+    cache.put("c", {"sub": "c", "exp": exp}, generation=0)
+
+    assert cache.get("b", generation=0) is None
+    assert cache.get("a", generation=0)["sub"] == "a"
+
+
+@pytest.mark.asyncio
+async def test_repeated_token_is_verified_once(monkeypatch):
+    private_pem, public = make_key("k1")
+    manager = JWKSStandIn(public).manager()
+    monkeypatch.setattr(tokens, "jwks_key_manager", manager)
+    monkeypatch.setattr(tokens, "claims_cache", ClaimsCache(max_entries=10, skew_seconds=30))
+    monkeypatch.setattr(tokens, "OIDC_AUDIENCE", "app")
+    monkeypatch.setattr(tokens, "OIDC_ISSUER", "https://issuer.test")
+
+    token = jwt.encode(
+        {"sub": "u1", "aud": "app", "iss": "https://issuer.test", "exp": int(time.time()) + 3600},
+        private_pem, algorithm="RS256", headers={"kid": "k1"},
+    )
+    verifications = []
+    decode = jwt.decode
+    monkeypatch.setattr(tokens.jwt, "decode", lambda *args, **kwargs: verifications.append(1) or decode(*args, **kwargs))
+
+    for _ in range(5):
+        assert (await tokens.decode_access_token(token))["sub"] == "u1"
+    assert len(verifications) == 1
+
+    # A changed key set invalidates the cached claims
+    manager.generation += 1
+    await tokens.decode_access_token(token)
+    assert len(verifications) == 2
+    await manager.aclose()
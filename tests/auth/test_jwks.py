@@ -0,0 +1,84 @@
+import asyncio
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from app.auth.jwks import JWKSKeyManager
+
+
+def make_key(kid: str):
+    private_pem = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public = jwk.construct(private_pem, "RS256").public_key().to_dict()
+    return private_pem, {**public, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+class JWKSStandIn:
+    """Local JWKS endpoint counting the fetches it serves."""
+
+    def __init__(self, *keys):
+        self.keys = list(keys)
+        self.requests = 0
+        self.fail = False
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"keys": self.keys})
+
+    def manager(self, **kwargs) -> JWKSKeyManager:
+        return JWKSKeyManager("https://issuer.test/.well-known/jwks.json", transport=httpx.MockTransport(self.handle), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_fetch():
+    private_pem, public = make_key("k1")
+    stand_in = JWKSStandIn(public)
+    manager = stand_in.manager(ttl_seconds=60, min_refresh_interval_seconds=0)
+
+    keys = await asyncio.gather(*(manager.get_key("k1") for _ in range(20)))
+
+    assert stand_in.requests == 1
+    assert all(key is keys[0] for key in keys)
+    token = jwt.encode({"sub": "u1"}, private_pem, algorithm="RS256", headers={"kid": "k1"})
+    assert jwt.decode(token, keys[0], algorithms=["RS256"])["sub"] == "u1"
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refreshes_at_most_once_per_interval():
+    _, first = make_key("k1")
+    _, rotated = make_key("k2")
+    stand_in = JWKSStandIn(first)
+    manager = stand_in.manager(ttl_seconds=3600, min_refresh_interval_seconds=0)
+    await manager.get_key("k1")
+
+    # The issuer rotated its keys: the unknown kid triggers a refetch
+    stand_in.keys.append(rotated)
+    assert await manager.get_key("k2") is not None
+    assert stand_in.requests == 2
+    assert manager.generation == 2
+
+    # Forged kids cannot force refetches within the interval
+    manager.min_refresh_interval_seconds = 3600
+    with pytest.raises(KeyError):
+        await manager.get_key("forged")
+    assert stand_in.requests == 2
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_kept_when_refetch_fails():
+    _, public = make_key("k1")
+    stand_in = JWKSStandIn(public)
+    manager = stand_in.manager(ttl_seconds=0, min_refresh_interval_seconds=0)
+    key = await manager.get_key("k1")
+
+    stand_in.fail = True
+    assert await manager.get_key("k1") is key
+    assert stand_in.requests == 2
+    await manager.aclose()
@@ -0,0 +1,73 @@
+import os
+import time
+from pathlib import Path
+import pytest
+from app.core.settings import settings
+from app.dependencies.multiple_file_validator import _parse_file
+from app.services import excel_export_service
+from app.services.excel_export_service import _write_workbook_file
+from app.utils.process_pool import process_pool
+
+
+def record_worker_pid():
+    """
+    Leave a file named after the calling process in WORKER_PID_DIR.
+    """
+    Path(os.environ["WORKER_PID_DIR"], str(os.getpid())).touch()
+    # Keep this worker busy so the next call goes to another one
+    time.sleep(0.5)
+
+
+def write_part_recording_pid(sheets, path):
+    record_worker_pid()
+    return _write_workbook_file(sheets, path)
+
+
+def parse_file_recording_pid(contents):
+    record_worker_pid()
+    return _parse_file(contents)
+
+
+@pytest.fixture
+def worker_pool(tmp_path, monkeypatch):
+    """
+    Start the report process pool with two workers. Yields the directory
+    holding a file per process that ran a *_recording_pid function.
+    """
+    pid_dir = tmp_path / "worker-pids"
+    pid_dir.mkdir()
+    monkeypatch.setenv("WORKER_PID_DIR", str(pid_dir))
+
+    monkeypatch.setattr(process_pool, "max_workers", 2)
+    process_pool.start()
+    try:
+        yield pid_dir
+    finally:
+        process_pool.shutdown()
+
+
+@pytest.fixture
+def split_exports(tmp_path, monkeypatch):
+    """
+    Store local xlsx exports under tmp_path split into one workbook per
+    row, in this process and in worker processes started from now on, and
+    record which processes write the parts.
+    """
+    overrides = {
+        "excel_max_sheet_rows": 1,
+        "excel_max_workbook_rows": 1,
+        "storage_backend": "local",
+        "local_export_dir": str(tmp_path / "exports"),
+    }
+    for name, value in overrides.items():
+        monkeypatch.setenv(name.upper(), str(value))
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(excel_export_service, "_write_workbook_file", write_part_recording_pid)
+
+
+@pytest.fixture
+def part_pool(split_exports, worker_pool):
+    """
+    worker_pool, started after split_exports so its workers split exports too.
+    """
+    return worker_pool
@@ -0,0 +1,17 @@
+from app.core.aws_clients import AWSClients
+
+
+def test_clients_are_created_once_and_closed():
+    clients = AWSClients()
+
+    s3 = clients.client("s3")
+    assert clients.client("s3") is s3
+    assert clients.resource("dynamodb") is clients.resource("dynamodb")
+    assert s3.meta.config.tcp_keepalive is True
+    assert s3.meta.config.retries["mode"] == "standard"
+
+    clients.close()
+
+    # A closed registry builds fresh clients on the next use
+    assert clients.client("s3") is not s3
+    clients.close()
@@ -0,0 +1,50 @@
+import pytest
+import pandas as pd
+from io import BytesIO
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from app.dependencies import multiple_file_validator
+from app.dependencies.multiple_file_validator import MultiFileValidator
+from tests.conftest import parse_file_recording_pid
+
+
+def csv_upload(filename: str, data: bytes) -> UploadFile:
+    return UploadFile(BytesIO(data), filename=filename)
+
+
+def excel_upload(filename: str, df: pd.DataFrame) -> UploadFile:
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False)
+    return UploadFile(BytesIO(buffer.getvalue()), filename=filename)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("extension", ["csv", "xlsx"])
+async def test_files_are_parsed_concurrently(extension, worker_pool, monkeypatch):
+    # Each worker holds its parse long enough for the other file to go to the other worker
+    monkeypatch.setattr(multiple_file_validator, "_parse_file", parse_file_recording_pid)
+
+    frames = [pd.DataFrame({"ID": [1], f"Value{i}": [i]}) for i in range(2)]
+    if extension == "xlsx":
+        files = [excel_upload(f"report{i}.xlsx", df) for i, df in enumerate(frames)]
+    else:
+        files = [csv_upload(f"report{i}.csv", df.to_csv(index=False).encode()) for i, df in enumerate(frames)]
+    dataframes = await MultiFileValidator()(files=files, join_by_column="ID")
+
+    assert [list(df.columns) for df in dataframes] == [["ID", "Value0"], ["ID", "Value1"]]
+    assert len(list(worker_pool.iterdir())) == 2
+
+
+@pytest.mark.asyncio
+async def test_parse_errors_are_reported_per_file():
+    files = [
+        csv_upload("good.csv", b"ID,Name\n1,Alice\n"),
+        csv_upload("bad.parquet", b"PAR1 not really parquet"),
+    ]
+
+    with pytest.raises(HTTPException) as exc:
+        await MultiFileValidator()(files=files, join_by_column="ID")
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail.startswith("Failed to process bad.parquet")
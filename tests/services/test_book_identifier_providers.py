@@ -0,0 +1,103 @@
+import asyncio
+import httpx
+import pytest
+from app.services.book_identifier_service import BookIdentifierService
+from app.utils.persistent_cache import PersistentCache
+
+GOOGLE_MATCH = {"items": [{"volumeInfo": {"title": "Clean Code", "authors": ["Robert C. Martin"]}}]}
+OPEN_LIBRARY_MATCH = {"docs": [{"title": "Clean Code", "author_name": ["Robert C. Martin"], "publisher": ["PH"]}]}
+
+
+class ProviderStubs:
+    """Local stand-ins for Google Books and Open Library."""
+
+    def __init__(self, google=(200, GOOGLE_MATCH, 0), open_library=(200, OPEN_LIBRARY_MATCH, 0)):
+        self.responses = {"google.test": google, "openlibrary.test": open_library}
+        self.requests = {"google.test": 0, "openlibrary.test": 0}
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.requests[host] += 1
+        status, body, delay = self.responses[host]
+        await asyncio.sleep(delay)
+        return httpx.Response(status, json=body)
+
+    def service(self, cache: PersistentCache) -> BookIdentifierService:
+        return BookIdentifierService(
+            google_books_url="https://google.test/books/v1/volumes",
+            open_library_url="https://openlibrary.test/search.json",
+            transport=httpx.MockTransport(self.handle),
+            metadata_cache=cache,
+        )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PersistentCache("book_metadata", db_path=str(tmp_path / "cache.sqlite3"), max_memory_entries=10)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_first_match_wins_without_waiting_for_slow_provider(cache):
+    stubs = ProviderStubs(google=(200, GOOGLE_MATCH, 5))
+    service = stubs.service(cache)
+
+    started = asyncio.get_running_loop().time()
+    result = await service.identify_book("Clean Code", "Robert C. Martin")
+
+    assert asyncio.get_running_loop().time() - started < 1
+    assert result["source"] == "openlibrary"
+    assert result["confidence"] == 0.7
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_empty_result_waits_for_other_provider(cache):
+    stubs = ProviderStubs(google=(200, GOOGLE_MATCH, 0.05), open_library=(200, {"docs": []}, 0))
+    service = stubs.service(cache)
+
+    result = await service.identify_book("Clean Code")
+
+    assert result["source"] == "google_books"
+    assert result["confidence"] == 0.9
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failing_provider_is_skipped_once_circuit_opens(monkeypatch, cache):
+    monkeypatch.setattr("app.core.settings.settings.book_provider_failure_threshold", 2)
+    stubs = ProviderStubs(google=(503, {}, 0), open_library=(200, {"docs": []}, 0))
+    service = stubs.service(cache)
+
+    for _ in range(4):
+        result = await service.identify_book("Unknown")
+
+    assert result["source"] == "none"
+    assert stubs.requests == {"google.test": 2, "openlibrary.test": 4}
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_repeated_queries_are_served_from_cache(tmp_path, cache):
+    stubs = ProviderStubs()
+    service = stubs.service(cache)
+
+    first = await service.identify_book("Clean Code", "Robert C. Martin")
+    again = await service.identify_book("  clean   CODE ", "robert c. martin")
+    assert again == first
+    assert stubs.requests == {"google.test": 1, "openlibrary.test": 1}
+
+    # Misses both providers answered are cached too, and echo the query
+    stubs.responses = {"google.test": (200, {}, 0), "openlibrary.test": (200, {"docs": []}, 0)}
+    await service.identify_book("Unknown Book")
+    miss = await service.identify_book("UNKNOWN book")
+    assert miss["source"] == "none" and miss["title"] == "UNKNOWN book"
+    assert stubs.requests == {"google.test": 2, "openlibrary.test": 2}
+
+    # The disk tier serves other processes and restarts
+    restarted = PersistentCache("book_metadata", db_path=cache.db_path, max_memory_entries=10)
+    assert restarted.get(service._cache_key("Clean Code", "Robert C. Martin", None, None, None, None, None, None, None)) == first
+    assert restarted.stats()["disk_hits"] == 1
+    restarted.close()
+    await service.aclose()
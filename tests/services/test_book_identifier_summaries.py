@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.book_identifier_service import BookIdentifierService
+from app.utils.persistent_cache import PersistentCache
+
+
+class SlowBedrock:
+    """Stand-in for BedrockAIClient counting its (blocking) calls."""
+
+    def __init__(self):
+        self.prompts = []
+        self.threads = set()
+
+    def ask(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        self.threads.add(threading.get_ident())
+        time.sleep(0.1)
+        return f"Summary for: {prompt}"
+
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    bedrock = SlowBedrock()
+    monkeypatch.setattr("app.services.book_identifier_service.bedrock_ai", bedrock)
+    return bedrock
+
+
+@pytest.fixture
+def service(tmp_path):
+    cache = PersistentCache("book_summaries", db_path=str(tmp_path / "cache.sqlite3"), max_memory_entries=10)
+    yield BookIdentifierService(summary_cache=cache)
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_call(bedrock, service):
+    results = await asyncio.gather(
+        service.describe_book(title="Clean Code", author="Robert C. Martin"),
+        service.describe_book(title="clean code ", author="ROBERT C. MARTIN"),
+        service.describe_book(title="Clean  Code", author="Robert C. Martin"),
+    )
+
+    assert len(bedrock.prompts) == 1
+    assert all(result == results[0] for result in results)
+    # The blocking call ran in a worker thread, not on the event loop
+    assert threading.get_ident() not in bedrock.threads
+
+
+@pytest.mark.asyncio
+async def test_summaries_are_cached_by_isbn(bedrock, service):
+    first = await service.describe_book(isbn="978-0132350884")
+    again = await service.describe_book(isbn="9780132350884")
+
+    assert again == first
+    assert len(bedrock.prompts) == 1
+    assert await service.describe_book() == {"error": "Provide a title, author, or ISBN"}
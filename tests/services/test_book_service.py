@@ -35,9 +35,8 @@ def mock_s3():
 
 @pytest.fixture
 def book_service(mock_table, mock_s3):
-    with patch("app.services.book_service.get_table", return_value=mock_table), \
-         patch("boto3.client", return_value=mock_s3):
-        service = BookService(table_name="books")
+    with patch("app.services.book_service.get_table", return_value=mock_table):
+        service = BookService(table_name="books", s3_client=mock_s3)
         service.bucket = "test-bucket"
         return service
 @pytest.mark.asyncio
@@ -0,0 +1,92 @@
+import asyncio
+from io import BytesIO
+import pandas as pd
+import pytest
+from app.utils.report_specs import VIP_CONFIG_PATH as CONFIG_PATH
+from app.services.chunked_journal_service import ChunkedJournalService
+from app.services.exemption_service import ExemptionService
+from app.services.incorrect_vip_service import IncorrectVIPService
+from app.services.overbooking_service import OverbookingService
+from app.utils.excel_upload_utils import load_hours_journal
+
+REQUIRED_COLUMNS = {"Entry No.", "Resource no.", "Work date", "VIP Code", "Hours worked", "Applies-To Entry"}
+
+
+@pytest.fixture
+def journal():
+    # Entry 7 reverses entry 2, which sits in another batch
+    df = pd.DataFrame({
+        "Entry No.": [1, 2, 3, 4, 5, 6, 7, 8],
+        "Resource no.": ["R1", "R1", "R1", "R2", "R2", "R1", "R1", "R2"],
+        "Work date": pd.to_datetime([
+            "2024-01-01", "2024-01-01", "2024-01-01", "2024-01-06",
+            "2024-01-06", "2024-01-01", "2024-01-01", "2024-01-02",
+        ]),
+        "VIP Code": [100, 100, 601, 601, 601, 100, 100, 801],
+        "Hours worked": [5.0, 2.0, 40.0, 3.0, 3.0, 4.0, -2.0, 40.0],
+        "Applies-To Entry": [None, None, None, None, None, None, 2, None],
+        "User Originator": ["A", "B", "A", "B", "B", "A", "A", "B"],
+    })
+    buffer = BytesIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def sort_rows(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.astype(str)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_chunked_reports_match_in_memory_reports(journal):
+    clean_df = asyncio.run(load_hours_journal(journal, REQUIRED_COLUMNS))
+    chunked = ChunkedJournalService(journal, REQUIRED_COLUMNS, batch_rows=3)
+
+    pd.testing.assert_frame_equal(
+        sort_rows(chunked.find_incorrect_vip(CONFIG_PATH)),
+        sort_rows(IncorrectVIPService(clean_df, CONFIG_PATH).find_incorrect_vip()),
+    )
+
+    duplicated, overbooked = chunked.find_overbooking()
+    service = OverbookingService(clean_df)
+    pd.testing.assert_frame_equal(sort_rows(duplicated), sort_rows(service.find_duplicates_overtime()))
+    pd.testing.assert_frame_equal(sort_rows(overbooked), sort_rows(service.find_overbooked_normal_daily()))
+    # R1 reaches 9 normal hours on Monday 1 Jan only once entry 6 is added
+    assert overbooked["Hours worked"].tolist() == [4.0]
+
+    pd.testing.assert_frame_equal(
+        sort_rows(chunked.get_exemption("week")),
+        sort_rows(ExemptionService(clean_df, "week").get_exemption()),
+    )
+
+
+def test_chunked_reports_on_empty_journal():
+    chunked = ChunkedJournalService(
+        b"Entry No.,Resource no.,Work date,VIP Code,Hours worked,Applies-To Entry,User Originator\n",
+        REQUIRED_COLUMNS,
+    )
+
+    duplicated, overbooked = chunked.find_overbooking()
+
+    assert duplicated.empty and overbooked.empty
+    assert chunked.get_exemption("week").empty
+
+
+@pytest.mark.parametrize("exemption_type, columns", [
+    ("week", ["Resource no.", "Week", "Exemption", "Excess"]),
+    ("month", ["Resource no.", "Month", "Exemption", "Excess"]),
+])
+def test_chunked_exemption_without_rows(exemption_type, columns, monkeypatch):
+    # Entry 2 reverses entry 1, leaving nothing to report on
+    chunked = ChunkedJournalService(
+        b"Entry No.,Resource no.,Work date,VIP Code,Hours worked,Applies-To Entry\n"
+        b"1,R1,2024-01-01,100,80,\n"
+        b"2,R1,2024-01-01,100,-80,1\n",
+        REQUIRED_COLUMNS,
+    )
+
+    exemption = chunked.get_exemption(exemption_type)
+    assert exemption.empty and list(exemption.columns) == columns
+
+    monkeypatch.setattr(chunked, "clean_batches", lambda: iter([]))
+    exemption = chunked.get_exemption(exemption_type)
+    assert exemption.empty and list(exemption.columns) == columns
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from app.services.dataset_service import CLOCKINGS, HOURS_JOURNAL, DatasetNotFoundError, DatasetService
+
+
+def journal_df():
+    return pd.DataFrame({
+        "Resource no.": pd.Series(["R1", "R1", "R2"], dtype="category"),
+        "User Originator": ["U1", "U2", "U1"],
+        "Work date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-01"]),
+        "Hours worked": [8.0, 4.5, 8.0],
+    })
+
+
+def test_create_and_read_dataset():
+    service = DatasetService(ttl_seconds=60, max_bytes=1024 * 1024)
+
+    metadata = service.create_dataset(journal_df(), HOURS_JOURNAL, owner="user-1")
+    df = service.get_frame(metadata["dataset_id"], owner="user-1")
+
+    assert metadata["rows"] == 3
+    assert metadata["kind"] == HOURS_JOURNAL
+    assert list(df["Work date"]) == list(pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-01"]))
+    # Categoricals survive the round trip; other strings come back as strings
+    assert isinstance(df["Resource no."].dtype, pd.CategoricalDtype)
+    assert list(df["Resource no."]) == ["R1", "R1", "R2"]
+    assert not isinstance(df["User Originator"].dtype, pd.CategoricalDtype)
+    assert list(df["User Originator"]) == ["U1", "U2", "U1"]
+
+
+def test_dataset_hidden_from_other_users():
+    service = DatasetService(ttl_seconds=60, max_bytes=1024 * 1024)
+    metadata = service.create_dataset(journal_df(), HOURS_JOURNAL, owner="user-1")
+
+    with pytest.raises(DatasetNotFoundError):
+        service.get_frame(metadata["dataset_id"], owner="user-2")
+
+
+def test_expired_dataset_is_removed(monkeypatch):
+    service = DatasetService(ttl_seconds=60, max_bytes=1024 * 1024)
+    metadata = service.create_dataset(journal_df(), CLOCKINGS, owner="user-1")
+
+    now = metadata["expires_at"] + 1
+    monkeypatch.setattr("app.services.dataset_service.time.time", lambda: now)
+
+    with pytest.raises(DatasetNotFoundError):
+        service.get_dataset(metadata["dataset_id"], owner="user-1")
+
+
+def test_oldest_dataset_evicted_past_budget():
+    size = DatasetService(ttl_seconds=60, max_bytes=1024 * 1024).create_dataset(
+        journal_df(), HOURS_JOURNAL, owner="user-1"
+    )["bytes"]
+    service = DatasetService(ttl_seconds=60, max_bytes=size * 2)
+
+    first = service.create_dataset(journal_df(), HOURS_JOURNAL, owner="user-1")
+    service.create_dataset(journal_df(), HOURS_JOURNAL, owner="user-1")
+    service.create_dataset(journal_df(), HOURS_JOURNAL, owner="user-1")
+
+    with pytest.raises(DatasetNotFoundError):
+        service.get_dataset(first["dataset_id"], owner="user-1")
@@ -25,6 +25,34 @@ def test_upload_excel_local(tmp_path, sample_sheets):
     assert file_path.endswith(".xlsx")
 
 
+def test_upload_excel_local_styles_and_formats(tmp_path):
+    from openpyxl import load_workbook
+
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+    sheets = {
+        "Overbooked": pd.DataFrame({
+            "Resource no.": pd.Categorical(["R1", "R200"]),
+            "Work date": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+            "week": pd.Series(pd.to_datetime(["2024-01-01", "2024-01-02"])).dt.to_period("W-SAT"),
+            "Hours worked": [8.75, None],
+        })
+    }
+
+    file_path = service.upload_excel(sheets, prefix="test_exports", filename_prefix="testfile")
+
+    worksheet = load_workbook(file_path)["Overbooked"]
+    header, first, second = list(worksheet.iter_rows())
+    assert [cell.value for cell in header] == ["Resource no.", "Work date", "week", "Hours worked"]
+    assert all(cell.font.b and cell.fill.fgColor.rgb.endswith("FFD700") for cell in header)
+    assert [cell.value for cell in first] == ["R1", pd.Timestamp("2024-01-01"), "2023-12-31/2024-01-06", 8.75]
+    assert first[1].number_format == "yyyy-mm-dd hh:mm:ss"
+    # Missing values are written as bordered blank cells
+    assert second[3].value is None and second[3].border.left.style == "thin"
+    # Widths fit the longest value or header, plus padding
+    assert worksheet.column_dimensions["A"].width == pytest.approx(len("Resource no.") + 2, abs=1)
+    assert worksheet.column_dimensions["C"].width == pytest.approx(len("2023-12-31/2024-01-06") + 2, abs=1)
+
+
 def test_upload_excel_empty_sheet_raises(tmp_path):
     service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
 
@@ -40,13 +68,11 @@ def test_upload_excel_no_sheets_raises(tmp_path):
         service.upload_excel({})
 
 
-@patch("boto3.client")
-def test_upload_excel_s3(mock_boto, sample_sheets):
+def test_upload_excel_s3(sample_sheets):
     # Mock S3 client
     mock_s3 = MagicMock()
-    mock_boto.return_value = mock_s3
 
-    service = ExcelExportService(storage_backend="s3", bucket_name="fake-bucket", region="us-east-1")
+    service = ExcelExportService(storage_backend="s3", bucket_name="fake-bucket", region="us-east-1", s3_client=mock_s3)
 
     key = service.upload_excel(sample_sheets, prefix="exports", filename_prefix="testfile")
 
@@ -56,19 +82,19 @@ def test_upload_excel_s3(mock_boto, sample_sheets):
     assert key.endswith(".xlsx")
 
 
-@patch("boto3.client")
-def test_generate_presigned_url_s3(mock_boto):
+def test_generate_presigned_url_s3():
     mock_s3 = MagicMock()
     mock_s3.generate_presigned_url.return_value = "http://fake-url"
-    mock_boto.return_value = mock_s3
 
-    service = ExcelExportService(storage_backend="s3", bucket_name="fake-bucket", region="us-east-1")
+    service = ExcelExportService(storage_backend="s3", bucket_name="fake-bucket", region="us-east-1", s3_client=mock_s3)
 
     url = service.generate_presigned_url("exports/test.xlsx")
     assert url == "http://fake-url"
 
 
-def test_generate_presigned_url_local(tmp_path):
+def test_generate_presigned_url_local(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "export_base_url", "https://api.example.com/")
+    monkeypatch.setattr("app.utils.export_tokens._signing_key", b"test-key")
     service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
 
     fake_file = tmp_path / "exports" / "test.xlsx"
@@ -76,5 +102,142 @@ def test_generate_presigned_url_local(tmp_path):
     fake_file.write_text("dummy")
 
     url = service.generate_presigned_url(str(fake_file))
-    assert url.startswith("file:///")
-    assert "test.xlsx" in url
+    assert url.startswith("https://api.example.com/exports/exports/test.xlsx?expires=")
+    assert "&signature=" in url
+
+
+def test_upload_csv_local_single_sheet(tmp_path, sample_sheets, monkeypatch):
+    # Small chunks so the header and several slices are written separately
+    monkeypatch.setattr("app.services.excel_export_service.EXPORT_CHUNK_ROWS", 1)
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+
+    file_path = service.upload_excel({"Sheet1": sample_sheets["Sheet1"]}, file_format="csv")
+
+    assert file_path.endswith(".csv")
+    assert Path(file_path).read_text() == "A,B\n1,3\n2,4\n"
+
+
+def test_upload_parquet_local_multiple_sheets_zipped(tmp_path, sample_sheets):
+    import zipfile
+
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+    sample_sheets["Sheet2"]["week"] = pd.Series(pd.to_datetime(["2024-01-01", "2024-01-02"])).dt.to_period("W-SAT")
+
+    file_path = service.upload_excel(sample_sheets, file_format="parquet")
+
+    assert file_path.endswith(".zip")
+    with zipfile.ZipFile(file_path) as archive:
+        assert archive.namelist() == ["Sheet1.parquet", "Sheet2.parquet"]
+        sheet2 = pd.read_parquet(archive.open("Sheet2.parquet"))
+    assert sheet2["week"].tolist() == ["2023-12-31/2024-01-06"] * 2
+
+
+def test_upload_excel_splits_long_sheets(tmp_path, monkeypatch):
+    from openpyxl import load_workbook
+
+    monkeypatch.setattr(settings, "excel_max_sheet_rows", 2)
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+
+    file_path = service.upload_excel({"Attendance": pd.DataFrame({"A": [1, 2, 3, 4, 5]})})
+
+    workbook = load_workbook(file_path)
+    assert workbook.sheetnames == ["Attendance (1)", "Attendance (2)", "Attendance (3)"]
+    assert [[cell.value for cell in row] for row in workbook["Attendance (3)"].iter_rows()] == [["A"], [5]]
+
+
+def test_upload_excel_splits_into_zipped_workbooks(tmp_path, monkeypatch):
+    import zipfile
+    from openpyxl import load_workbook
+
+    monkeypatch.setattr(settings, "excel_max_sheet_rows", 2)
+    monkeypatch.setattr(settings, "excel_max_workbook_rows", 3)
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+
+    file_path = service.upload_excel({
+        "Lookup": pd.DataFrame({"A": [1, 2, 3, 4]}),
+        "Summary": pd.DataFrame({"B": ["x"]}),
+    })
+
+    assert file_path.endswith(".zip")
+    with zipfile.ZipFile(file_path) as archive:
+        assert archive.namelist() == ["part-1.xlsx", "part-2.xlsx"]
+        first = load_workbook(archive.open("part-1.xlsx"))
+        second = load_workbook(archive.open("part-2.xlsx"))
+    assert first.sheetnames == ["Lookup (1)"]
+    assert second.sheetnames == ["Lookup (2)", "Summary"]
+    assert [row[0].value for row in second["Lookup (2)"].iter_rows()] == ["A", 3, 4]
+
+
+def test_upload_ndjson_local(tmp_path):
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+    sheets = {"Rows": pd.DataFrame({"Date": pd.to_datetime(["2024-01-01"]), "Hours": [None]})}
+
+    file_path = service.upload_excel(sheets, file_format="ndjson")
+
+    assert Path(file_path).read_text() == '{"Date":"2024-01-01T00:00:00.000","Hours":null}\n'
+
+
+def test_upload_unsupported_format_raises(tmp_path, sample_sheets):
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        service.upload_excel(sample_sheets, file_format="zip")
+
+
+def test_identical_exports_are_stored_once(tmp_path, sample_sheets):
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+
+    first = service.upload_excel(sample_sheets, prefix="dedup", filename_prefix="report", user_id="u1")
+    with patch.object(ExcelExportService, "_write_export") as mock_write:
+        second = service.upload_excel(sample_sheets, prefix="dedup", filename_prefix="report", user_id="u1")
+
+    assert second == first
+    mock_write.assert_not_called()
+
+    # Different contents or options produce a different export
+    changed = {**sample_sheets, "Sheet1": sample_sheets["Sheet1"].assign(A=[1, 5])}
+    assert service.upload_excel(changed, prefix="dedup", filename_prefix="report", user_id="u1") != first
+    assert service.upload_excel(sample_sheets, prefix="dedup", filename_prefix="report", user_id="u1", file_format="csv") != first
+    assert list(Path(first).parent.glob("*.part")) == []
+
+
+def test_existing_s3_export_is_not_uploaded_again(sample_sheets):
+    from botocore.exceptions import ClientError
+
+    mock_s3 = MagicMock()
+    mock_s3.head_object.side_effect = [ClientError({"Error": {"Code": "404"}}, "HeadObject"), {}]
+
+    first = ExcelExportService(storage_backend="s3", bucket_name="fake-bucket", s3_client=mock_s3).upload_excel(
+        sample_sheets, prefix="exports", filename_prefix="uncached", user_id="u2"
+    )
+    assert mock_s3.put_object.call_count == 1
+
+    # A fresh process has an empty index and finds the object with HEAD
+    from app.utils.export_index import export_index
+    export_index.discard(first)
+    second = ExcelExportService(storage_backend="s3", bucket_name="fake-bucket", s3_client=mock_s3).upload_excel(
+        sample_sheets, prefix="exports", filename_prefix="uncached", user_id="u2"
+    )
+
+    assert second == first
+    assert mock_s3.put_object.call_count == 1
+    assert mock_s3.head_object.call_count == 2
+
+
+def test_upload_excel_writes_rows_across_chunks(tmp_path, monkeypatch):
+    from openpyxl import load_workbook
+    from app.services import excel_export_service
+
+    monkeypatch.setattr(excel_export_service, "EXPORT_CHUNK_ROWS", 2)
+    service = ExcelExportService(storage_backend="local", local_export_dir=tmp_path)
+    df = pd.DataFrame({
+        "Day": pd.to_datetime(["2024-01-01", None, "2024-01-03", "2024-01-04", "2024-01-05"]),
+        "Week": pd.Series(pd.to_datetime(["2024-01-01"] * 5)).dt.to_period("W-SAT"),
+    })
+
+    file_path = service.upload_excel({"Rows": df})
+
+    rows = [[cell.value for cell in row] for row in load_workbook(file_path)["Rows"].iter_rows()]
+    assert len(rows) == 6
+    assert rows[2] == [None, "2023-12-31/2024-01-06"]
+    assert rows[5][0].day == 5
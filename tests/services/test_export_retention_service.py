@@ -0,0 +1,48 @@
+import os
+import time
+from app.services.export_retention_service import ExportRetentionService, touch_export
+
+
+def write_export(path, size: int, last_used: float):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (last_used, last_used))
+    return path
+
+
+def test_sweep_evicts_old_then_least_recently_used(tmp_path):
+    now = time.time()
+    stale = write_export(tmp_path / "u1" / "reports" / "stale.xlsx", 10, now - 7200)
+    oldest = write_export(tmp_path / "u1" / "reports" / "oldest.xlsx", 40, now - 300)
+    downloaded = write_export(tmp_path / "u2" / "reports" / "downloaded.xlsx", 40, now - 600)
+    newest = write_export(tmp_path / "u2" / "reports" / "newest.xlsx", 40, now - 60)
+    signing_key = write_export(tmp_path / ".signing-key", 10, now - 7200)
+    touch_export(downloaded)
+
+    service = ExportRetentionService(max_bytes=100, max_age_seconds=3600, export_dir=str(tmp_path))
+    service.sweep()
+
+    assert not stale.exists()
+    assert not oldest.exists()
+    assert downloaded.exists() and newest.exists() and signing_key.exists()
+    # The download left the modification time, and so the ETag, unchanged
+    assert downloaded.stat().st_mtime == now - 600
+
+    stats = service.stats()
+    assert stats["files"] == 2
+    assert stats["bytes"] == 80
+    assert stats["evicted_files"] == 2
+    assert stats["evicted_bytes"] == 50
+
+
+def test_sweep_removes_stale_partial_files(tmp_path):
+    now = time.time()
+    stale_part = write_export(tmp_path / "u1" / "report.xlsx.abc.part", 10, now - 7200)
+    fresh_part = write_export(tmp_path / "u1" / "report.xlsx.def.part", 10, now)
+
+    service = ExportRetentionService(max_bytes=100, max_age_seconds=3600, export_dir=str(tmp_path))
+    service.sweep()
+
+    assert not stale_part.exists()
+    assert fresh_part.exists()
+    assert service.stats()["files"] == 0
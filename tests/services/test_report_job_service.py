@@ -0,0 +1,103 @@
+import time
+import pandas as pd
+import pytest
+from pathlib import Path
+from app.services.report_job_service import (
+    FAILED,
+    SUCCEEDED,
+    JobNotFoundError,
+    ReportJobService,
+    run_report_job,
+)
+from app.utils.process_pool import RemoteHTTPError
+from app.utils.upload_spool import SpooledUpload
+
+CLOCKINGS_CSV = b"Clock No.,Date,MeterID\n1,2024-01-01 07:00,M1\n2,2024-01-01 07:05,M1\n1,2024-01-02 07:00,M2\n"
+
+
+@pytest.fixture
+def local_exports(tmp_path, monkeypatch):
+    # Exports are written under the working directory, which worker processes inherit
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def spooled(tmp_path, name: str, data: bytes) -> SpooledUpload:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return SpooledUpload(open(path, "rb"), len(data), name)
+
+
+def test_run_report_job_times_each_stage(local_exports):
+    input_path = local_exports / "input.csv"
+    input_path.write_bytes(CLOCKINGS_CSV)
+
+    result = run_report_job("job-1", "device-clockings", str(input_path), False, "u1", {"format": "csv"})
+
+    assert set(result["stages"]) == {"parse", "report", "export"}
+    assert result["sheets"] == {"Device report": 2}
+    assert Path(result["key"]).exists()
+    assert result["key"].endswith(".csv")
+
+
+def test_run_report_job_missing_column_raises(local_exports):
+    input_path = local_exports / "input.csv"
+    input_path.write_bytes(b"Clock No.,Date\n1,2024-01-01\n")
+
+    with pytest.raises(RemoteHTTPError, match="MeterID") as error:
+        run_report_job("job-1", "device-clockings", str(input_path), False, "u1", {})
+
+    assert error.value.status_code == 400
+
+
+def test_jobs_run_in_worker_processes(local_exports):
+    service = ReportJobService(max_workers=2, ttl_seconds=60)
+    try:
+        done = service.submit("device-clockings", owner="u1", contents=spooled(local_exports, "ok.csv", CLOCKINGS_CSV))
+        failed = service.submit("device-clockings", owner="u1", contents=spooled(local_exports, "bad.csv", b"Clock No.,Date\n1,2024-01-01\n"))
+        assert done["status"] == "queued"
+
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            statuses = [service.get_job(job["job_id"], owner="u1") for job in (done, failed)]
+            if all(status["finished_at"] for status in statuses):
+                break
+            time.sleep(0.2)
+    finally:
+        service.shutdown()
+
+    done_status, failed_status = statuses
+    assert done_status["status"] == SUCCEEDED
+    assert done_status["sheets"] == {"Device report": 2}
+    assert ".xlsx?expires=" in done_status["download_url"]
+    assert set(done_status["stages"]) == {"parse", "report", "export"}
+
+    assert failed_status["status"] == FAILED
+    assert "MeterID" in failed_status["error"]
+
+    # Jobs are private to their owner
+    with pytest.raises(JobNotFoundError):
+        service.get_job(done["job_id"], owner="someone-else")
+
+
+def test_submit_unknown_report_raises(local_exports):
+    service = ReportJobService(max_workers=1)
+
+    with pytest.raises(ValueError, match="Unknown report"):
+        service.submit("nope", owner="u1", dataset_frame=pd.DataFrame({"Date": []}))
+
+
+def test_split_exports_are_written_by_the_report_process_pool(part_pool, tmp_path):
+    service = ReportJobService(max_workers=1, ttl_seconds=60)
+    try:
+        job = service.submit("device-clockings", owner="u1", contents=spooled(tmp_path, "in.csv", CLOCKINGS_CSV))
+        deadline = time.time() + 60
+        while not (status := service.get_job(job["job_id"], owner="u1"))["finished_at"] and time.time() < deadline:
+            time.sleep(0.2)
+    finally:
+        service.shutdown()
+
+    assert status["status"] == SUCCEEDED
+    assert ".zip?expires=" in status["download_url"]
+    assert set(status["stages"]) == {"parse", "report", "export"}
+    assert len(list(part_pool.iterdir())) == 2
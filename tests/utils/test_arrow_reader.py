@@ -0,0 +1,68 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from io import BytesIO
+from pyarrow import feather, ipc
+from starlette.datastructures import UploadFile
+
+from app.utils.arrow_reader import read_arrow_columns, read_arrow_header
+from app.utils.file_formats import ARROW_FILE, ARROW_STREAM, PARQUET, detect_format
+from app.utils.upload_spool import spool_upload
+
+
+@pytest.fixture
+def journal_df():
+    return pd.DataFrame({
+        "Entry No.": [1, 2, 3],
+        "VIP Code": [100, 601, 100],
+        "Hours worked": [8.75, 2.0, -8.75],
+    })
+
+
+def to_parquet(df: pd.DataFrame) -> bytes:
+    buffer = BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def to_feather(df: pd.DataFrame) -> bytes:
+    buffer = BytesIO()
+    feather.write_feather(df, buffer, compression="uncompressed")
+    return buffer.getvalue()
+
+
+def to_arrow_stream(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = BytesIO()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+@pytest.mark.parametrize(
+    "writer,expected_format",
+    [(to_parquet, PARQUET), (to_feather, ARROW_FILE), (to_arrow_stream, ARROW_STREAM)],
+)
+def test_detect_and_read_projected(journal_df, writer, expected_format):
+    contents = writer(journal_df)
+
+    assert detect_format(contents) == expected_format
+    assert read_arrow_header(contents, expected_format) == ["Entry No.", "VIP Code", "Hours worked"]
+
+    df = read_arrow_columns(contents, expected_format, {"Hours worked", "Entry No."})
+
+    assert list(df.columns) == ["Entry No.", "Hours worked"]
+    assert df["Hours worked"].tolist() == [8.75, 2.0, -8.75]
+
+
+@pytest.mark.asyncio
+async def test_read_feather_from_spooled_upload(journal_df):
+    contents = await spool_upload(
+        UploadFile(BytesIO(to_feather(journal_df)), filename="journal.feather"), max_size=1024 * 1024
+    )
+
+    df = read_arrow_columns(contents, ARROW_FILE)
+
+    # The frame may still reference the mapping; closing must not fail
+    contents.close()
+    pd.testing.assert_frame_equal(df, journal_df)
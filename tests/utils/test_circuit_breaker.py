@@ -0,0 +1,25 @@
+import time
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_opens_after_threshold_and_allows_one_trial():
+    breaker = CircuitBreaker("provider", failure_threshold=2, reset_timeout_seconds=0.05)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+
+    # A failed trial reopens the circuit, a successful one closes it
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from app.utils.csv_reader import read_csv_columns, read_csv_header
+
+
+def test_read_csv_header_strips_bom():
+    assert read_csv_header(b"\xef\xbb\xbfEntry No.,VIP Code\n1,100\n") == ["Entry No.", "VIP Code"]
+
+
+def test_read_csv_columns_all():
+    contents = b"Entry No.,Hours worked,Applies-To Entry\n1,8.75,\n2,-8.75,1\n"
+
+    df = read_csv_columns(contents)
+
+    assert list(df.columns) == ["Entry No.", "Hours worked", "Applies-To Entry"]
+    assert df["Hours worked"].tolist() == [8.75, -8.75]
+    assert df["Applies-To Entry"].isna().tolist() == [True, False]
+
+
+def test_read_csv_columns_projected_keeps_file_order():
+    contents = b"A,B,C\n1,x,3\n2,y,4\n"
+
+    df = read_csv_columns(contents, {"C", "A"})
+
+    assert list(df.columns) == ["A", "C"]
+    pd.testing.assert_series_equal(df["C"], pd.Series([3, 4], name="C"))
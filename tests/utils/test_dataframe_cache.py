@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from app.utils.dataframe_cache import DataFrameCache, dataframe_cache, upload_digest
+from app.utils.excel_upload_utils import load_hours_journal
+
+
+def frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"value": range(rows)}, dtype="int64")
+
+
+def frame_size(rows: int) -> int:
+    return int(frame(rows).memory_usage(index=True, deep=True).sum())
+
+
+def test_get_returns_independent_copy():
+    cache = DataFrameCache(max_bytes=1024 * 1024)
+    cache.put("key", frame(3))
+
+    first = cache.get("key")
+    first.loc[0, "value"] = 100
+
+    assert cache.get("key")["value"].tolist() == [0, 1, 2]
+    assert cache.stats()["hits"] == 2
+
+
+def test_miss_is_counted():
+    cache = DataFrameCache(max_bytes=1024 * 1024)
+
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_frame_is_evicted():
+    cache = DataFrameCache(max_bytes=frame_size(100) * 2)
+    cache.put("a", frame(100))
+    cache.put("b", frame(100))
+    cache.get("a")
+
+    cache.put("c", frame(100))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+def test_frame_larger_than_budget_is_not_cached():
+    cache = DataFrameCache(max_bytes=frame_size(10))
+
+    cache.put("big", frame(1000))
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_upload_digest_is_content_addressed():
+    assert upload_digest(b"journal") == upload_digest(bytearray(b"journal"))
+    assert upload_digest(b"journal") != upload_digest(b"journal2")
+
+
+@pytest.mark.asyncio
+async def test_load_hours_journal_parses_once():
+    dataframe_cache.clear()
+    contents = (
+        b"Entry No.,Resource no.,VIP Code,Hours worked,Applies-To Entry\n"
+        b"1,R1,100,8,\n"
+        b"2,R1,100,-8,1\n"
+        b"3,R2,100,5,\n"
+    )
+    required = {"Entry No.", "Resource no.", "VIP Code", "Hours worked", "Applies-To Entry"}
+
+    first = await load_hours_journal(contents, required)
+    hits_before = dataframe_cache.stats()["hits"]
+    second = await load_hours_journal(contents, required)
+
+    assert dataframe_cache.stats()["hits"] == hits_before + 1
+    assert first["Entry No."].tolist() == [3]
+    pd.testing.assert_frame_equal(first, second)
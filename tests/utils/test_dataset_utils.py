@@ -0,0 +1,49 @@
+import pytest
+import pandas as pd
+from fastapi import HTTPException
+
+from app.services.dataset_service import CLOCKINGS, HOURS_JOURNAL, dataset_service
+from app.utils.dataset_utils import load_report_frame
+
+
+@pytest.mark.asyncio
+async def test_load_report_frame_from_dataset():
+    df = pd.DataFrame({
+        "Clock No.": [101, 102],
+        "Date": ["2024-01-01", "2024-01-02"],
+        "WTT": ["SiteA", "SiteB"],
+    })
+    dataset_id = dataset_service.create_dataset(df, CLOCKINGS, owner="user-1")["dataset_id"]
+
+    result = await load_report_frame(
+        None,
+        dataset_id,
+        owner="user-1",
+        kind=CLOCKINGS,
+        required_columns={"Date", "WTT"},
+        optional_columns=set(),
+    )
+
+    assert list(result.columns) == ["Date", "WTT"]
+    assert len(result) == 2
+
+    # A clocking dataset cannot feed an hours-journal report
+    with pytest.raises(HTTPException) as exc:
+        await load_report_frame(None, dataset_id, owner="user-1", kind=HOURS_JOURNAL, required_columns=set())
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_load_report_frame_unknown_dataset():
+    with pytest.raises(HTTPException) as exc:
+        await load_report_frame(None, "missing", owner="user-1", kind=CLOCKINGS, required_columns=set())
+
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_load_report_frame_requires_input():
+    with pytest.raises(HTTPException) as exc:
+        await load_report_frame(None, None, owner="user-1", kind=CLOCKINGS, required_columns=set())
+
+    assert exc.value.status_code == 400
@@ -51,3 +51,12 @@ async def test_load_excel_file_invalid_excel():
         await load_excel_file(contents, required_columns)
 
     assert exc.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_load_excel_file_csv():
+    contents = b"name,age,city\nAlice,30,Durban\nBob,25,Pretoria\n"
+
+    result = await load_excel_file(contents, {"name", "age"}, optional_columns=set())
+
+    assert list(result.columns) == ["name", "age"]
+    assert result["age"].tolist() == [30, 25]
@@ -0,0 +1,31 @@
+import time
+from app.utils.persistent_cache import PersistentCache
+
+
+def test_entries_expire_and_memory_tier_is_bounded(tmp_path):
+    cache = PersistentCache("books", db_path=str(tmp_path / "cache.sqlite3"), max_memory_entries=1)
+    cache.set("short", {"v": 1}, ttl_seconds=0.05)
+    cache.set("long", {"v": 2}, ttl_seconds=60)
+
+    assert cache.get("long") == {"v": 2}
+    # Only one entry fits in memory; the other is read back from disk
+    assert cache.get("short") == {"v": 1}
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["disk_hits"] == 1
+
+    time.sleep(0.06)
+    assert cache.get("short") is None
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 2
+    cache.close()
+
+
+def test_hits_return_copies(tmp_path):
+    cache = PersistentCache("books", db_path=str(tmp_path / "cache.sqlite3"), max_memory_entries=1)
+    value = {"authors": ["A"]}
+    cache.set("isbn", value, ttl_seconds=60)
+    value["authors"].append("B")
+
+    cache.get("isbn")["authors"].append("C")
+
+    assert cache.get("isbn") == {"authors": ["A"]}
+    cache.close()
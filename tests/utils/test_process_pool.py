@@ -0,0 +1,121 @@
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from app.services.device_service import DeviceService
+from app.utils.excel_upload_utils import check_required_columns, read_upload_frame
+from app.utils.process_pool import ProcessPool, SharedFrame, SharedFrameSpaceError, _share, call_service
+from app.utils.upload_spool import SpooledUpload
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ProcessPool(max_workers=1)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_shared_frame_round_trip_keeps_dtypes():
+    df = pd.DataFrame(
+        {
+            "Entry No.": pd.array([1, None], dtype="Int32"),
+            "Resource no.": pd.Categorical(["R1", "R2"]),
+            "Work date": pd.to_datetime(["2024-01-01", "2024-01-02"]).astype("datetime64[s]"),
+            "Hours worked": [8.0, None],
+        },
+        index=pd.Index(["a", "b"], name="key"),
+    )
+
+    frame = SharedFrame.create(df)
+    try:
+        loaded = frame.load()
+    finally:
+        frame.remove()
+
+    pd.testing.assert_frame_equal(loaded, df)
+
+
+def test_frames_that_do_not_fit_are_pickled(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.settings.settings.shared_frame_dir", str(tmp_path))
+    df = pd.DataFrame({"A": range(1000)})
+
+    class FullStat:
+        f_bavail = 1
+        f_frsize = 4096
+
+    monkeypatch.setattr("app.utils.process_pool.os.statvfs", lambda path: FullStat())
+    with pytest.raises(SharedFrameSpaceError):
+        SharedFrame.create(df)
+
+    created = []
+    assert _share([df], created)[0] is df
+    assert created == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_call_service_calls_each_method():
+    class Service:
+        def __init__(self, value):
+            self.value = value
+
+        def double(self):
+            return self.value * 2
+
+        def add(self, other):
+            return self.value + other
+
+    assert call_service(Service, "double", args=(2,)) == 4
+    assert call_service(Service, "double", ("add", 3), kwargs={"value": 1}) == (2, 4)
+
+
+@pytest.mark.asyncio
+async def test_run_inline_when_not_started():
+    pool = ProcessPool(max_workers=1)
+
+    assert await pool.run(len, [1, 2, 3]) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_service_in_worker(pool):
+    df = pd.DataFrame({
+        "MeterID": pd.Categorical(["M1", "M1", "M2"]),
+        "Date": pd.to_datetime(["2024-01-01 07:00", "2024-01-01 08:00", "2024-01-01 07:00"]),
+        "Clock No.": ["1", "2", "1"],
+    })
+
+    result = await pool.run_service(DeviceService, "unique_clocks_per_meter_per_day", args=(df,))
+
+    expected = DeviceService(df).unique_clocks_per_meter_per_day()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.asyncio
+async def test_spooled_upload_is_passed_by_path(pool, tmp_path):
+    path = tmp_path / "upload.csv"
+    path.write_bytes(b"A,B\n1,x\n")
+    contents = SpooledUpload(open(path, "rb"), path.stat().st_size, "upload.csv")
+
+    df = await pool.run(read_upload_frame, contents)
+
+    assert df.to_dict(orient="list") == {"A": [1], "B": ["x"]}
+
+
+@pytest.mark.asyncio
+async def test_http_errors_are_raised_in_api_process(pool):
+    with pytest.raises(HTTPException) as error:
+        await pool.run(check_required_columns, pd.DataFrame({"A": [1]}), {"B"})
+
+    assert error.value.status_code == 400
+    assert "B" in error.value.detail
+
+
+def test_map_yields_results_in_order(pool, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.settings.settings.shared_frame_dir", str(tmp_path))
+    frames = (pd.DataFrame({"A": range(size)}) for size in (3, 1, 2))
+
+    assert list(pool.map(len, ((df,) for df in frames))) == [3, 1, 2]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_map_inline_when_not_started():
+    assert list(ProcessPool(max_workers=1).map(len, [([1],), ([1, 2],)])) == [1, 2]
@@ -0,0 +1,45 @@
+import pytest
+import pandas as pd
+from fastapi import HTTPException
+
+from app.utils.report_schemas import HOURS_JOURNAL_SCHEMA, apply_schema
+
+
+def test_apply_schema_converts_journal_columns():
+    df = pd.DataFrame({
+        "Entry No.": [1, 2, 3],
+        "Applies-To Entry": [None, 1, None],
+        "Resource no.": ["R1", "R1", "R2"],
+        "Work date": ["2024-01-01 08:00", "2024-01-01 17:30", "2024-01-02 09:00"],
+        "VIP Code": ["100", "100", "601"],
+        "Hours worked": ["8", "-8", "x"],
+        "Comment": ["a", "b", "c"],
+    })
+
+    result = apply_schema(df, HOURS_JOURNAL_SCHEMA)
+
+    assert result["Entry No."].dtype == "Int32"
+    assert result["Applies-To Entry"].isna().tolist() == [True, False, True]
+    assert result["VIP Code"].dtype == "Int16"
+    assert isinstance(result["Resource no."].dtype, pd.CategoricalDtype)
+    assert result["Work date"].dtype == "datetime64[s]"
+    assert list(result["Work date"].dt.hour) == [0, 0, 0]
+    assert result["Hours worked"].isna().tolist() == [False, False, True]
+    # Columns outside the schema are untouched
+    assert list(result["Comment"]) == ["a", "b", "c"]
+
+
+def test_apply_schema_skips_typed_frames():
+    df = apply_schema(pd.DataFrame({"VIP Code": [100, 601]}), HOURS_JOURNAL_SCHEMA)
+
+    assert apply_schema(df, HOURS_JOURNAL_SCHEMA) is df
+
+
+def test_apply_schema_rejects_unconvertible_column():
+    df = pd.DataFrame({"VIP Code": [100.5]})
+
+    with pytest.raises(HTTPException) as exc:
+        apply_schema(df, HOURS_JOURNAL_SCHEMA)
+
+    assert exc.value.status_code == 400
+    assert "VIP Code" in exc.value.detail
@@ -0,0 +1,102 @@
+import threading
+from io import BytesIO
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+from openpyxl import load_workbook
+
+from app.services.excel_export_service import ExcelExportService
+from app.utils import s3_multipart_writer
+from app.utils.s3_multipart_writer import S3MultipartWriter
+
+
+class FakeS3:
+    """In-memory stand-in for the S3 client calls used by the writer."""
+
+    def __init__(self, fail_part: int = None):
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.fail_part = fail_part
+        self._lock = threading.Lock()
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[(Bucket, Key)] = Body
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_part:
+            raise ConnectionError("part upload failed")
+        with self._lock:
+            self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(parts)
+        self.objects[(Bucket, Key)] = b"".join(parts[number] for number in numbers)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+        self.aborted.append(UploadId)
+
+
+@pytest.fixture
+def small_parts(monkeypatch):
+    monkeypatch.setattr(s3_multipart_writer, "MIN_PART_SIZE", 1024)
+
+
+def test_writer_uploads_parts_in_order(small_parts):
+    s3 = FakeS3()
+    data = bytes(range(256)) * 40
+
+    with S3MultipartWriter(s3, "bucket", "key", part_size=1024, max_workers=3) as writer:
+        for start in range(0, len(data), 300):
+            writer.write(data[start:start + 300])
+
+    assert s3.objects[("bucket", "key")] == data
+    assert not s3.uploads
+
+
+def test_small_object_uses_put_object():
+    s3 = FakeS3()
+
+    with S3MultipartWriter(s3, "bucket", "key") as writer:
+        writer.write(b"small")
+
+    assert s3.objects[("bucket", "key")] == b"small"
+
+
+def test_failed_part_aborts_upload(small_parts):
+    s3 = FakeS3(fail_part=2)
+
+    with pytest.raises(ConnectionError):
+        with S3MultipartWriter(s3, "bucket", "key", part_size=1024) as writer:
+            writer.write(b"x" * 5000)
+
+    assert s3.aborted == ["upload-1"]
+    assert ("bucket", "key") not in s3.objects
+
+
+def test_excel_export_streams_workbook_to_s3(small_parts, monkeypatch):
+    s3 = FakeS3()
+    monkeypatch.setattr("app.services.excel_export_service.settings.bucket_name", "bucket")
+    monkeypatch.setattr("app.utils.s3_multipart_writer.settings.s3_multipart_part_size", 1024)
+
+    service = ExcelExportService(storage_backend="s3", s3_client=s3)
+    df = pd.DataFrame({"Resource no.": [f"R{i}" for i in range(2000)], "Hours worked": range(2000)})
+
+    key = service.upload_excel({"Report": df}, prefix="exports", filename_prefix="report", user_id="user-1")
+
+    workbook = load_workbook(BytesIO(s3.objects[("bucket", key)]))
+    assert workbook["Report"].max_row == 2001
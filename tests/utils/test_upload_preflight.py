@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+from io import BytesIO
+from fastapi import HTTPException
+from openpyxl import Workbook
+
+from app.utils.upload_preflight import read_header, validate_required_columns
+
+
+def create_excel_file(df: pd.DataFrame) -> bytes:
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False, engine="openpyxl")
+    return buffer.getvalue()
+
+
+def test_read_header_xlsx():
+    contents = create_excel_file(pd.DataFrame({
+        "Entry No.": [1],
+        "Hours worked": [8.75],
+        2024: ["numeric header"],
+    }))
+
+    assert read_header(contents) == ["Entry No.", "Hours worked", "2024"]
+
+
+def test_read_header_xlsx_shared_strings(tmp_path):
+    # Workbooks saved by Excel store header text in the shared strings table
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append(["Entry No.", None, "VIP Code"])
+    worksheet.append([1, 2, 100])
+    path = tmp_path / "journal.xlsx"
+    workbook.save(path)
+
+    assert read_header(path.read_bytes()) == ["Entry No.", "Unnamed: 1", "VIP Code"]
+
+
+def test_read_header_csv():
+    contents = b'\xef\xbb\xbf"Entry No.",VIP Code,Hours worked\r\n1,100,8.75\r\n'
+
+    assert read_header(contents) == ["Entry No.", "VIP Code", "Hours worked"]
+
+
+def test_validate_required_columns_missing():
+    contents = b"Entry No.,Hours worked\n1,8\n"
+
+    with pytest.raises(HTTPException) as exc:
+        validate_required_columns(contents, {"Entry No.", "Applies-To Entry"})
+
+    assert exc.value.status_code == 400
+    assert "Applies-To Entry" in exc.value.detail
+
+
+def test_validate_required_columns_corrupt_workbook():
+    with pytest.raises(HTTPException) as exc:
+        validate_required_columns(b"PK\x03\x04broken", {"Entry No."})
+
+    assert exc.value.status_code == 400
@@ -0,0 +1,74 @@
+import os
+import pytest
+from io import BytesIO
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from app.utils.upload_spool import as_buffer, as_stream, spool_upload
+
+
+class CountingStream(BytesIO):
+    """BytesIO that records how many bytes were read from it."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+@pytest.mark.asyncio
+async def test_spool_upload_maps_file():
+    data = b"Entry No.,Hours worked\n1,8\n"
+    upload = UploadFile(BytesIO(data), filename="journal.csv")
+
+    contents = await spool_upload(upload, max_size=1024, chunk_size=4)
+    try:
+        assert len(contents) == len(data)
+        assert as_buffer(contents)[:9] == b"Entry No."
+        with as_stream(contents) as stream:
+            assert stream.read() == data
+        path = contents.path
+        assert os.path.exists(path)
+    finally:
+        contents.close()
+
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_spool_upload_aborts_past_limit():
+    stream = CountingStream(b"x" * 10_000)
+    upload = UploadFile(stream, filename="big.xlsx")
+
+    with pytest.raises(HTTPException) as exc:
+        await spool_upload(upload, max_size=1000, chunk_size=256)
+
+    assert exc.value.status_code == 400
+    assert "too large" in exc.value.detail
+    # Reading stopped at the first chunk past the limit
+    assert stream.bytes_read == 1024
+
+
+@pytest.mark.asyncio
+async def test_spool_upload_rejects_known_size_without_reading():
+    stream = CountingStream(b"x" * 10_000)
+    upload = UploadFile(stream, filename="big.xlsx", size=10_000)
+
+    with pytest.raises(HTTPException):
+        await spool_upload(upload, max_size=1000)
+
+    assert stream.bytes_read == 0
+
+
+@pytest.mark.asyncio
+async def test_spool_upload_rejects_empty_file():
+    upload = UploadFile(BytesIO(b""), filename="empty.csv")
+
+    with pytest.raises(HTTPException) as exc:
+        await spool_upload(upload, max_size=1000)
+
+    assert "empty" in exc.value.detail
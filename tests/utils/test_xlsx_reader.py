@@ -0,0 +1,76 @@
+import pandas as pd
+from io import BytesIO
+
+from app.utils.xlsx_reader import iter_xlsx_batches, read_xlsx_columns
+
+
+def create_excel_file(df: pd.DataFrame) -> bytes:
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False, engine="openpyxl")
+    return buffer.getvalue()
+
+
+def test_read_all_columns():
+    contents = create_excel_file(pd.DataFrame({
+        "Entry No.": [1, 2],
+        "VIP Code": [100, 601],
+        "Hours worked": [8.75, -8.75],
+    }))
+
+    df = read_xlsx_columns(contents)
+
+    assert list(df.columns) == ["Entry No.", "VIP Code", "Hours worked"]
+    assert df["Entry No."].tolist() == [1, 2]
+    assert df["Hours worked"].tolist() == [8.75, -8.75]
+
+
+def test_read_projected_columns_keeps_workbook_order():
+    contents = create_excel_file(pd.DataFrame({
+        "A": [1, 2],
+        "B": ["x", "y"],
+        "C": [3.5, 4.5],
+    }))
+
+    df = read_xlsx_columns(contents, {"C", "A", "not-in-file"})
+
+    assert list(df.columns) == ["A", "C"]
+    assert df["C"].tolist() == [3.5, 4.5]
+
+
+def test_blank_cells_are_null():
+    contents = create_excel_file(pd.DataFrame({
+        "Entry No.": [1, 2, 3],
+        "Applies-To Entry": [None, 1, None],
+    }))
+
+    df = read_xlsx_columns(contents)
+
+    assert df["Applies-To Entry"].isna().tolist() == [True, False, True]
+    assert len(df) == 3
+
+
+def test_header_only_workbook():
+    contents = create_excel_file(pd.DataFrame(columns=["A", "B"]))
+
+    df = read_xlsx_columns(contents)
+
+    assert list(df.columns) == ["A", "B"]
+    assert df.empty
+
+
+def test_iter_batches_matches_full_read():
+    contents = create_excel_file(pd.DataFrame({
+        "Entry No.": [1, 2, None, 4, 5, None, None],
+        "VIP Code": [100, 601, None, 100, 801, None, None],
+        "Comment": ["a", "b", "c", "d", "e", "f", "g"],
+    }))
+
+    batches = list(iter_xlsx_batches(contents, {"Entry No.", "VIP Code"}, batch_rows=2))
+
+    # The inner blank row is kept, trailing blank rows are dropped
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    pd.testing.assert_frame_equal(
+        pd.concat(batches, ignore_index=True),
+        read_xlsx_columns(contents, {"Entry No.", "VIP Code"}),
+        check_dtype=False,
+    )